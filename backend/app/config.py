@@ -17,13 +17,50 @@ class Settings(BaseSettings):
     # YouTube API（カンマ区切りで複数キー対応）
     youtube_api_key: str = ''
     youtube_api_keys: str = ''  # 複数キー用（カンマ区切り）
+    youtube_daily_quota: int = 10000  # 1キーあたりの1日のクォータ上限（ユニット）
+    quota_sync_interval_seconds: int = 30  # クォータ台帳のSupabase同期間隔（秒）
+
+    # データベース（Supabase）アクセス設定
+    db_pool_size: int = 16  # クエリ実行スレッド数（同時実行クエリ数の上限）
+    db_query_timeout_seconds: float = 10.0  # クエリごとのタイムアウト（秒）
+
+    # 利用ログ書き込み設定（バッファして一括挿入）
+    usage_log_flush_interval_ms: int = 500  # 一括挿入の間隔（ミリ秒）
+    usage_log_batch_size: int = 100  # 1回の挿入件数
+    usage_log_buffer_max: int = 10000  # バッファの最大件数（超過分は破棄）
+
+    # 管理画面の集計結果キャッシュTTL（秒）
+    admin_cache_ttl_seconds: int = 60
 
     # キャッシュ設定
     cache_ttl_hours: int = 24  # キャッシュTTL（時間）
+    cache_max_stale_hours: int = 48  # TTL経過後も古い結果を返しつつ再取得する期間（時間）
     enable_supabase_cache: bool = True  # Supabaseキャッシュを有効化
+    search_cache_max_entries: int = 1000  # 検索結果メモリキャッシュの最大件数（列指向で保持）
+    channel_cache_ttl_hours: int = 72  # チャンネル情報キャッシュTTL（時間）
+    channel_cache_max_entries: int = 20000  # チャンネル情報メモリキャッシュの最大件数
+    video_snippet_ttl_hours: int = 168  # 動画スニペット（タイトル・公開日等）キャッシュTTL（時間）
+    video_stats_ttl_minutes: int = 180  # 動画統計情報（再生数・高評価数）キャッシュTTL（分）
+    video_cache_max_entries: int = 20000  # 動画情報メモリキャッシュの最大件数
+    transcript_cache_ttl_hours: int = 720  # 字幕キャッシュTTL（時間）
+    transcript_missing_ttl_hours: int = 24  # 字幕なし（無効化・未提供）の結果のキャッシュTTL（時間）
+    transcript_cache_max_entries: int = 2000  # 字幕メモリキャッシュの最大件数
+    transcript_pool_size: int = 4  # 字幕取得の同時実行数（専用スレッドプールのサイズ）
+
+    # ディープ検索設定（nextPageToken による複数ページ検索）
+    deep_search_max_pages: int = 10  # 1検索あたりの最大ページ数
+    deep_search_quota_budget: int = 1020  # 1検索あたりのクォータ予算上限（ユニット）
 
     # Claude API（バズ要因分析用）
     anthropic_api_key: str = ''
+    claude_timeout_seconds: float = 60.0  # Claude API呼び出し1回あたりのタイムアウト（秒）
+    # 分析方式: 'structured'（分析とキーワード提案を1回の構造化呼び出しで取得）または
+    # 'two_step'（分析本文とキーワード提案を別々に取得）。ストリーミング分析は常に 'two_step'
+    analysis_mode: str = 'structured'
+    analyze_context_timeout_seconds: float = 10.0  # 字幕・コメント取得のタイムアウト（秒）
+    analysis_cache_ttl_hours: int = 168  # 分析結果キャッシュTTL（時間）
+    analysis_cache_max_entries: int = 2000  # 分析結果メモリキャッシュの最大件数
+    analyze_max_concurrency: int = 4  # 分析（字幕・コメント取得 + Claude呼び出し）の全体の同時実行数
 
     # Supabase
     supabase_url: str = ''
@@ -31,6 +68,10 @@ class Settings(BaseSettings):
     supabase_service_role_key: str = ''
     supabase_jwt_secret: str = ''
 
+    # 認証キャッシュ設定（検証済みユーザー情報をトークン単位で保持）
+    auth_cache_ttl_seconds: int = 60  # キャッシュTTL（秒）
+    auth_cache_max_entries: int = 10000  # 最大件数
+
     # PayPal
     paypal_client_id: str = ''
     paypal_client_secret: str = ''
@@ -0,0 +1,137 @@
+"""
+データベースアクセス層 - バズ動画リサーチくん
+
+同期版 supabase-py のクエリを専用のスレッドプールで実行し、
+イベントループをブロックせずに待機できるようにする
+
+【特徴】
+- 同時実行数はプールサイズで制限（超過分はキューで待機）
+- クエリごとのタイムアウト
+- プール使用状況・待機数・所要時間をPrometheusメトリクスとして公開
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Union
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.config import settings
+
+# ロガー設定
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# Prometheusメトリクス
+# ============================================
+
+DB_POOL_SIZE = Gauge(
+    'supabase_pool_size',
+    'Number of worker threads available for Supabase queries',
+)
+DB_POOL_IN_USE = Gauge(
+    'supabase_pool_in_use',
+    'Number of Supabase queries currently running',
+)
+DB_POOL_WAITING = Gauge(
+    'supabase_pool_waiting',
+    'Number of Supabase queries waiting for a free worker thread',
+)
+DB_QUERY_DURATION = Histogram(
+    'supabase_query_duration_seconds',
+    'Time spent executing Supabase queries',
+)
+DB_QUEUE_WAIT = Histogram(
+    'supabase_queue_wait_seconds',
+    'Time Supabase queries spent waiting for a free worker thread',
+)
+DB_QUERY_TIMEOUTS = Counter(
+    'supabase_query_timeouts_total',
+    'Number of Supabase queries that exceeded their timeout',
+)
+
+
+class DatabaseTimeoutError(Exception):
+    """データベースクエリのタイムアウト"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        super().__init__(f'データベースクエリが{timeout}秒以内に完了しませんでした')
+
+
+# ============================================
+# スレッドプール
+# ============================================
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """クエリ実行用スレッドプールを取得（遅延初期化）"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.db_pool_size,
+            thread_name_prefix='supabase'
+        )
+        DB_POOL_SIZE.set(settings.db_pool_size)
+    return _executor
+
+
+async def run_query(
+    query: Union[Any, Callable[[], Any]],
+    timeout: Optional[float] = None
+) -> Any:
+    """
+    Supabaseクエリをスレッドプールで実行し、完了を待機
+
+    Args:
+        query: execute() を持つクエリビルダー、または引数なしの呼び出し可能オブジェクト
+        timeout: タイムアウト秒数（Noneの場合は設定値）
+
+    Returns:
+        Any: クエリの実行結果（execute() の戻り値）
+
+    Raises:
+        DatabaseTimeoutError: タイムアウトした場合
+    """
+    call = query.execute if hasattr(query, 'execute') else query
+    timeout = timeout if timeout is not None else settings.db_query_timeout_seconds
+    queued_at = time.perf_counter()
+
+    def run() -> Any:
+        DB_POOL_WAITING.dec()
+        DB_POOL_IN_USE.inc()
+        started_at = time.perf_counter()
+        DB_QUEUE_WAIT.observe(started_at - queued_at)
+        try:
+            return call()
+        finally:
+            DB_QUERY_DURATION.observe(time.perf_counter() - started_at)
+            DB_POOL_IN_USE.dec()
+
+    DB_POOL_WAITING.inc()
+    future = _get_executor().submit(run)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    except asyncio.TimeoutError:
+        DB_QUERY_TIMEOUTS.inc()
+        logger.warning(f'Supabase query timed out after {timeout}s')
+        raise DatabaseTimeoutError(timeout)
+
+    finally:
+        # 実行開始前に取り消されたクエリは待機数から除く
+        if future.cancelled():
+            DB_POOL_WAITING.dec()
+
+
+def shutdown_database() -> None:
+    """スレッドプールを停止（実行中のクエリは完了を待たない）"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
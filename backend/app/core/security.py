@@ -4,19 +4,32 @@
 JWT検証・ユーザー認証機能を提供
 """
 
+import hashlib
 import logging
+import time
 from typing import Optional
 from datetime import datetime, timezone
 
+from cachetools import TTLCache
 from fastapi import HTTPException, status
 from pydantic import BaseModel
 import jwt
 
 from app.config import settings
+from app.core.database import run_query
 
 
 logger = logging.getLogger(__name__)
 
+# Supabase Auth が発行するアクセストークンの audience
+SUPABASE_JWT_AUDIENCE = 'authenticated'
+
+# 検証済みユーザー情報キャッシュ（トークンのSHA-256ハッシュ -> (UserInfo, キャッシュ有効期限)）
+_principal_cache: TTLCache = TTLCache(
+    maxsize=settings.auth_cache_max_entries,
+    ttl=settings.auth_cache_ttl_seconds
+)
+
 
 class TokenPayload(BaseModel):
     """JWTトークンのペイロード"""
@@ -35,6 +48,65 @@ class UserInfo(BaseModel):
     is_admin: bool = False
 
 
+def verify_token_locally(token: str) -> Optional[TokenPayload]:
+    """
+    JWTシークレットでトークンをローカル検証（署名・有効期限・audience）
+
+    Args:
+        token: JWTトークン（Bearerプレフィックスなし）
+
+    Returns:
+        TokenPayload: トークンのペイロード
+        ローカルで検証できない場合（シークレット未設定・HS256以外・署名不一致）はNone
+
+    Raises:
+        HTTPException: トークンが期限切れ・形式不正の場合
+    """
+    if not settings.supabase_jwt_secret:
+        return None
+
+    try:
+        # 非対称鍵で署名されたトークンはSupabaseで検証する
+        if jwt.get_unverified_header(token).get('alg') != 'HS256':
+            return None
+
+        claims = jwt.decode(
+            token,
+            settings.supabase_jwt_secret,
+            algorithms=['HS256'],
+            audience=SUPABASE_JWT_AUDIENCE,
+            options={'require': ['exp', 'iat', 'sub']}
+        )
+        return TokenPayload(
+            sub=claims['sub'],
+            email=claims.get('email'),
+            exp=claims['exp'],
+            iat=claims['iat'],
+            aud=SUPABASE_JWT_AUDIENCE,
+            role=claims.get('role')
+        )
+
+    except jwt.InvalidSignatureError:
+        # シークレットのローテーション直後などに備えてSupabaseでの検証にフォールバック
+        logger.warning('Local JWT signature check failed, falling back to Supabase')
+        return None
+
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='トークンの有効期限が切れています',
+            headers={'WWW-Authenticate': 'Bearer'}
+        )
+
+    except (jwt.InvalidTokenError, ValueError) as e:
+        logger.warning(f'Token verification failed: {type(e).__name__}: {e}')
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='無効なトークンです',
+            headers={'WWW-Authenticate': 'Bearer'}
+        )
+
+
 async def verify_token_with_supabase(token: str) -> TokenPayload:
     """
     Supabaseを使用してJWTトークンを検証
@@ -54,7 +126,7 @@ async def verify_token_with_supabase(token: str) -> TokenPayload:
         supabase = get_supabase_admin()
 
         # Supabaseでトークンを検証してユーザー情報を取得
-        user_response = supabase.auth.get_user(token)
+        user_response = await run_query(lambda: supabase.auth.get_user(token))
 
         if not user_response or not user_response.user:
             raise HTTPException(
@@ -90,6 +162,9 @@ async def get_current_user(token: str) -> UserInfo:
     """
     現在の認証済みユーザーを取得
 
+    検証済みのユーザー情報はトークン単位で短時間キャッシュし、
+    トークンはJWTシークレットでローカル検証する（できない場合のみSupabaseで検証）
+
     Args:
         token: JWTトークン
 
@@ -101,13 +176,18 @@ async def get_current_user(token: str) -> UserInfo:
     """
     from app.core.supabase import get_supabase_admin
 
-    payload = await verify_token_with_supabase(token)
+    cache_key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    cached = _principal_cache.get(cache_key)
+    if cached and cached[1] > time.time():
+        return cached[0]
+
+    payload = verify_token_locally(token) or await verify_token_with_supabase(token)
 
     # Supabaseからユーザー情報を取得
     supabase = get_supabase_admin()
 
     try:
-        result = supabase.table('profiles').select('*').eq('id', payload.sub).single().execute()
+        result = await run_query(supabase.table('profiles').select('*').eq('id', payload.sub).single())
 
         if not result.data:
             raise HTTPException(
@@ -117,12 +197,20 @@ async def get_current_user(token: str) -> UserInfo:
 
         profile = result.data
 
-        return UserInfo(
+        user = UserInfo(
             id=profile['id'],
             email=profile['email'],
             is_admin=profile.get('is_admin', False)
         )
 
+        # トークンの有効期限を超えてキャッシュしない（Supabase検証時は exp=0）
+        cache_until = time.time() + settings.auth_cache_ttl_seconds
+        if payload.exp:
+            cache_until = min(cache_until, payload.exp)
+        _principal_cache[cache_key] = (user, cache_until)
+
+        return user
+
     except HTTPException:
         raise
 
@@ -0,0 +1,147 @@
+"""
+シングルフライト - バズり動画究極リサーチシステム
+
+同一キーの処理が並行して要求された場合に、上流の処理を1回だけ実行して結果を共有する
+
+【特徴】
+- 後から参加した呼び出し元も、それまでに得られた要素を最初から受け取れる
+- 呼び出し元がキャンセルされても上流の処理は継続する（他の呼び出し元とキャッシュ保存のため）
+- 上流で発生した例外は全呼び出し元に伝播する
+"""
+
+import asyncio
+import logging
+from contextlib import aclosing
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, Generic, Optional, TypeVar
+
+# ロガー設定
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class _Flight(Generic[T]):
+    """実行中の1つの上流処理（要素をバッファして購読者に配信）"""
+
+    def __init__(self, source: AsyncGenerator[T, None]):
+        """
+        上流処理を開始
+
+        Args:
+            source: 上流の非同期ジェネレータ
+        """
+        self.items: list[T] = []
+        self._updated = asyncio.Event()
+        self.task = asyncio.get_running_loop().create_task(self._run(source))
+        self.task.add_done_callback(self._on_done)
+
+    async def _run(self, source: AsyncGenerator[T, None]) -> None:
+        """上流の要素をバッファに追加し、購読者に通知"""
+        async with aclosing(source) as items:
+            async for item in items:
+                self.items.append(item)
+                self._notify()
+
+    def _notify(self) -> None:
+        """待機中の購読者を起こす"""
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        """完了時に購読者へ通知（購読者がいない場合も例外を回収する）"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f'Single-flight source failed: {task.exception()}')
+        self._notify()
+
+    async def subscribe(self) -> AsyncIterator[T]:
+        """
+        バッファ済みの要素から順に受け取る
+
+        Yields:
+            T: 上流の要素
+
+        Raises:
+            Exception: 上流で発生した例外
+        """
+        index = 0
+        while True:
+            updated = self._updated
+            while index < len(self.items):
+                yield self.items[index]
+                index += 1
+
+            if self.task.done():
+                if self.task.cancelled():
+                    raise asyncio.CancelledError()
+                error = self.task.exception()
+                if error is not None:
+                    raise error
+                return
+
+            await updated.wait()
+
+
+class SingleFlight(Generic[T]):
+    """キーごとに上流処理を1つに集約するレジストリ"""
+
+    def __init__(self):
+        """レジストリ初期化"""
+        self._flights: dict[str, _Flight[T]] = {}
+
+    def stream(self, key: str, factory: Callable[[], AsyncGenerator[T, None]]) -> AsyncIterator[T]:
+        """
+        キーに対応する上流処理の要素を受け取る（実行中でなければ開始）
+
+        Args:
+            key: 集約キー
+            factory: 上流の非同期ジェネレータを生成する関数（実行中の処理がない場合のみ呼ばれる）
+
+        Returns:
+            AsyncIterator[T]: 上流の要素（参加前の要素も含む）
+        """
+        flight = self._flights.get(key)
+        # 完了済みの処理はレジストリからの削除前でも再利用しない
+        if flight is None or flight.task.done():
+            flight = _Flight(factory())
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            logger.info(f'Joining in-flight request for key: {key}')
+        return flight.subscribe()
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        キーに対応する上流処理の結果を受け取る（実行中でなければ開始）
+
+        Args:
+            key: 集約キー
+            factory: 上流のコルーチンを生成する関数（実行中の処理がない場合のみ呼ばれる）
+
+        Returns:
+            T: 上流処理の結果
+        """
+        async def single() -> AsyncGenerator[T, None]:
+            yield await factory()
+
+        result: Optional[T] = None
+        async for result in self.stream(key, single):
+            pass
+        return result
+
+    def in_flight(self, key: str) -> bool:
+        """
+        キーに対応する上流処理が実行中か
+
+        Args:
+            key: 集約キー
+
+        Returns:
+            bool: 実行中の場合True
+        """
+        flight = self._flights.get(key)
+        return flight is not None and not flight.task.done()
+
+    def _forget(self, key: str, flight: _Flight[T]) -> None:
+        """完了した上流処理をレジストリから削除"""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -11,6 +11,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.config import settings
 from app.core.security import verify_token_with_supabase, get_current_user as _get_current_user, UserInfo
+from app.services.auth_service import RequestContext, SubscriptionStatus
 
 
 # HTTPベアラー認証スキーム
@@ -96,27 +97,51 @@ async def require_admin(user: UserInfo = Depends(get_current_user)) -> UserInfo:
     return user
 
 
-async def require_active_subscription(user: UserInfo = Depends(get_current_user)) -> UserInfo:
+async def get_request_context(user: UserInfo = Depends(get_current_user)) -> RequestContext:
     """
-    アクティブなサブスクリプション必須のエンドポイント用依存性
+    リクエストコンテキスト（サブスクリプション状態・本日の検索回数）の依存性
+
+    FastAPIの依存性キャッシュにより1リクエストにつき1回だけ取得され、
+    同じリクエスト内の依存性・エンドポイントで共有される
 
     Args:
         user: 認証済みユーザー
 
     Returns:
-        UserInfo: サブスクリプションがアクティブなユーザー
-
-    Raises:
-        HTTPException: サブスクリプションがアクティブでない場合
+        RequestContext: リクエストコンテキスト
     """
-    # 社内モードの場合はサブスクチェックをスキップ
+    # 社内モードの場合は制限なしのコンテキストを返す
     if settings.internal_mode:
-        return user
+        return RequestContext(
+            user_id=user.id,
+            is_admin=user.is_admin,
+            subscription=SubscriptionStatus(status='active', is_active=True),
+        )
 
     from app.services.auth_service import get_auth_service
 
     auth_service = get_auth_service()
-    subscription = await auth_service.get_subscription_status(user.id)
+    return await auth_service.get_request_context(user.id, is_admin=user.is_admin)
+
+
+async def require_active_subscription(
+    user: UserInfo = Depends(get_current_user),
+    context: RequestContext = Depends(get_request_context)
+) -> UserInfo:
+    """
+    アクティブなサブスクリプション必須のエンドポイント用依存性
+
+    Args:
+        user: 認証済みユーザー
+        context: リクエストコンテキスト
+
+    Returns:
+        UserInfo: サブスクリプションがアクティブなユーザー
+
+    Raises:
+        HTTPException: サブスクリプションがアクティブでない場合
+    """
+    subscription = context.subscription
 
     if not subscription.is_active:
         raise HTTPException(
@@ -30,7 +30,10 @@ from app.routers import (
     webhook_router,
     admin_router,
 )
+from app.core.database import shutdown_database
 from app.services import close_youtube_service
+from app.services.analyze_service import analyze_service
+from app.services.usage_log_buffer import close_usage_log_buffer
 
 
 # ============================================
@@ -156,6 +159,9 @@ async def lifespan(app: FastAPI):
     # シャットダウン時の処理
     logger.info('Shutting down gracefully...')
     await close_youtube_service()
+    await close_usage_log_buffer()
+    await analyze_service.close()
+    shutdown_database()
 
 
 # FastAPIアプリケーション作成
@@ -27,9 +27,10 @@ router = APIRouter(prefix='/api/admin', tags=['管理者'])
 class UsersResponse(BaseModel):
     """ユーザー一覧レスポンス"""
     users: List[UserListItem]
-    total: int
-    page: int
+    # 総件数は先頭ページ（cursor 指定なし）でのみ返す
+    total: Optional[int] = None
     per_page: int
+    next_cursor: Optional[str] = None
 
 
 class UserUpdateRequest(BaseModel):
@@ -54,10 +55,10 @@ async def get_dashboard(
 
 @router.get('/users', response_model=UsersResponse)
 async def get_users(
-    page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    status: Optional[str] = Query(None),
+    status_filter: Optional[str] = Query(None, alias='status'),
     user: UserInfo = Depends(require_admin),
     service: AdminService = Depends(get_admin_service)
 ):
@@ -65,26 +66,32 @@ async def get_users(
     ユーザー一覧を取得
 
     Args:
-        page: ページ番号
         per_page: 1ページあたりの件数
+        cursor: 前ページの next_cursor（省略時は先頭ページ）
         search: 検索クエリ
-        status: ステータスフィルター
+        status_filter: ステータスフィルター（クエリパラメータ名は status）
 
     Returns:
         UsersResponse: ユーザー一覧
     """
-    users, total = await service.get_users(
-        page=page,
-        per_page=per_page,
-        search=search,
-        status_filter=status,
-    )
+    try:
+        users, total, next_cursor = await service.get_users(
+            per_page=per_page,
+            cursor=cursor,
+            search=search,
+            status_filter=status_filter,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='カーソルが不正です'
+        )
 
     return UsersResponse(
         users=users,
         total=total,
-        page=page,
         per_page=per_page,
+        next_cursor=next_cursor,
     )
 
 
@@ -2,17 +2,24 @@
 バズ要因分析APIルーター
 
 POST /api/analyze - 動画のバズ要因を分析
+POST /api/analyze/stream - 分析結果をServer-Sent Eventsで逐次返す
+POST /api/analyze/batch - 複数動画を一括分析し、完了順にNDJSONで返す
 """
 
+import asyncio
+import json
 import logging
+from typing import Any, AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 
-from app.schemas import AnalyzeRequest, AnalysisResult, Video
+from app.schemas import AnalyzeRequest, AnalysisResult, BatchAnalyzeRequest, Video
 from app.dependencies import require_active_subscription
 from app.core.security import UserInfo
 from app.services.analyze_service import analyze_service
 from app.services.auth_service import get_auth_service
+from app.services.youtube_service import YouTubeAPIError, get_youtube_service
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +41,8 @@ router = APIRouter(prefix="/api", tags=["analyze"])
     - バズ要因の特定（タイトル、投稿タイミング等）
     - 効果的な表現の解説
     - 類似動画検索用のキーワード提案（5件）
+
+    リクエストの動画情報は動画IDのみ使用し、タイトル・統計情報はサーバー側で取得します。
     """
 )
 async def analyze_video(
@@ -42,21 +51,212 @@ async def analyze_video(
     user: UserInfo = Depends(require_active_subscription)
 ) -> AnalysisResult:
     """動画のバズ要因を分析"""
-    # 利用ログを記録
+    await _log_analyze_usage(request, body, user)
+    video = await _resolve_video(body.video.video_id)
+
+    try:
+        logger.info(f"Analyzing video: {video.video_id}, user={user.id}")
+        result = await analyze_service.analyze_video(video)
+        logger.info(f"Analysis completed for video: {video.video_id}")
+        return result
+    except Exception as e:
+        logger.error(f"Analysis failed: {e}")
+        raise HTTPException(status_code=500, detail=f"分析中にエラーが発生しました: {str(e)}")
+
+
+@router.post(
+    "/analyze/stream",
+    responses={
+        200: {
+            "description": "分析結果（Server-Sent Events）",
+            "content": {"text/event-stream": {}},
+        },
+    },
+    summary="動画のバズ要因を分析（ストリーミング）",
+    description="""
+    `POST /api/analyze` と同じ分析を行い、結果を Server-Sent Events で逐次返します。
+
+    ## イベント形式
+    - `event: delta` / `{"text": string}`: バズ要因分析の本文（Claudeの出力を生成順に送信）
+    - `event: keywords` / `{"suggestedKeywords": SuggestedKeyword[]}`: 検索キーワード提案
+    - `event: summary` / `{"videoId": string, "analysisSummary": string}`: 分析結果の要約（最後に送信）
+    - `event: error` / `{"status": number, "detail": string}`: ストリーム開始後のエラー
+
+    認証エラー・動画情報の取得エラーはストリーム開始前に通常のHTTPエラーとして返します。
+    """
+)
+async def analyze_video_stream(
+    request: Request,
+    body: AnalyzeRequest,
+    user: UserInfo = Depends(require_active_subscription)
+) -> StreamingResponse:
+    """動画のバズ要因を分析し、結果を逐次返す"""
+    await _log_analyze_usage(request, body, user)
+    video = await _resolve_video(body.video.video_id)
+
+    logger.info(f"Stream analyzing video: {video.video_id}, user={user.id}")
+    return StreamingResponse(
+        _stream_analysis_events(video),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_analysis_events(video: Video) -> AsyncIterator[str]:
+    """
+    分析の途中経過をSSEイベントに変換して返す
+
+    Args:
+        video: 分析対象の動画情報
+
+    Yields:
+        str: SSEイベント1件
+    """
+    try:
+        async for kind, payload in analyze_service.stream_analysis(video):
+            if kind == "delta":
+                yield _sse_event("delta", {"text": payload})
+            elif kind == "keywords":
+                yield _sse_event("keywords", {"suggestedKeywords": payload})
+            else:
+                yield _sse_event("summary", {"videoId": video.video_id, "analysisSummary": payload})
+        logger.info(f"Stream analysis completed for video: {video.video_id}")
+
+    except asyncio.TimeoutError:
+        logger.error(f"Stream analysis timed out for video: {video.video_id}")
+        yield _sse_event("error", {
+            "status": 504,
+            "detail": "Claude APIの応答がタイムアウトしました。時間をおいて再度お試しください。",
+        })
+    except Exception as e:
+        logger.error(f"Stream analysis failed: {e}")
+        yield _sse_event("error", {"status": 500, "detail": f"分析中にエラーが発生しました: {str(e)}"})
+
+
+async def _resolve_video(video_id: str) -> Video:
+    """
+    分析対象の動画情報をYouTube APIから取得
+
+    分析結果は全ユーザーで共有してキャッシュされるため、プロンプトにはクライアントが送信した
+    タイトル・統計情報ではなく、サーバー側で取得した動画情報のみを使う
+
+    Args:
+        video_id: 動画ID
+
+    Returns:
+        Video: 動画情報
+
+    Raises:
+        HTTPException: 動画が見つからない場合・動画情報の取得に失敗した場合
+    """
+    try:
+        videos = await get_youtube_service().get_videos([video_id])
+    except YouTubeAPIError as e:
+        logger.error(f"Failed to fetch video for analysis: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"動画情報の取得に失敗しました: {str(e)}"
+        )
+
+    if not videos:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="動画が見つかりません")
+    return videos[0]
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """イベント名とデータをSSEの1イベントに変換"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _log_analyze_usage(request: Request, body: AnalyzeRequest, user: UserInfo) -> None:
+    """分析の利用ログを記録"""
+    await _log_usage_for_video(request, body.video.video_id, user)
+
+
+async def _log_usage_for_video(request: Request, video_id: str, user: UserInfo) -> None:
+    """動画1件分の分析の利用ログを記録"""
     auth_service = get_auth_service()
     await auth_service.log_usage(
         user_id=user.id,
         action='analyze',
-        metadata={'video_id': body.video.video_id},
+        metadata={'video_id': video_id},
         ip_address=request.client.host if request.client else None,
         user_agent=request.headers.get('user-agent')
     )
 
+
+@router.post(
+    "/analyze/batch",
+    responses={
+        200: {
+            "description": "分析結果（NDJSONストリーム）",
+            "content": {"application/x-ndjson": {}},
+        },
+    },
+    summary="複数動画のバズ要因を一括分析",
+    description="""
+    検索結果の上位動画などをまとめて分析し、完了した動画から順に NDJSON（1行1フレーム）で返します。
+
+    動画は `videos`（動画情報）または `videoIds`（動画ID）で最大20件まで指定できます。
+    どちらの場合も動画IDのみ使用し、タイトル・統計情報はサーバー側で取得します。
+    同じ動画IDは1回のみ分析し、分析の同時実行数はサーバー全体で制限されます。
+
+    ## フレーム形式
+    - `{"type": "result", "result": AnalysisResult}`: 分析が完了した動画の結果
+    - `{"type": "error", "videoId": string | null, "detail": string}`: 動画情報を取得できなかった動画のエラー
+    - `{"type": "done", "total": number}`: 全動画の分析完了（最後に送信）
+    """
+)
+async def analyze_videos_batch(
+    request: Request,
+    body: BatchAnalyzeRequest,
+    user: UserInfo = Depends(require_active_subscription)
+) -> StreamingResponse:
+    """複数動画のバズ要因を一括分析し、完了順に返す"""
+    video_ids = list(dict.fromkeys([v.video_id for v in body.videos] + body.video_ids))
+    for video_id in video_ids:
+        await _log_usage_for_video(request, video_id, user)
+
+    logger.info(f"Batch analyzing {len(video_ids)} videos, user={user.id}")
+    return StreamingResponse(
+        _batch_analysis_frames(video_ids),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _batch_analysis_frames(video_ids: list[str]) -> AsyncIterator[str]:
+    """
+    一括分析の結果をNDJSONフレームに変換して返す
+
+    Args:
+        video_ids: 分析対象の動画IDリスト（重複なし）
+
+    Yields:
+        str: NDJSONの1行
+    """
+    # 動画情報はクライアントの送信内容を使わず、サーバー側で取得（_resolve_video と同じ理由）
     try:
-        logger.info(f"Analyzing video: {body.video.video_id}, user={user.id}")
-        result = await analyze_service.analyze_video(body.video)
-        logger.info(f"Analysis completed for video: {body.video.video_id}")
-        return result
-    except Exception as e:
-        logger.error(f"Analysis failed: {e}")
-        raise HTTPException(status_code=500, detail=f"分析中にエラーが発生しました: {str(e)}")
+        videos = await get_youtube_service().get_videos(video_ids)
+    except YouTubeAPIError as e:
+        logger.error(f"Failed to fetch videos for batch analysis: {e}")
+        videos = []
+        yield _ndjson_frame({"type": "error", "videoId": None, "detail": str(e)})
+    else:
+        fetched_ids = {v.video_id for v in videos}
+        for video_id in video_ids:
+            if video_id not in fetched_ids:
+                yield _ndjson_frame({"type": "error", "videoId": video_id, "detail": "動画が見つかりません"})
+
+    total = 0
+    async for result in analyze_service.analyze_videos(videos):
+        total += 1
+        yield _ndjson_frame({"type": "result", "result": result.model_dump(by_alias=True)})
+
+    logger.info(f"Batch analysis completed: {total} videos")
+    yield _ndjson_frame({"type": "done", "total": total})
+
+
+def _ndjson_frame(frame: dict) -> str:
+    """辞書をNDJSONの1行に変換"""
+    return json.dumps(frame, ensure_ascii=False) + "\n"
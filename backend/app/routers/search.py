@@ -3,24 +3,30 @@
 
 POST /api/search エンドポイントを提供
 キーワード検索・フィルター適用・バズ動画取得
+POST /api/search/stream でエンリッチ完了順のストリーミング検索を提供
 """
 
+import asyncio
+import json
 import logging
+from typing import AsyncIterator
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from app.schemas import ApiError, SearchRequest, SearchResult
+from app.schemas import ApiError, SearchRequest, SearchResult, SearchStreamSummary
 from app.dependencies import require_active_subscription
 from app.core.security import UserInfo
 from app.services.youtube_service import (
     YouTubeAPIError,
     YouTubeAPIKeyError,
     YouTubeQuotaExceededError,
+    YouTubeService,
     get_youtube_service,
 )
-from app.services.auth_service import get_auth_service
+from app.services.auth_service import SearchLimitUnavailableError, get_auth_service
 
 # レート制限（検索API専用）
 limiter = Limiter(key_func=get_remote_address)
@@ -67,6 +73,10 @@ router = APIRouter(
             'description': 'YouTube APIエラー',
             'model': ApiError,
         },
+        503: {
+            'description': '検索回数を確認できない',
+            'model': ApiError,
+        },
     },
     summary='バズ動画検索',
     description='''
@@ -85,6 +95,11 @@ router = APIRouter(
 - `periodDays`: 期間フィルター（7, 30, 90, 365日 または null=全期間）
 - `impactMin/Max`: 影響力の範囲
 - `subscriberMin/Max`: 登録者数の範囲
+
+## ディープ検索
+- `maxPages`: 2以上を指定すると nextPageToken を辿って最大10ページ（500件）まで検索
+- `quotaBudget`: YouTube APIクォータ予算（1ページ102ユニット）。予算内のページ数に制限される
+- 1日の検索回数は取得するページ数分を消費する（残り回数が足りない場合は429）
 ''',
 )
 @limiter.limit('30/minute')
@@ -99,6 +114,7 @@ async def search_videos(
     Args:
         request: FastAPIリクエストオブジェクト（レート制限用）
         body: 検索リクエスト（キーワードとフィルター条件）
+        user: 認証済みユーザー
 
     Returns:
         SearchResult: 検索結果（動画リスト付き）
@@ -108,14 +124,200 @@ async def search_videos(
     """
     logger.info(f'Search request received: keyword={body.keyword}, user={user.id}')
 
+    remaining, reserved = await _check_limit_and_log_usage(request, body, user)
+
+    try:
+        # YouTubeサービス取得
+        youtube_service = get_youtube_service()
+
+        # バズ動画検索実行
+        result = await youtube_service.search_buzz_videos(
+            keyword=body.keyword,
+            filters=body.filters,
+            max_pages=body.max_pages,
+            quota_budget=body.quota_budget,
+        )
+
+        logger.info(
+            f'Search completed: {len(result.videos)} videos found '
+            f'for keyword={body.keyword}'
+        )
+
+        # 残り検索回数を追加してレスポンスを返す
+        result.searches_remaining = remaining
+        return result
+
+    except Exception as e:
+        # 検索に失敗した場合は確保した検索回数を返却
+        if reserved:
+            await get_auth_service().release_search_slot(user.id, reserved)
+        raise _to_http_exception(e)
+
+
+@router.post(
+    '/search/stream',
+    responses={
+        200: {
+            'description': '検索成功（NDJSONストリーム）',
+            'content': {'application/x-ndjson': {}},
+        },
+        401: {
+            'description': '認証エラー',
+            'model': ApiError,
+        },
+        402: {
+            'description': 'サブスクリプション必要',
+            'model': ApiError,
+        },
+        429: {
+            'description': '検索回数上限',
+            'model': ApiError,
+        },
+        503: {
+            'description': '検索回数を確認できない',
+            'model': ApiError,
+        },
+    },
+    summary='バズ動画検索（ストリーミング）',
+    description='''
+`POST /api/search` と同じ検索を行い、結果を NDJSON（1行1フレーム）で逐次返します。
+
+## フレーム形式
+- `{"type": "video", "video": Video}`: チャンネル情報が揃った動画から順に送信
+- `{"type": "summary", "summary": SearchStreamSummary}`: 最後に影響力順の動画ID一覧を送信
+- `{"type": "error", "status": number, "detail": string}`: ストリーム開始後のエラー
+
+検索回数の制限・認証エラーはストリーム開始前に通常のHTTPエラーとして返します。
+''',
+)
+@limiter.limit('30/minute')
+async def search_videos_stream(
+    request: Request,
+    body: SearchRequest,
+    user: UserInfo = Depends(require_active_subscription)
+) -> StreamingResponse:
+    """
+    バズ動画を検索し、動画をエンリッチ完了順にストリーミングする
+
+    Args:
+        request: FastAPIリクエストオブジェクト（レート制限用）
+        body: 検索リクエスト（キーワードとフィルター条件）
+        user: 認証済みユーザー
+
+    Returns:
+        StreamingResponse: NDJSONストリーム
+    """
+    logger.info(f'Stream search request received: keyword={body.keyword}, user={user.id}')
+
+    remaining, reserved = await _check_limit_and_log_usage(request, body, user)
+
+    return StreamingResponse(
+        _stream_search_frames(body, user, remaining, reserved),
+        media_type='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+async def _stream_search_frames(
+    body: SearchRequest,
+    user: UserInfo,
+    searches_remaining: int,
+    reserved: int
+) -> AsyncIterator[str]:
+    """
+    検索結果をNDJSONフレームに変換して返す
+
+    Args:
+        body: 検索リクエスト
+        user: 認証済みユーザー
+        searches_remaining: 本日の残り検索回数
+        reserved: カウンターに確保した検索回数（失敗時に返却する回数、確保していない場合は0）
+
+    Yields:
+        str: NDJSONの1行
+    """
+    youtube_service = get_youtube_service()
+    completed = False
+
+    try:
+        async for item in youtube_service.stream_buzz_videos(
+            keyword=body.keyword,
+            filters=body.filters,
+            max_pages=body.max_pages,
+            quota_budget=body.quota_budget,
+        ):
+            if isinstance(item, SearchResult):
+                summary = SearchStreamSummary(
+                    keyword=item.keyword,
+                    searched_at=item.searched_at,
+                    video_ids=[v.video_id for v in item.videos],
+                    searches_remaining=searches_remaining,
+                    is_stale=item.is_stale,
+                )
+                logger.info(
+                    f'Stream search completed: {len(item.videos)} videos found '
+                    f'for keyword={body.keyword}'
+                )
+                completed = True
+                yield _ndjson_frame({'type': 'summary', 'summary': summary.model_dump(by_alias=True)})
+            else:
+                yield _ndjson_frame({'type': 'video', 'video': item.model_dump(by_alias=True)})
+
+    except Exception as e:
+        error = _to_http_exception(e)
+        yield _ndjson_frame({'type': 'error', 'status': error.status_code, 'detail': error.detail})
+
+    finally:
+        # summary を送る前に終わった場合（検索の失敗・クライアントの切断）は確保した検索回数を返却
+        # 切断時はストリームごと取り消されるため、返却処理は取り消しの影響を受けないようにする
+        if reserved and not completed:
+            await asyncio.shield(get_auth_service().release_search_slot(user.id, reserved))
+
+
+def _ndjson_frame(frame: dict) -> str:
+    """辞書をNDJSONの1行に変換"""
+    return json.dumps(frame, ensure_ascii=False) + '\n'
+
+
+async def _check_limit_and_log_usage(
+    request: Request,
+    body: SearchRequest,
+    user: UserInfo
+) -> tuple[int, int]:
+    """
+    1日の検索回数制限をチェックして今回の検索分を確保し、利用ログを記録
+
+    ディープ検索は取得するページ数分の検索回数を消費する（1検索で複数ページ分の
+    YouTube APIクォータを使うため）
+
+    Args:
+        request: FastAPIリクエストオブジェクト
+        body: 検索リクエスト
+        user: 認証済みユーザー
+
+    Returns:
+        tuple[int, int]: (本日の残り検索回数（今回の検索後）,
+            カウンターに確保した検索回数（確保していない場合は0）)
+
+    Raises:
+        HTTPException: 検索回数の上限に達している場合、検索回数を確認できない場合
+    """
     # 認証サービス取得
     auth_service = get_auth_service()
 
-    # 1日の検索回数制限をチェック（20回/日）
-    can_search, remaining, limit_error = await auth_service.check_search_limit(
-        user_id=user.id,
-        daily_limit=20
-    )
+    # 1日の検索回数制限をチェック（20回/日、ディープ検索は1ページにつき1回）
+    pages = YouTubeService.pages_within_budget(body.max_pages, body.quota_budget)
+    try:
+        can_search, remaining, limit_error, reserved = await auth_service.check_search_limit(
+            user_id=user.id,
+            daily_limit=20,
+            amount=pages
+        )
+    except SearchLimitUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     if not can_search:
         logger.warning(f'Search limit exceeded for user={user.id}')
         raise HTTPException(
@@ -127,54 +329,52 @@ async def search_videos(
     await auth_service.log_usage(
         user_id=user.id,
         action='search',
-        metadata={'keyword': body.keyword, 'remaining_today': remaining - 1},
+        metadata={
+            'keyword': body.keyword,
+            'max_pages': body.max_pages,
+            'pages': pages,
+            'remaining_today': remaining - pages,
+        },
         ip_address=request.client.host if request.client else None,
         user_agent=request.headers.get('user-agent')
     )
 
-    try:
-        # YouTubeサービス取得
-        youtube_service = get_youtube_service()
+    return remaining - pages, pages if reserved else 0
 
-        # バズ動画検索実行
-        result = await youtube_service.search_buzz_videos(
-            keyword=body.keyword,
-            filters=body.filters,
-        )
 
-        logger.info(
-            f'Search completed: {len(result.videos)} videos found '
-            f'for keyword={body.keyword}'
-        )
+def _to_http_exception(e: Exception) -> HTTPException:
+    """
+    検索中の例外をHTTPExceptionに変換
 
-        # 残り検索回数を追加してレスポンスを返す
-        result.searches_remaining = remaining - 1
-        return result
+    Args:
+        e: 発生した例外
 
-    except YouTubeQuotaExceededError as e:
+    Returns:
+        HTTPException: レスポンス用の例外
+    """
+    if isinstance(e, YouTubeQuotaExceededError):
         logger.warning(f'YouTube API quota exceeded: {e}')
-        raise HTTPException(
+        return HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=str(e),
         )
 
-    except YouTubeAPIKeyError as e:
+    if isinstance(e, YouTubeAPIKeyError):
         logger.error(f'YouTube API key error: {e}')
-        raise HTTPException(
+        return HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e),
         )
 
-    except YouTubeAPIError as e:
+    if isinstance(e, YouTubeAPIError):
         logger.error(f'YouTube API error: {e}')
-        raise HTTPException(
+        return HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=str(e),
         )
 
-    except Exception as e:
-        logger.exception(f'Unexpected error during search: {e}')
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f'検索中に予期しないエラーが発生しました: {e}',
-        )
+    logger.exception(f'Unexpected error during search: {e}')
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f'検索中に予期しないエラーが発生しました: {e}',
+    )
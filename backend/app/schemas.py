@@ -9,7 +9,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 # ============================================
@@ -134,6 +134,19 @@ class SearchRequest(BaseModel):
 
     keyword: str = Field(..., min_length=1, max_length=100, description='検索キーワード')
     filters: Optional[SearchFilters] = Field(None, description='検索フィルター条件')
+    max_pages: int = Field(
+        1,
+        alias='maxPages',
+        ge=1,
+        le=10,
+        description='検索ページ数（2以上でディープ検索、1ページ最大50件、1ページにつき検索回数1回分を消費）'
+    )
+    quota_budget: Optional[int] = Field(
+        None,
+        alias='quotaBudget',
+        ge=0,
+        description='YouTube APIクォータ予算（ユニット、1ページ102ユニット）'
+    )
 
     class Config:
         """Pydantic設定"""
@@ -148,7 +161,9 @@ class SearchRequest(BaseModel):
                     'impactMax': None,
                     'subscriberMin': 1000,
                     'subscriberMax': None
-                }
+                },
+                'maxPages': 1,
+                'quotaBudget': None
             }
         }
 
@@ -164,6 +179,38 @@ class SearchResult(BaseModel):
         alias='searchesRemaining',
         description='本日の残り検索回数'
     )
+    is_stale: bool = Field(
+        False,
+        alias='isStale',
+        description='キャッシュ有効期間を過ぎた結果か（バックグラウンドで再取得中）'
+    )
+
+    class Config:
+        """Pydantic設定"""
+
+        populate_by_name = True
+
+
+class SearchStreamSummary(BaseModel):
+    """ストリーミング検索の最終サマリー"""
+
+    keyword: str = Field(..., description='検索キーワード')
+    searched_at: str = Field(..., alias='searchedAt', description='検索日時（ISO 8601形式）')
+    video_ids: list[str] = Field(
+        default_factory=list,
+        alias='videoIds',
+        description='影響力の降順に並べた動画IDリスト'
+    )
+    searches_remaining: Optional[int] = Field(
+        None,
+        alias='searchesRemaining',
+        description='本日の残り検索回数'
+    )
+    is_stale: bool = Field(
+        False,
+        alias='isStale',
+        description='キャッシュ有効期間を過ぎた結果か（バックグラウンドで再取得中）'
+    )
 
     class Config:
         """Pydantic設定"""
@@ -276,7 +323,45 @@ class AnalysisResult(BaseModel):
 class AnalyzeRequest(BaseModel):
     """分析リクエスト"""
 
-    video: Video = Field(..., description='分析対象の動画情報')
+    video: Video = Field(
+        ...,
+        description='分析対象の動画情報（動画IDのみ使用し、動画情報はサーバー側で取得）'
+    )
+
+    class Config:
+        """Pydantic設定"""
+
+        populate_by_name = True
+
+
+# 一括分析の最大動画数
+BATCH_ANALYZE_MAX_VIDEOS = 20
+
+
+class BatchAnalyzeRequest(BaseModel):
+    """一括分析リクエスト（動画情報または動画IDで指定）"""
+
+    videos: list[Video] = Field(
+        default_factory=list,
+        max_length=BATCH_ANALYZE_MAX_VIDEOS,
+        description='分析対象の動画情報リスト（動画IDのみ使用し、動画情報はサーバー側で取得）'
+    )
+    video_ids: list[str] = Field(
+        default_factory=list,
+        alias='videoIds',
+        max_length=BATCH_ANALYZE_MAX_VIDEOS,
+        description='分析対象の動画IDリスト（動画情報はサーバー側で取得）'
+    )
+
+    @model_validator(mode='after')
+    def check_not_empty(self) -> 'BatchAnalyzeRequest':
+        """動画情報・動画IDのいずれかが指定されているか、合計が上限以内かを検証"""
+        total = len({v.video_id for v in self.videos} | set(self.video_ids))
+        if total == 0:
+            raise ValueError('videos または videoIds を1件以上指定してください')
+        if total > BATCH_ANALYZE_MAX_VIDEOS:
+            raise ValueError(f'一括分析できる動画は{BATCH_ANALYZE_MAX_VIDEOS}件までです')
+        return self
 
     class Config:
         """Pydantic設定"""
@@ -4,18 +4,60 @@
 管理者向けの統計・ユーザー管理機能
 """
 
+import base64
 import logging
+import uuid
 from datetime import datetime, timezone, timedelta
 from typing import Optional, List
 
+from cachetools import TTLCache
 from pydantic import BaseModel
 from supabase import Client
 
+from app.config import settings as app_config
+from app.core.database import run_query
 from app.core.supabase import get_supabase_admin
 
 
 logger = logging.getLogger(__name__)
 
+# 管理画面の集計結果キャッシュ（集計クエリの連続実行を防ぐ）
+_dashboard_cache: TTLCache = TTLCache(maxsize=1, ttl=app_config.admin_cache_ttl_seconds)
+_user_detail_cache: TTLCache = TTLCache(maxsize=500, ttl=app_config.admin_cache_ttl_seconds)
+
+
+def _encode_cursor(created_at: str, user_id: str) -> str:
+    """ユーザー一覧のページカーソルを生成（最終行の作成日時とID）"""
+    return base64.urlsafe_b64encode(f'{created_at}|{user_id}'.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    """
+    ユーザー一覧のページカーソルを解析
+
+    Args:
+        cursor: _encode_cursor で生成したカーソル
+
+    Returns:
+        tuple: (作成日時, ユーザーID)
+
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
+    try:
+        created_at, user_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+        return created_at, str(uuid.UUID(user_id))
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """ISO 8601形式のタイムスタンプ文字列をdatetimeに変換（Noneはそのまま）"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 
 class DashboardStats(BaseModel):
     """ダッシュボード統計"""
@@ -77,53 +119,34 @@ class AdminService:
         Returns:
             DashboardStats: 統計情報
         """
+        cached = _dashboard_cache.get('stats')
+        if cached:
+            return cached
+
         try:
             now = datetime.now(tz=timezone.utc)
             today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
             month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-            # 総ユーザー数
-            total_users_result = self.supabase.table('profiles').select('id', count='exact').execute()
-            total_users = total_users_result.count or 0
-
-            # アクティブなサブスクライバー数
-            active_subs_result = self.supabase.table('subscriptions').select('id', count='exact').eq('status', 'active').execute()
-            active_subscribers = active_subs_result.count or 0
-
-            # トライアル中ユーザー数
-            trialing_result = self.supabase.table('subscriptions').select('id', count='exact').eq('status', 'trialing').gt('trial_end', now.isoformat()).execute()
-            trialing_users = trialing_result.count or 0
-
-            # 今月の売上
-            revenue_result = self.supabase.table('payment_history').select('amount').eq('status', 'completed').gte('paid_at', month_start.isoformat()).execute()
-            monthly_revenue = sum(p['amount'] for p in revenue_result.data) if revenue_result.data else 0
-
-            # 総検索数
-            searches_result = self.supabase.table('usage_logs').select('id', count='exact').eq('action', 'search').execute()
-            total_searches = searches_result.count or 0
-
-            # 総分析数
-            analyses_result = self.supabase.table('usage_logs').select('id', count='exact').eq('action', 'analyze').execute()
-            total_analyses = analyses_result.count or 0
-
-            # 今日の新規ユーザー
-            users_today_result = self.supabase.table('profiles').select('id', count='exact').gte('created_at', today_start.isoformat()).execute()
-            users_today = users_today_result.count or 0
-
-            # 今日の検索数
-            searches_today_result = self.supabase.table('usage_logs').select('id', count='exact').eq('action', 'search').gte('created_at', today_start.isoformat()).execute()
-            searches_today = searches_today_result.count or 0
-
-            return DashboardStats(
-                total_users=total_users,
-                active_subscribers=active_subscribers,
-                trialing_users=trialing_users,
-                monthly_revenue=monthly_revenue,
-                total_searches=total_searches,
-                total_analyses=total_analyses,
-                users_today=users_today,
-                searches_today=searches_today,
+            # 全統計をDB関数で1往復で集計
+            result = await run_query(self.supabase.rpc('get_admin_dashboard_stats', {
+                'p_today_start': today_start.isoformat(),
+                'p_month_start': month_start.isoformat(),
+            }))
+            data = result.data or {}
+
+            stats = DashboardStats(
+                total_users=data.get('total_users') or 0,
+                active_subscribers=data.get('active_subscribers') or 0,
+                trialing_users=data.get('trialing_users') or 0,
+                monthly_revenue=data.get('monthly_revenue') or 0,
+                total_searches=data.get('total_searches') or 0,
+                total_analyses=data.get('total_analyses') or 0,
+                users_today=data.get('users_today') or 0,
+                searches_today=data.get('searches_today') or 0,
             )
+            _dashboard_cache['stats'] = stats
+            return stats
 
         except Exception as e:
             logger.error(f'Failed to get dashboard stats: {e}')
@@ -140,71 +163,67 @@ class AdminService:
 
     async def get_users(
         self,
-        page: int = 1,
         per_page: int = 20,
+        cursor: Optional[str] = None,
         search: Optional[str] = None,
         status_filter: Optional[str] = None
-    ) -> tuple[List[UserListItem], int]:
+    ) -> tuple[List[UserListItem], Optional[int], Optional[str]]:
         """
-        ユーザー一覧を取得
+        ユーザー一覧を取得（作成日時の降順、キーセットページネーション）
+
+        総件数の集計は絞り込み条件に一致する全行の走査が必要なため、先頭ページでのみ行う
 
         Args:
-            page: ページ番号
             per_page: 1ページあたりの件数
-            search: 検索クエリ
-            status_filter: ステータスフィルター
+            cursor: 前ページの next_cursor（Noneの場合は先頭ページ）
+            search: 検索クエリ（メールアドレス・名前の部分一致）
+            status_filter: ステータスフィルター（'none' はサブスクリプションなし）
 
         Returns:
-            tuple: (ユーザーリスト, 総件数)
-        """
-        try:
-            offset = (page - 1) * per_page
-
-            # プロファイルを取得
-            query = self.supabase.table('profiles').select('*', count='exact')
-
-            if search:
-                query = query.or_(f'email.ilike.%{search}%,full_name.ilike.%{search}%')
-
-            query = query.order('created_at', desc=True).range(offset, offset + per_page - 1)
-            profiles_result = query.execute()
-
-            total = profiles_result.count or 0
-            profiles = profiles_result.data or []
+            tuple: (ユーザーリスト, 総件数（2ページ目以降はNone）, 次ページのカーソル)
 
-            # 各ユーザーのサブスクリプション状態を取得
-            user_ids = [p['id'] for p in profiles]
-            subs_result = self.supabase.table('subscriptions').select('*').in_('user_id', user_ids).execute()
-
-            subs_by_user = {}
-            for sub in subs_result.data or []:
-                subs_by_user[sub['user_id']] = sub
-
-            users = []
-            for p in profiles:
-                sub = subs_by_user.get(p['id'])
+        Raises:
+            ValueError: カーソルが不正な場合
+        """
+        cursor_created_at, cursor_id = _decode_cursor(cursor) if cursor else (None, None)
 
-                # ステータスフィルター
-                sub_status = sub['status'] if sub else 'none'
-                if status_filter and sub_status != status_filter:
-                    continue
+        try:
+            # 次ページの有無を判定するため1件多く取得
+            result = await run_query(self.supabase.rpc('get_admin_users', {
+                'p_search': search or None,
+                'p_status': status_filter or None,
+                'p_cursor_created_at': cursor_created_at,
+                'p_cursor_id': cursor_id,
+                'p_limit': per_page + 1,
+            }))
+            data = result.data or {}
+            rows = data.get('users') or []
+
+            users = [
+                UserListItem(
+                    id=row['id'],
+                    email=row['email'],
+                    full_name=row.get('full_name'),
+                    is_admin=row.get('is_admin') or False,
+                    created_at=_parse_timestamp(row['created_at']),
+                    subscription_status=row['subscription_status'],
+                    trial_end=_parse_timestamp(row.get('trial_end')),
+                    current_period_end=_parse_timestamp(row.get('current_period_end')),
+                )
+                for row in rows[:per_page]
+            ]
 
-                users.append(UserListItem(
-                    id=p['id'],
-                    email=p['email'],
-                    full_name=p.get('full_name'),
-                    is_admin=p.get('is_admin', False),
-                    created_at=datetime.fromisoformat(p['created_at'].replace('Z', '+00:00')),
-                    subscription_status=sub_status,
-                    trial_end=datetime.fromisoformat(sub['trial_end'].replace('Z', '+00:00')) if sub and sub.get('trial_end') else None,
-                    current_period_end=datetime.fromisoformat(sub['current_period_end'].replace('Z', '+00:00')) if sub and sub.get('current_period_end') else None,
-                ))
+            next_cursor = None
+            if len(rows) > per_page:
+                last = rows[per_page - 1]
+                next_cursor = _encode_cursor(last['created_at'], last['id'])
 
-            return users, total
+            total = (data.get('total') or 0) if cursor_created_at is None else None
+            return users, total, next_cursor
 
         except Exception as e:
             logger.error(f'Failed to get users: {e}')
-            return [], 0
+            return [], 0 if cursor_created_at is None else None, None
 
     async def get_user_detail(self, user_id: str) -> Optional[UserDetail]:
         """
@@ -216,42 +235,36 @@ class AdminService:
         Returns:
             UserDetail: ユーザー詳細
         """
+        cached = _user_detail_cache.get(user_id)
+        if cached:
+            return cached
+
         try:
-            # プロファイル取得
-            profile_result = self.supabase.table('profiles').select('*').eq('id', user_id).single().execute()
-            if not profile_result.data:
+            # プロファイル・サブスクリプション・利用統計をDB関数で1往復で取得
+            result = await run_query(self.supabase.rpc('get_admin_user_detail', {'p_user_id': user_id}))
+            if not result.data:
                 return None
 
-            p = profile_result.data
-
-            # サブスクリプション取得
-            sub_result = self.supabase.table('subscriptions').select('*').eq('user_id', user_id).order('created_at', desc=True).limit(1).execute()
-            sub = sub_result.data[0] if sub_result.data else None
-
-            # 利用統計
-            searches_result = self.supabase.table('usage_logs').select('id', count='exact').eq('user_id', user_id).eq('action', 'search').execute()
-            analyses_result = self.supabase.table('usage_logs').select('id', count='exact').eq('user_id', user_id).eq('action', 'analyze').execute()
-
-            # 最終アクティビティ
-            last_activity_result = self.supabase.table('usage_logs').select('created_at').eq('user_id', user_id).order('created_at', desc=True).limit(1).execute()
-            last_activity = None
-            if last_activity_result.data:
-                last_activity = datetime.fromisoformat(last_activity_result.data[0]['created_at'].replace('Z', '+00:00'))
+            p = result.data['profile']
+            sub = result.data.get('subscription')
+            last_activity = result.data.get('last_activity')
 
-            return UserDetail(
+            detail = UserDetail(
                 id=p['id'],
                 email=p['email'],
                 full_name=p.get('full_name'),
                 avatar_url=p.get('avatar_url'),
                 is_admin=p.get('is_admin', False),
-                created_at=datetime.fromisoformat(p['created_at'].replace('Z', '+00:00')),
+                created_at=_parse_timestamp(p['created_at']),
                 subscription_status=sub['status'] if sub else 'none',
-                trial_end=datetime.fromisoformat(sub['trial_end'].replace('Z', '+00:00')) if sub and sub.get('trial_end') else None,
-                current_period_end=datetime.fromisoformat(sub['current_period_end'].replace('Z', '+00:00')) if sub and sub.get('current_period_end') else None,
-                total_searches=searches_result.count or 0,
-                total_analyses=analyses_result.count or 0,
-                last_activity=last_activity,
+                trial_end=_parse_timestamp(sub.get('trial_end')) if sub else None,
+                current_period_end=_parse_timestamp(sub.get('current_period_end')) if sub else None,
+                total_searches=result.data.get('total_searches') or 0,
+                total_analyses=result.data.get('total_analyses') or 0,
+                last_activity=_parse_timestamp(last_activity),
             )
+            _user_detail_cache[user_id] = detail
+            return detail
 
         except Exception as e:
             logger.error(f'Failed to get user detail: {e}')
@@ -284,7 +297,8 @@ class AdminService:
             if not update_data:
                 return True
 
-            self.supabase.table('profiles').update(update_data).eq('id', user_id).execute()
+            await run_query(self.supabase.table('profiles').update(update_data).eq('id', user_id))
+            _user_detail_cache.pop(user_id, None)
             return True
 
         except Exception as e:
@@ -299,7 +313,7 @@ class AdminService:
             AppSettings: アプリ設定
         """
         try:
-            result = self.supabase.table('app_settings').select('key, value').execute()
+            result = await run_query(self.supabase.table('app_settings').select('key, value'))
 
             settings_dict = {}
             for item in result.data or []:
@@ -347,10 +361,10 @@ class AdminService:
             ]
 
             for key, value in updates:
-                self.supabase.table('app_settings').upsert({
+                await run_query(self.supabase.table('app_settings').upsert({
                     'key': key,
                     'value': value,
-                }).execute()
+                }))
 
             return True
 
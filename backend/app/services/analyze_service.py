@@ -5,17 +5,52 @@ YouTube動画のバズ要因を分析し、類似動画を探すための検索
 字幕・コメントデータも活用した深い分析を提供
 """
 
+import asyncio
 import logging
-from typing import Optional
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Optional, TypeVar
 
 import anthropic
+from cachetools import TTLCache
+from pydantic import BaseModel, Field, ValidationError
 
 from app.config import settings
+from app.core.database import run_query
+from app.core.singleflight import SingleFlight
 from app.schemas import Video, AnalysisResult
 from app.services.youtube_service import get_youtube_service
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# 分析に使用するClaudeモデル
+CLAUDE_MODEL = "claude-3-haiku-20240307"
+
+# 分析の途中経過イベント（種類, 内容）
+# 種類は "delta"（分析本文の断片）, "keywords"（キーワード提案）, "summary"（要約）
+AnalysisEvent = tuple[str, Any]
+
+NO_API_KEY_MESSAGE = "Claude APIキーが設定されていないため、分析を実行できません。"
+
+# キーワード提案のJSONパースに失敗した場合の目印（この結果はキャッシュしない）
+KEYWORD_PARSE_FAILED = "パース失敗"
+
+# 分析結果キャッシュ（キャッシュキー単位、LRU + TTL）
+# 値は {"buzz_factors": str, "suggested_keywords": list[dict]}
+# 要約は再生数などの最新値から毎回生成するためキャッシュしない
+_analysis_cache: TTLCache = TTLCache(
+    maxsize=settings.analysis_cache_max_entries,
+    ttl=settings.analysis_cache_ttl_hours * 3600
+)
+
+# 実行中の分析（キャッシュキー単位で同一動画の並行分析を1回に集約し、途中経過も共有）
+_analysis_flights: SingleFlight[AnalysisEvent] = SingleFlight()
+
+# 実行中の分析の同時実行数上限（一括分析を含む全リクエスト共通）
+_analysis_semaphore = asyncio.Semaphore(settings.analyze_max_concurrency)
+
 
 # バズ要因分析のシステムプロンプト
 ANALYSIS_SYSTEM_PROMPT = """あなたはYouTube動画のバズ要因を分析する専門家です。
@@ -70,23 +105,127 @@ SUGGESTION_SYSTEM_PROMPT = """あなたはYouTube動画検索の専門家です
 各キーワードには、なぜそのキーワードが効果的かの簡単な理由も添えてください。"""
 
 
+# 構造化分析（1回の呼び出しで分析とキーワード提案を行う）のシステムプロンプト
+STRUCTURED_ANALYSIS_SYSTEM_PROMPT = ANALYSIS_SYSTEM_PROMPT.split("## 回答形式")[0] + """## キーワード提案のポイント
+同じようなバズり動画を見つけるための検索キーワードを5つ提案してください。
+1. 動画のテーマ・ジャンルに関連するキーワード
+2. バズ要因として機能しているフレーズ
+3. 類似コンテンツを見つけるための派生キーワード
+4. ターゲット視聴者層が使いそうな検索ワード
+
+## 回答形式
+必ず report_analysis ツールで回答してください。
+分析結果は具体的かつ実用的に、日本語で回答してください。"""
+
+# 構造化分析の出力スキーマ（ツール入力として受け取る）
+STRUCTURED_ANALYSIS_TOOL = {
+    "name": "report_analysis",
+    "description": "動画のバズ要因分析結果と類似動画検索用のキーワード提案を報告する",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "good_points": {
+                "type": "array",
+                "items": {"type": "string"},
+                "minItems": 3,
+                "maxItems": 5,
+                "description": "この動画の良い点（3〜5個）",
+            },
+            "improvements": {
+                "type": "array",
+                "items": {"type": "string"},
+                "maxItems": 4,
+                "description": "改善できる点（0〜4個、なければ空配列）",
+            },
+            "why_buzzed": {
+                "type": "string",
+                "description": "なぜバズったのか（100字程度の考察）",
+            },
+            "suggested_keywords": {
+                "type": "array",
+                "minItems": 5,
+                "maxItems": 5,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "keyword": {"type": "string", "description": "検索キーワード"},
+                        "reason": {"type": "string", "description": "このキーワードが効果的な理由"},
+                    },
+                    "required": ["keyword", "reason"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["good_points", "improvements", "why_buzzed", "suggested_keywords"],
+        "additionalProperties": False,
+    },
+}
+
+
+class _KeywordOutput(BaseModel):
+    """構造化分析のキーワード提案"""
+
+    keyword: str = Field(..., min_length=1)
+    reason: str
+
+
+class _StructuredAnalysisOutput(BaseModel):
+    """構造化分析の出力（ツール入力の検証用）"""
+
+    good_points: list[str] = Field(..., min_length=1)
+    improvements: list[str]
+    why_buzzed: str
+    suggested_keywords: list[_KeywordOutput] = Field(..., min_length=1)
+
+    def render_buzz_factors(self) -> str:
+        """従来の回答形式（Markdown）のバズ要因分析本文に変換"""
+        good_points = "\n".join(f"- {point}" for point in self.good_points)
+        improvements = "\n".join(f"- {point}" for point in self.improvements) or "特になし"
+        return (
+            f"### 🎯 この動画の良い点\n{good_points}\n\n"
+            f"### ⚠️ 改善できる点\n{improvements}\n\n"
+            f"### 💡 なぜバズったのか\n{self.why_buzzed}"
+        )
+
+
+def _cached_system(prompt: str) -> list[dict]:
+    """
+    静的なシステムプロンプトをプロンプトキャッシュの対象にする
+
+    キャッシュはツール定義・システムプロンプトまでのプレフィックスに適用される
+    （モデルごとの最小トークン数に満たない場合はキャッシュされない）
+
+    Args:
+        prompt: システムプロンプト
+
+    Returns:
+        list[dict]: cache_control 付きのシステムプロンプトブロック
+    """
+    return [{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}]
+
+
 class AnalyzeService:
     """バズ要因分析サービス"""
 
     def __init__(self):
         """Claude APIクライアントを初期化"""
         if settings.anthropic_api_key:
-            self.client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+            # 非同期クライアント（Claudeの応答待ちでイベントループをブロックしない）
+            self.client = anthropic.AsyncAnthropic(
+                api_key=settings.anthropic_api_key,
+                timeout=settings.claude_timeout_seconds
+            )
         else:
             self.client = None
             logger.warning("ANTHROPIC_API_KEY is not set. Analysis features will be disabled.")
+        self._supabase = None
 
     async def analyze_video(self, video: Video) -> AnalysisResult:
         """
         動画のバズ要因を分析（字幕・コメントも活用）
 
         Args:
-            video: 分析対象の動画情報
+            video: 分析対象の動画情報（サーバー側で取得したもの）
 
         Returns:
             AnalysisResult: 分析結果（バズ要因と検索キーワード提案）
@@ -94,29 +233,21 @@ class AnalyzeService:
         if not self.client:
             return AnalysisResult(
                 video_id=video.video_id,
-                buzz_factors="Claude APIキーが設定されていないため、分析を実行できません。",
+                buzz_factors=NO_API_KEY_MESSAGE,
                 suggested_keywords=[],
                 analysis_summary="APIキー未設定"
             )
 
         try:
-            # YouTube APIから追加情報を取得
-            youtube_service = get_youtube_service()
-
-            # 字幕を取得
-            transcript = await youtube_service.get_video_transcript(video.video_id)
-
-            # コメントを取得
-            comments = await youtube_service.get_video_comments(video.video_id, max_results=15)
-
-            # 動画情報をテキストに変換（字幕・コメント含む）
-            video_info = self._format_video_info(video, transcript, comments)
-
-            # バズ要因分析
-            buzz_factors = await self._analyze_buzz_factors(video_info)
-
-            # 検索キーワード提案
-            suggested_keywords = await self._suggest_keywords(video_info, buzz_factors)
+            buzz_parts: list[str] = []
+            suggested_keywords: list[dict] = []
+            structured = settings.analysis_mode == "structured"
+            async for kind, payload in self._analysis_events(video, structured):
+                if kind == "delta":
+                    buzz_parts.append(payload)
+                else:
+                    suggested_keywords = payload
+            buzz_factors = "".join(buzz_parts)
 
             # 要約を生成
             summary = await self._generate_summary(video, buzz_factors)
@@ -128,6 +259,15 @@ class AnalyzeService:
                 analysis_summary=summary
             )
 
+        except asyncio.TimeoutError:
+            logger.error(f"Analysis timed out for video {video.video_id}")
+            return AnalysisResult(
+                video_id=video.video_id,
+                buzz_factors="Claude APIの応答がタイムアウトしました。時間をおいて再度お試しください。",
+                suggested_keywords=[],
+                analysis_summary="タイムアウト"
+            )
+
         except Exception as e:
             logger.error(f"Analysis failed for video {video.video_id}: {e}")
             return AnalysisResult(
@@ -137,6 +277,307 @@ class AnalyzeService:
                 analysis_summary="エラー"
             )
 
+    async def analyze_videos(self, videos: list[Video]) -> AsyncIterator[AnalysisResult]:
+        """
+        複数の動画を並行分析し、完了した順に結果を返す
+
+        同じ動画IDは1回のみ分析する。新規分析の同時実行数は全リクエスト共通の上限で制限される
+
+        Args:
+            videos: 分析対象の動画情報リスト（サーバー側で取得したもの）
+
+        Yields:
+            AnalysisResult: 分析結果（完了順）
+        """
+        unique_videos = list({video.video_id: video for video in videos}.values())
+        tasks = [asyncio.ensure_future(self.analyze_video(video)) for video in unique_videos]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # 呼び出し元が途中で離脱した場合は残りの待機を取り消す（実行中の分析自体は継続して共有・キャッシュされる）
+            for task in tasks:
+                task.cancel()
+
+    async def stream_analysis(self, video: Video) -> AsyncIterator[AnalysisEvent]:
+        """
+        動画のバズ要因を分析し、結果を生成された順に返す
+
+        Args:
+            video: 分析対象の動画情報（サーバー側で取得したもの）
+
+        Yields:
+            AnalysisEvent: 以下の順で返す
+            - ("delta", str): バズ要因分析の本文（Claudeの出力を逐次）
+            - ("keywords", list[dict]): 検索キーワード提案
+            - ("summary", str): 分析結果の要約
+
+        Raises:
+            asyncio.TimeoutError: Claude APIの応答がタイムアウトした場合
+            Exception: 分析に失敗した場合
+        """
+        if not self.client:
+            yield "delta", NO_API_KEY_MESSAGE
+            yield "keywords", []
+            yield "summary", "APIキー未設定"
+            return
+
+        buzz_parts: list[str] = []
+        # 分析本文を生成順に返すため、構造化分析ではなく2段階の分析を使う
+        async for kind, payload in self._analysis_events(video, structured=False):
+            if kind == "delta":
+                buzz_parts.append(payload)
+            yield kind, payload
+
+        yield "summary", await self._generate_summary(video, "".join(buzz_parts))
+
+    async def _analysis_events(self, video: Video, structured: bool) -> AsyncIterator[AnalysisEvent]:
+        """
+        キャッシュ済み・実行中・新規のいずれかの分析から "delta" / "keywords" イベントを返す
+
+        同じ動画の分析が実行中の場合はその出力を最初から共有する（分析方式は問わない）
+
+        Args:
+            video: 分析対象の動画情報（サーバー側で取得したもの）
+            structured: 新規分析を構造化分析（1回の呼び出し）で行うか
+
+        Yields:
+            AnalysisEvent: ("delta", str) を1個以上、最後に ("keywords", list[dict])
+        """
+        cache_key = self._build_cache_key(video)
+        analysis = await self._get_cached_analysis(cache_key)
+        if analysis is not None:
+            yield "delta", analysis["buzz_factors"]
+            yield "keywords", analysis["suggested_keywords"]
+            return
+
+        async for event in _analysis_flights.stream(
+            cache_key,
+            lambda: self._run_analysis(video, cache_key, structured)
+        ):
+            yield event
+
+    async def _run_analysis(
+        self,
+        video: Video,
+        cache_key: str,
+        structured: bool
+    ) -> AsyncGenerator[AnalysisEvent, None]:
+        """
+        字幕・コメントを取得してClaudeで分析し、結果をキャッシュに保存
+
+        Args:
+            video: 分析対象の動画情報（サーバー側で取得したもの）
+            cache_key: キャッシュキー
+            structured: True の場合は1回の構造化呼び出しで分析とキーワード提案を行い、
+                False の場合は分析本文を逐次返してからキーワード提案を別途行う
+
+        Yields:
+            AnalysisEvent: ("delta", str) を1個以上、最後に ("keywords", list[dict])
+        """
+        # 新規分析の同時実行数を制限（キャッシュ済み・実行中の分析の共有は制限しない）
+        async with _analysis_semaphore:
+            # 字幕・コメントを並行取得
+            transcript, comments = await self._gather_context(video.video_id)
+
+            # 動画情報をテキストに変換（字幕・コメント含む）
+            video_info = self._format_video_info(video, transcript, comments)
+
+            if structured:
+                # バズ要因分析・検索キーワード提案を1回で取得
+                buzz_factors, suggested_keywords = await self._analyze_structured(video_info)
+                yield "delta", buzz_factors
+            else:
+                # バズ要因分析（生成された順に返す）
+                buzz_parts: list[str] = []
+                async for text in self._stream_buzz_factors(video_info):
+                    buzz_parts.append(text)
+                    yield "delta", text
+                buzz_factors = "".join(buzz_parts)
+
+                # 検索キーワード提案
+                suggested_keywords = await self._suggest_keywords(video_info, buzz_factors)
+            yield "keywords", suggested_keywords
+
+            if not any(k.get("keyword") == KEYWORD_PARSE_FAILED for k in suggested_keywords):
+                await self._save_analysis(cache_key, video.video_id, {
+                    "buzz_factors": buzz_factors,
+                    "suggested_keywords": suggested_keywords,
+                })
+
+    # ============================================
+    # 分析結果キャッシュ
+    # ============================================
+
+    @staticmethod
+    def _build_cache_key(video: Video) -> str:
+        """
+        分析結果のキャッシュキーを生成
+
+        再生数・バズ度は分析内容に影響するため、大きく変わった場合のみ再分析されるよう
+        粗い区分に丸めてキーに含める
+        - 再生数: 10の0.5乗刻み（1万・3.2万・10万…）
+        - バズ度: 2倍刻み（1倍未満・1〜2倍・2〜4倍…）
+
+        キャッシュは全ユーザーで共有するため、video はクライアントの送信内容ではなく
+        サーバー側で取得した動画情報であること（タイトル等はキーに含めない）
+
+        Args:
+            video: 動画情報
+
+        Returns:
+            str: キャッシュキー
+        """
+        view_bucket = int(math.log10(video.view_count) * 2) if video.view_count > 0 else 0
+        impact_bucket = int(math.log2(video.impact_ratio)) + 1 if video.impact_ratio >= 1 else 0
+        return f"{video.video_id}:v{view_bucket}:i{impact_bucket}"
+
+    def _get_supabase_client(self):
+        """Supabaseクライアントを取得（分析結果キャッシュ永続化用）"""
+        if self._supabase is None:
+            try:
+                from app.core.supabase import get_supabase_admin
+                self._supabase = get_supabase_admin()
+            except Exception as e:
+                logger.warning(f"Supabase not available for analysis cache: {e}")
+        return self._supabase
+
+    async def _get_cached_analysis(self, cache_key: str) -> Optional[dict]:
+        """
+        キャッシュから分析結果を取得（メモリ → Supabase の順）
+
+        Args:
+            cache_key: キャッシュキー
+
+        Returns:
+            Optional[dict]: 分析結果（キャッシュにない場合None）
+        """
+        if cache_key in _analysis_cache:
+            logger.info(f"Analysis cache hit (memory): {cache_key}")
+            return _analysis_cache[cache_key]
+
+        if not settings.enable_supabase_cache:
+            return None
+
+        supabase = self._get_supabase_client()
+        if not supabase:
+            return None
+
+        try:
+            result = await run_query(
+                supabase.table("analysis_cache")
+                .select("buzz_factors, suggested_keywords")
+                .eq("cache_key", cache_key)
+                .gt("expires_at", datetime.now(timezone.utc).isoformat())
+                .limit(1)
+            )
+            if not result.data:
+                return None
+
+            analysis = result.data[0]
+            _analysis_cache[cache_key] = analysis
+            logger.info(f"Analysis cache hit (Supabase): {cache_key}")
+            return analysis
+
+        except Exception as e:
+            # キャッシュエラーは無視して分析を実行
+            logger.debug(f"Supabase analysis cache miss or error: {e}")
+            return None
+
+    async def _save_analysis(self, cache_key: str, video_id: str, analysis: dict) -> None:
+        """
+        分析結果をキャッシュに保存（メモリ + Supabase）
+
+        Args:
+            cache_key: キャッシュキー
+            video_id: 動画ID
+            analysis: 分析結果
+        """
+        _analysis_cache[cache_key] = analysis
+
+        if not settings.enable_supabase_cache:
+            return
+
+        supabase = self._get_supabase_client()
+        if not supabase:
+            return
+
+        try:
+            expires_at = datetime.now(timezone.utc) + timedelta(hours=settings.analysis_cache_ttl_hours)
+            await run_query(supabase.table("analysis_cache").upsert({
+                "cache_key": cache_key,
+                "video_id": video_id,
+                "buzz_factors": analysis["buzz_factors"],
+                "suggested_keywords": analysis["suggested_keywords"],
+                "expires_at": expires_at.isoformat(),
+            }, on_conflict="cache_key"))
+
+        except Exception as e:
+            # キャッシュ保存エラーは無視
+            logger.warning(f"Failed to save analysis to Supabase cache: {e}")
+
+    async def close(self) -> None:
+        """Claude APIクライアントを閉じる"""
+        if self.client:
+            await self.client.close()
+
+    async def _gather_context(self, video_id: str) -> tuple[Optional[str], list[dict]]:
+        """
+        分析に使う字幕・コメントを並行取得
+
+        どちらも分析の補足情報のため、タイムアウト・失敗時は省略して分析を続ける
+        呼び出し元がキャンセルされた場合は両方の取得もキャンセルされる
+
+        Args:
+            video_id: 動画ID
+
+        Returns:
+            tuple: (字幕テキスト, コメントリスト)
+        """
+        youtube_service = get_youtube_service()
+        transcript, comments = await asyncio.gather(
+            self._fetch_optional(youtube_service.get_video_transcript(video_id), "transcript", video_id),
+            self._fetch_optional(
+                youtube_service.get_video_comments(video_id, max_results=15), "comments", video_id
+            ),
+        )
+        return transcript, comments or []
+
+    async def _fetch_optional(self, fetch: Awaitable[T], stage: str, video_id: str) -> Optional[T]:
+        """
+        タイムアウト付きで補足情報を取得（失敗時はNone）
+
+        Args:
+            fetch: 取得処理
+            stage: ログ用の段階名
+            video_id: 動画ID
+
+        Returns:
+            Optional[T]: 取得結果（タイムアウト・失敗時はNone）
+        """
+        try:
+            return await asyncio.wait_for(fetch, settings.analyze_context_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Fetching {stage} timed out after {settings.analyze_context_timeout_seconds}s "
+                f"for video {video_id}"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to fetch {stage} for video {video_id}: {e}")
+        return None
+
+    async def _create_message(self, **kwargs: Any) -> Any:
+        """
+        タイムアウト付きでClaude APIを呼び出す（再試行を含めた全体の待ち時間を制限）
+
+        Raises:
+            asyncio.TimeoutError: タイムアウトした場合
+        """
+        return await asyncio.wait_for(
+            self.client.messages.create(**kwargs),
+            settings.claude_timeout_seconds
+        )
+
     def _format_video_info(
         self,
         video: Video,
@@ -185,12 +626,21 @@ class AnalyzeService:
 
         return info
 
-    async def _analyze_buzz_factors(self, video_info: str) -> str:
-        """バズ要因を分析（良い点・改善点を含む）"""
-        message = self.client.messages.create(
-            model="claude-3-haiku-20240307",
+    async def _stream_buzz_factors(self, video_info: str) -> AsyncIterator[str]:
+        """
+        バズ要因を分析（良い点・改善点を含む）し、Claudeの出力を逐次返す
+
+        Yields:
+            str: 分析本文の断片
+
+        Raises:
+            asyncio.TimeoutError: 出力全体が claude_timeout_seconds 以内に終わらない場合
+        """
+        deadline = asyncio.get_running_loop().time() + settings.claude_timeout_seconds
+        async with self.client.messages.stream(
+            model=CLAUDE_MODEL,
             max_tokens=2500,
-            system=ANALYSIS_SYSTEM_PROMPT,
+            system=_cached_system(ANALYSIS_SYSTEM_PROMPT),
             messages=[
                 {
                     "role": "user",
@@ -198,19 +648,70 @@ class AnalyzeService:
 
 {video_info}
 
+※ 特に「第1話」「第2話」のようなエピソード形式になっていないか、
+1本で完結する構成になっているかも確認してください。"""
+                }
+            ]
+        ) as stream:
+            # 断片間の待ち時間はクライアントのタイムアウトで制限される
+            async for text in stream.text_stream:
+                if asyncio.get_running_loop().time() > deadline:
+                    raise asyncio.TimeoutError()
+                yield text
+
+    async def _analyze_structured(self, video_info: str) -> tuple[str, list[dict]]:
+        """
+        バズ要因分析とキーワード提案を1回の構造化呼び出しで取得
+
+        Args:
+            video_info: 動画情報テキスト
+
+        Returns:
+            tuple[str, list[dict]]: (バズ要因分析本文, キーワード提案)
+
+        Raises:
+            ValueError: 出力がスキーマを満たさない場合
+        """
+        message = await self._create_message(
+            model=CLAUDE_MODEL,
+            max_tokens=3000,
+            system=_cached_system(STRUCTURED_ANALYSIS_SYSTEM_PROMPT),
+            tools=[STRUCTURED_ANALYSIS_TOOL],
+            tool_choice={"type": "tool", "name": STRUCTURED_ANALYSIS_TOOL["name"]},
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"""以下の動画を分析し、良い点と改善点を明確に提示したうえで、
+同じようなバズ動画を見つけるための検索キーワードを5つ提案してください。
+
+{video_info}
+
 ※ 特に「第1話」「第2話」のようなエピソード形式になっていないか、
 1本で完結する構成になっているかも確認してください。"""
                 }
             ]
         )
-        return message.content[0].text
+
+        tool_input = next(
+            (block.input for block in message.content if getattr(block, "type", None) == "tool_use"),
+            None
+        )
+        if tool_input is None:
+            raise ValueError("Claude APIの応答に分析結果が含まれていません")
+
+        try:
+            output = _StructuredAnalysisOutput.model_validate(tool_input)
+        except ValidationError as e:
+            logger.warning(f"Structured analysis output did not match schema: {e}")
+            raise ValueError("Claude APIの応答が分析結果の形式を満たしていません")
+        return output.render_buzz_factors(), [k.model_dump() for k in output.suggested_keywords]
 
     async def _suggest_keywords(self, video_info: str, buzz_factors: str) -> list[dict]:
         """類似動画検索用のキーワードを提案"""
-        message = self.client.messages.create(
-            model="claude-3-haiku-20240307",
+        message = await self._create_message(
+            model=CLAUDE_MODEL,
             max_tokens=1000,
-            system=SUGGESTION_SYSTEM_PROMPT,
+            system=_cached_system(SUGGESTION_SYSTEM_PROMPT),
             messages=[
                 {
                     "role": "user",
@@ -245,7 +746,7 @@ JSONのみを出力してください。"""
             return json.loads(response_text)
         except Exception as e:
             logger.warning(f"Failed to parse keywords JSON: {e}")
-            return [{"keyword": "パース失敗", "reason": str(e)}]
+            return [{"keyword": KEYWORD_PARSE_FAILED, "reason": str(e)}]
 
     async def _generate_summary(self, video: Video, buzz_factors: str) -> str:
         """分析結果の要約を生成"""
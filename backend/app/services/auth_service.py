@@ -11,7 +11,9 @@ from typing import Optional
 from pydantic import BaseModel, EmailStr
 from supabase import Client
 
+from app.core.database import run_query
 from app.core.supabase import get_supabase_admin
+from app.services.usage_log_buffer import get_usage_log_buffer
 
 
 logger = logging.getLogger(__name__)
@@ -36,6 +38,18 @@ class SubscriptionStatus(BaseModel):
     days_remaining: Optional[int] = None
 
 
+class RequestContext(BaseModel):
+    """リクエストコンテキスト（認証済みリクエストで共有するユーザー状態）"""
+    user_id: str
+    is_admin: bool = False
+    subscription: SubscriptionStatus
+    searches_today: int = 0
+
+
+class SearchLimitUnavailableError(Exception):
+    """検索回数を確認できない（カウンターと利用ログのどちらも参照できない）"""
+
+
 class AuthService:
     """認証サービスクラス"""
 
@@ -53,7 +67,7 @@ class AuthService:
             UserProfile: プロファイル（存在しない場合はNone）
         """
         try:
-            result = self.supabase.table('profiles').select('*').eq('id', user_id).single().execute()
+            result = await run_query(self.supabase.table('profiles').select('*').eq('id', user_id).single())
 
             if not result.data:
                 return None
@@ -98,7 +112,7 @@ class AuthService:
             return await self.get_profile(user_id)
 
         try:
-            result = self.supabase.table('profiles').update(update_data).eq('id', user_id).execute()
+            result = await run_query(self.supabase.table('profiles').update(update_data).eq('id', user_id))
 
             if result.data:
                 return await self.get_profile(user_id)
@@ -119,46 +133,107 @@ class AuthService:
             SubscriptionStatus: サブスクリプション状態
         """
         try:
-            result = self.supabase.table('subscriptions').select('*').eq('user_id', user_id).order('created_at', desc=True).limit(1).execute()
+            result = await run_query(self.supabase.table('subscriptions').select('*').eq('user_id', user_id).order('created_at', desc=True).limit(1))
 
             if not result.data:
                 return SubscriptionStatus(status='none', is_active=False)
 
-            sub = result.data[0]
-            now = datetime.now(tz=timezone.utc)
+            return self._build_subscription_status(result.data[0])
 
-            status = sub['status']
-            trial_end = None
-            current_period_end = None
+        except Exception as e:
+            logger.error(f'Failed to get subscription status: {e}')
+            return SubscriptionStatus(status='none', is_active=False)
+
+    @staticmethod
+    def _build_subscription_status(sub: dict) -> SubscriptionStatus:
+        """
+        subscriptions の行からサブスクリプション状態を判定
+
+        Args:
+            sub: サブスクリプション行（status, trial_end, current_period_end）
+
+        Returns:
+            SubscriptionStatus: サブスクリプション状態
+        """
+        now = datetime.now(tz=timezone.utc)
+
+        status = sub['status']
+        trial_end = None
+        current_period_end = None
+        is_active = False
+        days_remaining = None
+
+        if sub.get('trial_end'):
+            trial_end = datetime.fromisoformat(sub['trial_end'].replace('Z', '+00:00'))
+        if sub.get('current_period_end'):
+            current_period_end = datetime.fromisoformat(sub['current_period_end'].replace('Z', '+00:00'))
+
+        # アクティブ判定
+        if status == 'trialing' and trial_end and trial_end > now:
+            is_active = True
+            days_remaining = (trial_end - now).days
+        elif status == 'active' and current_period_end and current_period_end > now:
+            is_active = True
+            days_remaining = (current_period_end - now).days
+        elif status in ('cancelled', 'expired'):
             is_active = False
-            days_remaining = None
-
-            if sub.get('trial_end'):
-                trial_end = datetime.fromisoformat(sub['trial_end'].replace('Z', '+00:00'))
-            if sub.get('current_period_end'):
-                current_period_end = datetime.fromisoformat(sub['current_period_end'].replace('Z', '+00:00'))
-
-            # アクティブ判定
-            if status == 'trialing' and trial_end and trial_end > now:
-                is_active = True
-                days_remaining = (trial_end - now).days
-            elif status == 'active' and current_period_end and current_period_end > now:
-                is_active = True
-                days_remaining = (current_period_end - now).days
-            elif status in ('cancelled', 'expired'):
-                is_active = False
-
-            return SubscriptionStatus(
-                status=status,
-                trial_end=trial_end,
-                current_period_end=current_period_end,
-                is_active=is_active,
-                days_remaining=days_remaining
+
+        return SubscriptionStatus(
+            status=status,
+            trial_end=trial_end,
+            current_period_end=current_period_end,
+            is_active=is_active,
+            days_remaining=days_remaining
+        )
+
+    async def get_request_context(self, user_id: str, is_admin: bool = False) -> RequestContext:
+        """
+        プロファイル・サブスクリプション状態・本日の検索回数を一括取得
+
+        DB関数 get_request_context で1往復で取得し、失敗した場合は個別クエリにフォールバックする
+
+        Args:
+            user_id: ユーザーID
+            is_admin: 管理者かどうか（プロファイルが取得できない場合に使用）
+
+        Returns:
+            RequestContext: リクエストコンテキスト
+        """
+        try:
+            result = await run_query(self.supabase.rpc('get_request_context', {
+                'p_user_id': user_id,
+                'p_day_start': self._today_start().isoformat(),
+            }))
+            data = result.data or {}
+
+            sub = data.get('subscription')
+            subscription = (
+                self._build_subscription_status(sub) if sub
+                else SubscriptionStatus(status='none', is_active=False)
+            )
+            profile = data.get('profile') or {}
+
+            return RequestContext(
+                user_id=user_id,
+                is_admin=profile.get('is_admin', is_admin),
+                subscription=subscription,
+                searches_today=data.get('searches_today') or 0
             )
 
         except Exception as e:
-            logger.error(f'Failed to get subscription status: {e}')
-            return SubscriptionStatus(status='none', is_active=False)
+            logger.warning(f'Failed to get request context, falling back to separate queries: {e}')
+            return RequestContext(
+                user_id=user_id,
+                is_admin=is_admin,
+                subscription=await self.get_subscription_status(user_id),
+                searches_today=await self.get_daily_search_count(user_id)
+            )
+
+    @staticmethod
+    def _today_start() -> datetime:
+        """本日の開始時刻（UTC）を取得"""
+        now = datetime.now(tz=timezone.utc)
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
 
     async def has_used_trial(self, user_id: str) -> bool:
         """
@@ -172,7 +247,7 @@ class AuthService:
         """
         try:
             # トライアルを開始したことがあるかチェック（ステータス問わず）
-            result = self.supabase.table('subscriptions').select('id').eq('user_id', user_id).execute()
+            result = await run_query(self.supabase.table('subscriptions').select('id').eq('user_id', user_id))
             return len(result.data) > 0
         except Exception as e:
             logger.error(f'Failed to check trial history: {e}')
@@ -203,19 +278,19 @@ class AuthService:
                 return SubscriptionStatus(status='expired', is_active=False), 'トライアルは一度のみご利用いただけます。有料プランをご検討ください。'
 
             # トライアル日数を取得
-            settings_result = self.supabase.table('app_settings').select('value').eq('key', 'trial_days').single().execute()
+            settings_result = await run_query(self.supabase.table('app_settings').select('value').eq('key', 'trial_days').single())
             trial_days = int(settings_result.data['value']) if settings_result.data else 7
 
             now = datetime.now(tz=timezone.utc)
             trial_end = now + timedelta(days=trial_days)
 
             # サブスクリプション作成
-            result = self.supabase.table('subscriptions').insert({
+            result = await run_query(self.supabase.table('subscriptions').insert({
                 'user_id': user_id,
                 'status': 'trialing',
                 'trial_start': now.isoformat(),
                 'trial_end': trial_end.isoformat()
-            }).execute()
+            }))
 
             if result.data:
                 return SubscriptionStatus(
@@ -233,13 +308,13 @@ class AuthService:
 
     async def get_daily_search_count(self, user_id: str) -> int:
         """
-        ユーザーの本日の検索回数を取得
+        ユーザーの本日の検索回数を取得（利用ログの件数）
 
         Args:
             user_id: ユーザーID
 
         Returns:
-            int: 本日の検索回数
+            int: 本日の検索回数（取得に失敗した場合は0）
         """
         # 社内モードでは制限なし
         from app.config import settings
@@ -247,51 +322,135 @@ class AuthService:
             return 0
 
         try:
-            # 本日の開始時刻（UTC）
-            now = datetime.now(tz=timezone.utc)
-            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-
-            result = self.supabase.table('usage_logs').select(
-                'id', count='exact'
-            ).eq('user_id', user_id).eq('action', 'search').gte(
-                'created_at', today_start.isoformat()
-            ).execute()
-
-            return result.count if result.count else 0
+            return await self._count_searches_today(user_id)
 
         except Exception as e:
             logger.error(f'Failed to get daily search count: {e}')
             return 0
 
-    async def check_search_limit(self, user_id: str, daily_limit: int = 20) -> tuple[bool, int, str]:
+    async def _count_searches_today(self, user_id: str) -> int:
         """
-        ユーザーの検索回数制限をチェック
+        本日の検索回数を利用ログから数える
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            int: 本日の検索回数
+
+        Raises:
+            Exception: クエリに失敗した場合
+        """
+        result = await run_query(self.supabase.table('usage_logs').select(
+            'id', count='exact', head=True
+        ).eq('user_id', user_id).eq('action', 'search').gte(
+            'created_at', self._today_start().isoformat()
+        ))
+
+        return result.count or 0
+
+    async def check_search_limit(
+        self,
+        user_id: str,
+        daily_limit: int = 20,
+        amount: int = 1
+    ) -> tuple[bool, int, str, bool]:
+        """
+        ユーザーの検索回数制限をチェックし、制限内なら今回の検索分を確保
+
+        カウンターの上限チェックと加算を1回のDB関数呼び出しで行うため、
+        同時リクエストでも上限を超えない。検索が失敗した場合、確保できていれば
+        release_search_slot で返却する（確保に失敗して回数チェックのみ行った場合は返却しない）
+
+        確保に失敗した場合は利用ログの件数で判定する。カウンターは確保用のDB関数でしか
+        加算されず、DB関数が使えない間の検索回数を含まないため。利用ログは1検索1行で
+        ページ数を数えられないため、この場合は複数回分（ディープ検索）を受け付けない
 
         Args:
             user_id: ユーザーID
             daily_limit: 1日の検索上限（デフォルト: 30回）
+            amount: 今回の検索で消費する回数（ディープ検索はページ数）
 
         Returns:
-            tuple[bool, int, str]: (制限内か, 残り回数, エラーメッセージ)
+            tuple[bool, int, str, bool]: (制限内か, 残り回数（今回の検索分を含む）, エラーメッセージ,
+                今回の検索分をカウンターに確保したか)
+
+        Raises:
+            SearchLimitUnavailableError: カウンターと利用ログのどちらでも回数を確認できない場合
         """
         # 社内モードでは制限なし
         from app.config import settings
         if settings.internal_mode:
-            return True, daily_limit, ''
+            return True, daily_limit, '', False
+
+        limit_error = f'本日の検索上限（{daily_limit}回）に達しました。明日以降に再度お試しください。'
+        if amount > 1:
+            limit_error = (
+                f'本日の残り検索回数が足りません（{amount}ページの検索には{amount}回分が必要です）。'
+                'ページ数を減らして再度お試しください。'
+            )
 
         try:
-            current_count = await self.get_daily_search_count(user_id)
-            remaining = daily_limit - current_count
+            result = await run_query(self.supabase.rpc('reserve_daily_usage', {
+                'p_user_id': user_id,
+                'p_day': self._today_start().date().isoformat(),
+                'p_action': 'search',
+                'p_limit': daily_limit,
+                'p_amount': amount,
+            }))
 
-            if remaining <= 0:
-                return False, 0, f'本日の検索上限（{daily_limit}回）に達しました。明日以降に再度お試しください。'
+            if result.data is None:
+                return False, 0, limit_error, False
 
-            return True, remaining, ''
+            # 確保後の回数から、今回の検索分を含む残り回数を算出
+            return True, daily_limit - result.data + amount, '', True
 
         except Exception as e:
+            logger.warning(f'Failed to reserve search slot, falling back to usage logs: {e}')
+
+        if amount > 1:
+            raise SearchLimitUnavailableError(
+                '現在ディープ検索は利用できません。ページ数を1にして再度お試しください。'
+            )
+
+        try:
+            current_count = await self._count_searches_today(user_id)
+        except Exception as e:
+            # 回数を確認できない場合は検索させない（制限が無効になるのを防ぐ）
             logger.error(f'Failed to check search limit: {e}')
-            # エラー時は制限を適用しない（ユーザー体験を優先）
-            return True, daily_limit, ''
+            raise SearchLimitUnavailableError(
+                '検索回数を確認できませんでした。しばらくしてから再度お試しください。'
+            ) from e
+
+        remaining = daily_limit - current_count
+        if remaining <= 0:
+            return False, 0, limit_error, False
+
+        return True, remaining, '', False
+
+    async def release_search_slot(self, user_id: str, amount: int = 1) -> None:
+        """
+        check_search_limit で確保した検索回数を返却（検索が失敗した場合）
+
+        確保できた場合（check_search_limit の戻り値の4番目がTrue）のみ呼び出すこと
+
+        Args:
+            user_id: ユーザーID
+            amount: 確保した回数（check_search_limit に渡したもの）
+        """
+        from app.config import settings
+        if settings.internal_mode:
+            return
+
+        try:
+            await run_query(self.supabase.rpc('release_daily_usage', {
+                'p_user_id': user_id,
+                'p_day': self._today_start().date().isoformat(),
+                'p_action': 'search',
+                'p_amount': amount,
+            }))
+        except Exception as e:
+            logger.error(f'Failed to release search slot: {e}')
 
     async def log_usage(
         self,
@@ -312,7 +471,7 @@ class AuthService:
             user_agent: ユーザーエージェント
 
         Returns:
-            bool: 成功したかどうか
+            bool: バッファに追加できたかどうか（書き込みは非同期）
         """
         # 社内モードではログ記録をスキップ
         from app.config import settings
@@ -320,19 +479,15 @@ class AuthService:
             logger.info(f'[Internal Mode] Usage log skipped: user={user_id}, action={action}')
             return True
 
-        try:
-            self.supabase.table('usage_logs').insert({
-                'user_id': user_id,
-                'action': action,
-                'metadata': metadata,
-                'ip_address': ip_address,
-                'user_agent': user_agent
-            }).execute()
-            return True
-
-        except Exception as e:
-            logger.error(f'Failed to log usage: {e}')
-            return False
+        # バッファに追加してバックグラウンドで一括挿入（リクエストはDB書き込みを待たない）
+        return get_usage_log_buffer().add({
+            'user_id': user_id,
+            'action': action,
+            'metadata': metadata,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'created_at': datetime.now(tz=timezone.utc).isoformat()
+        })
 
 
 # シングルトンインスタンス
@@ -0,0 +1,281 @@
+"""
+YouTube APIクォータ台帳 - バズり動画究極リサーチシステム
+
+APIキーごとの消費ユニットを記録し、残りクォータが最も多いキーを選択する
+
+【設計】
+- 実際のユニットコスト（search.list=100, videos.list等=1）をリクエストごとに計上
+- YouTubeのクォータリセット（太平洋時間 0時）で日付が変わると自動的にリセット
+- 消費量はSupabaseに定期同期し、再起動後や複数ワーカー間でも同じ値を参照
+- キーごとの消費量・残量をPrometheusメトリクスとして公開
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import date, datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from prometheus_client import Counter, Gauge
+
+from app.config import settings
+from app.core.database import run_query
+
+# ロガー設定
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# 定数定義
+# ============================================
+
+# YouTube APIのクォータは太平洋時間の0時にリセットされる
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+
+
+# ============================================
+# Prometheusメトリクス
+# ============================================
+
+QUOTA_UNITS_USED = Gauge(
+    'youtube_quota_units_used',
+    'YouTube API quota units used today (Pacific time) per API key',
+    ['key'],
+)
+QUOTA_UNITS_REMAINING = Gauge(
+    'youtube_quota_units_remaining',
+    'YouTube API quota units remaining today (Pacific time) per API key',
+    ['key'],
+)
+QUOTA_EXHAUSTED_TOTAL = Counter(
+    'youtube_quota_exhausted_total',
+    'Number of times an API key was reported as quota exhausted by YouTube',
+    ['key'],
+)
+
+
+def current_quota_date() -> date:
+    """
+    現在のクォータ日（太平洋時間の日付）を取得
+
+    Returns:
+        date: クォータ日
+    """
+    return datetime.now(QUOTA_TIMEZONE).date()
+
+
+def key_fingerprint(api_key: str) -> str:
+    """
+    永続化用のAPIキー識別子を生成（キーそのものは保存しない）
+
+    Args:
+        api_key: YouTube APIキー
+
+    Returns:
+        str: SHA-256ハッシュの先頭16文字
+    """
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+class QuotaLedger:
+    """APIキーごとのクォータ消費台帳"""
+
+    def __init__(self, api_keys: list[str], daily_limit: int = settings.youtube_daily_quota):
+        """
+        台帳初期化
+
+        Args:
+            api_keys: YouTube APIキーリスト
+            daily_limit: 1キーあたりの1日のクォータ上限（ユニット）
+        """
+        self.daily_limit = daily_limit
+        self._key_ids = [key_fingerprint(k) for k in api_keys]
+        self._quota_date = current_quota_date()
+        self._used: list[int] = [0] * len(api_keys)
+        # Supabaseへ未同期の消費量
+        self._pending: list[int] = [0] * len(api_keys)
+        self._last_sync = 0.0
+        self._sync_task: Optional[asyncio.Task] = None
+        self._supabase = None
+
+        for index in range(len(api_keys)):
+            self._update_metrics(index)
+
+    def _get_supabase_client(self):
+        """Supabaseクライアントを取得（台帳永続化用）"""
+        if self._supabase is None:
+            try:
+                from app.core.supabase import get_supabase_admin
+                self._supabase = get_supabase_admin()
+            except Exception as e:
+                logger.warning(f'Supabase not available for quota ledger: {e}')
+        return self._supabase
+
+    # ============================================
+    # キー選択・消費記録
+    # ============================================
+
+    def remaining(self, index: int) -> int:
+        """
+        キーの残りクォータを取得
+
+        Args:
+            index: APIキーのインデックス
+
+        Returns:
+            int: 残りユニット数
+        """
+        self._reset_if_new_day()
+        return max(self.daily_limit - self._used[index], 0)
+
+    def has_available_key(self, cost: int = 1) -> bool:
+        """
+        指定コストを消費できるキーが残っているか
+
+        Args:
+            cost: 必要なユニット数
+
+        Returns:
+            bool: 消費可能なキーがある場合True
+        """
+        return self.select_key(cost) is not None
+
+    def select_key(self, cost: int) -> Optional[int]:
+        """
+        残りクォータが最も多いキーを選択
+
+        Args:
+            cost: 必要なユニット数
+
+        Returns:
+            Optional[int]: キーのインデックス（消費可能なキーがない場合None）
+        """
+        self._reset_if_new_day()
+        candidates = [i for i in range(len(self._used)) if self.remaining(i) >= cost]
+        if not candidates:
+            return None
+        return max(candidates, key=self.remaining)
+
+    def charge(self, index: int, units: int) -> None:
+        """
+        キーの消費ユニットを計上
+
+        Args:
+            index: APIキーのインデックス
+            units: 消費ユニット数
+        """
+        self._reset_if_new_day()
+        self._used[index] += units
+        self._pending[index] += units
+        self._update_metrics(index)
+        self._schedule_sync()
+
+    def mark_exhausted(self, index: int) -> None:
+        """
+        YouTubeからクォータ超過を通知されたキーを当日分使い切りとして記録
+
+        Args:
+            index: APIキーのインデックス
+        """
+        QUOTA_EXHAUSTED_TOTAL.labels(key=self._label(index)).inc()
+        remaining = self.remaining(index)
+        if remaining > 0:
+            logger.warning(
+                f'API key {index + 1}/{len(self._used)} reported quota exceeded '
+                f'with {remaining} units left in ledger'
+            )
+            self.charge(index, remaining)
+
+    def _reset_if_new_day(self) -> None:
+        """クォータ日が変わっていれば消費量をリセット"""
+        today = current_quota_date()
+        if today == self._quota_date:
+            return
+
+        logger.info(f'YouTube quota day changed to {today.isoformat()}, resetting ledger')
+        self._quota_date = today
+        self._used = [0] * len(self._used)
+        self._pending = [0] * len(self._pending)
+        for index in range(len(self._used)):
+            self._update_metrics(index)
+
+    def _label(self, index: int) -> str:
+        """メトリクス用のキーラベル（キー番号）"""
+        return str(index + 1)
+
+    def _update_metrics(self, index: int) -> None:
+        """キーのメトリクスを更新"""
+        used = self._used[index]
+        QUOTA_UNITS_USED.labels(key=self._label(index)).set(used)
+        QUOTA_UNITS_REMAINING.labels(key=self._label(index)).set(max(self.daily_limit - used, 0))
+
+    # ============================================
+    # Supabase同期
+    # ============================================
+
+    def _schedule_sync(self) -> None:
+        """前回同期から一定時間経過していればバックグラウンドで同期"""
+        if not settings.enable_supabase_cache:
+            return
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        if time.monotonic() - self._last_sync < settings.quota_sync_interval_seconds:
+            return
+
+        try:
+            self._sync_task = asyncio.get_running_loop().create_task(self.sync())
+        except RuntimeError:
+            # イベントループ外（起動前など）では次回の計上時に同期する
+            pass
+
+    async def sync(self) -> None:
+        """
+        未同期の消費量をSupabaseに加算し、全ワーカー合算の消費量を取り込む
+
+        同期に失敗した消費量は次回の同期で再送する
+        """
+        supabase = self._get_supabase_client()
+        if not supabase or not self._key_ids:
+            return
+
+        self._last_sync = time.monotonic()
+        quota_date = self._quota_date
+        pending = self._pending
+        self._pending = [0] * len(pending)
+        increments = {
+            key_id: units
+            for key_id, units in zip(self._key_ids, pending)
+            if units > 0
+        }
+
+        try:
+            result = await run_query(supabase.rpc('sync_youtube_quota', {
+                'p_quota_date': quota_date.isoformat(),
+                'p_increments': increments,
+            }))
+        except Exception as e:
+            logger.warning(f'Failed to sync YouTube quota ledger: {e}')
+            if quota_date == self._quota_date:
+                self._pending = [p + q for p, q in zip(self._pending, pending)]
+            return
+
+        # 同期中に日付が変わった場合は古い日の集計を取り込まない
+        if quota_date != self._quota_date:
+            return
+
+        totals = {row['key_id']: row['units_used'] for row in result.data or []}
+        for index, key_id in enumerate(self._key_ids):
+            # 同期中に計上された未同期分を加味して、他ワーカーの消費を取り込む
+            shared = totals.get(key_id, 0) + self._pending[index]
+            if shared > self._used[index]:
+                self._used[index] = shared
+                self._update_metrics(index)
+
+    async def close(self) -> None:
+        """未同期の消費量を同期して終了"""
+        if self._sync_task is not None and not self._sync_task.done():
+            await self._sync_task
+        if settings.enable_supabase_cache and any(self._pending):
+            await self.sync()
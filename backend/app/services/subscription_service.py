@@ -11,6 +11,7 @@ from typing import Optional
 from pydantic import BaseModel
 from supabase import Client
 
+from app.core.database import run_query
 from app.core.supabase import get_supabase_admin
 from app.services.paypal_service import get_paypal_service, PayPalService
 
@@ -60,7 +61,7 @@ class SubscriptionService:
             SubscriptionInfo: サブスクリプション情報
         """
         try:
-            result = self.supabase.table('subscriptions').select('*').eq('user_id', user_id).order('created_at', desc=True).limit(1).execute()
+            result = await run_query(self.supabase.table('subscriptions').select('*').eq('user_id', user_id).order('created_at', desc=True).limit(1))
 
             if not result.data:
                 return None
@@ -116,11 +117,11 @@ class SubscriptionService:
                 )
 
             # DBにサブスクリプション（pending状態）を作成
-            result = self.supabase.table('subscriptions').insert({
+            result = await run_query(self.supabase.table('subscriptions').insert({
                 'user_id': user_id,
                 'paypal_subscription_id': paypal_sub['id'],
                 'status': 'pending',
-            }).execute()
+            }))
 
             if not result.data:
                 return CreateSubscriptionResult(
@@ -164,11 +165,11 @@ class SubscriptionService:
             current_period_end = now + timedelta(days=30)
 
             # DBを更新
-            result = self.supabase.table('subscriptions').update({
+            result = await run_query(self.supabase.table('subscriptions').update({
                 'status': 'active',
                 'current_period_start': now.isoformat(),
                 'current_period_end': current_period_end.isoformat(),
-            }).eq('paypal_subscription_id', paypal_subscription_id).execute()
+            }).eq('paypal_subscription_id', paypal_subscription_id))
 
             if not result.data:
                 logger.error('Failed to update subscription in DB')
@@ -176,14 +177,14 @@ class SubscriptionService:
 
             # 支払い履歴を記録
             sub = result.data[0]
-            self.supabase.table('payment_history').insert({
+            await run_query(self.supabase.table('payment_history').insert({
                 'subscription_id': sub['id'],
                 'user_id': sub['user_id'],
                 'paypal_payment_id': paypal_subscription_id,
                 'amount': sub.get('price_amount', 9900),
                 'status': 'completed',
                 'paid_at': now.isoformat(),
-            }).execute()
+            }))
 
             return True
 
@@ -213,10 +214,10 @@ class SubscriptionService:
                 await self.paypal.cancel_subscription(sub.paypal_subscription_id, reason)
 
             # DBを更新（期間終了時にキャンセル）
-            self.supabase.table('subscriptions').update({
+            await run_query(self.supabase.table('subscriptions').update({
                 'cancel_at_period_end': True,
                 'cancelled_at': datetime.now(tz=timezone.utc).isoformat(),
-            }).eq('id', sub.id).execute()
+            }).eq('id', sub.id))
 
             return True
 
@@ -237,7 +238,7 @@ class SubscriptionService:
         """
         try:
             # サブスクリプションを取得
-            result = self.supabase.table('subscriptions').select('*').eq('paypal_subscription_id', paypal_subscription_id).single().execute()
+            result = await run_query(self.supabase.table('subscriptions').select('*').eq('paypal_subscription_id', paypal_subscription_id).single())
 
             if not result.data:
                 logger.error(f'Subscription not found: {paypal_subscription_id}')
@@ -249,23 +250,23 @@ class SubscriptionService:
             # 期間を延長
             current_period_end = now + timedelta(days=30)
 
-            self.supabase.table('subscriptions').update({
+            await run_query(self.supabase.table('subscriptions').update({
                 'status': 'active',
                 'current_period_start': now.isoformat(),
                 'current_period_end': current_period_end.isoformat(),
                 'cancel_at_period_end': False,
-            }).eq('id', sub['id']).execute()
+            }).eq('id', sub['id']))
 
             # 支払い履歴を記録
             amount = payment_data.get('amount', {}).get('value', '9900')
-            self.supabase.table('payment_history').insert({
+            await run_query(self.supabase.table('payment_history').insert({
                 'subscription_id': sub['id'],
                 'user_id': sub['user_id'],
                 'paypal_payment_id': payment_data.get('id', ''),
                 'amount': int(float(amount)),
                 'status': 'completed',
                 'paid_at': now.isoformat(),
-            }).execute()
+            }))
 
             return True
 
@@ -284,10 +285,10 @@ class SubscriptionService:
             bool: 成功したかどうか
         """
         try:
-            self.supabase.table('subscriptions').update({
+            await run_query(self.supabase.table('subscriptions').update({
                 'status': 'cancelled',
                 'cancelled_at': datetime.now(tz=timezone.utc).isoformat(),
-            }).eq('paypal_subscription_id', paypal_subscription_id).execute()
+            }).eq('paypal_subscription_id', paypal_subscription_id))
 
             return True
 
@@ -306,14 +307,14 @@ class SubscriptionService:
             now = datetime.now(tz=timezone.utc)
 
             # トライアル期限切れ
-            self.supabase.table('subscriptions').update({
+            await run_query(self.supabase.table('subscriptions').update({
                 'status': 'expired'
-            }).eq('status', 'trialing').lt('trial_end', now.isoformat()).execute()
+            }).eq('status', 'trialing').lt('trial_end', now.isoformat()))
 
             # サブスクリプション期限切れ（キャンセル予約済み）
-            self.supabase.table('subscriptions').update({
+            await run_query(self.supabase.table('subscriptions').update({
                 'status': 'expired'
-            }).eq('status', 'active').eq('cancel_at_period_end', True).lt('current_period_end', now.isoformat()).execute()
+            }).eq('status', 'active').eq('cancel_at_period_end', True).lt('current_period_end', now.isoformat()))
 
             return 0  # 実際の更新数を返すにはカウントが必要
 
@@ -0,0 +1,203 @@
+"""
+利用ログバッファ - バズ動画リサーチくん
+
+利用ログ（usage_logs）をメモリ上のバッファに溜め、バックグラウンドで一括挿入する
+リクエスト処理中にDB書き込みを待たないため、ログ記録がレスポンス時間に影響しない
+
+【仕様】
+- 一定間隔（usage_log_flush_interval_ms）または一定件数（usage_log_batch_size）で一括挿入
+- バッファ上限（usage_log_buffer_max）を超えたログは破棄し、破棄件数をメトリクスに記録
+- 挿入失敗時は指数バックオフで再試行
+- アプリケーション終了時は実行中の挿入の完了を待ち、残りのログを書き込む
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Optional
+
+from prometheus_client import Counter, Gauge
+
+from app.config import settings
+from app.core.database import run_query
+
+# ロガー設定
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# 定数定義
+# ============================================
+
+# 挿入失敗時の再試行待機時間（秒）
+RETRY_BACKOFF_INITIAL = 1.0
+RETRY_BACKOFF_MAX = 60.0
+
+
+# ============================================
+# Prometheusメトリクス
+# ============================================
+
+USAGE_LOG_BUFFERED = Gauge(
+    'usage_log_buffer_size',
+    'Number of usage log rows waiting to be inserted',
+)
+USAGE_LOG_DROPPED = Counter(
+    'usage_log_dropped_total',
+    'Number of usage log rows dropped because the buffer was full or shutdown flush failed',
+)
+USAGE_LOG_INSERT_FAILURES = Counter(
+    'usage_log_insert_failures_total',
+    'Number of failed bulk inserts into usage_logs',
+)
+
+
+class UsageLogBuffer:
+    """利用ログの書き込みバッファ"""
+
+    def __init__(
+        self,
+        flush_interval_ms: int = settings.usage_log_flush_interval_ms,
+        batch_size: int = settings.usage_log_batch_size,
+        max_size: int = settings.usage_log_buffer_max
+    ):
+        """
+        バッファ初期化
+
+        Args:
+            flush_interval_ms: 一括挿入の間隔（ミリ秒）
+            batch_size: 1回の挿入件数（この件数が溜まると間隔を待たずに挿入）
+            max_size: バッファの最大件数
+        """
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.max_size = max_size
+        self._rows: deque[dict] = deque()
+        self._batch_ready = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._supabase = None
+
+    def _get_supabase_client(self):
+        """Supabaseクライアントを取得"""
+        if self._supabase is None:
+            from app.core.supabase import get_supabase_admin
+            self._supabase = get_supabase_admin()
+        return self._supabase
+
+    def add(self, row: dict) -> bool:
+        """
+        利用ログをバッファに追加（DB書き込みは待たない）
+
+        Args:
+            row: usage_logs の1行
+
+        Returns:
+            bool: 追加できた場合True（バッファ上限で破棄した場合False）
+        """
+        if len(self._rows) >= self.max_size:
+            USAGE_LOG_DROPPED.inc()
+            logger.warning('Usage log buffer is full, dropping row')
+            return False
+
+        self._rows.append(row)
+        USAGE_LOG_BUFFERED.set(len(self._rows))
+        if len(self._rows) >= self.batch_size:
+            self._batch_ready.set()
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._run())
+        return True
+
+    async def _run(self) -> None:
+        """
+        一定間隔または一定件数ごとにバッファを書き込むループ
+
+        close() で停止を要求されると、実行中の挿入を終えてから抜ける
+        （挿入中にキャンセルすると取り出したログが失われるため、キャンセルはしない）
+        """
+        backoff = RETRY_BACKOFF_INITIAL
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            if self._stopping.is_set():
+                break
+
+            if await self._flush():
+                backoff = RETRY_BACKOFF_INITIAL
+            else:
+                # 再試行待ちの間に停止を要求された場合はすぐに抜ける
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), backoff)
+                except asyncio.TimeoutError:
+                    pass
+                backoff = min(backoff * 2, RETRY_BACKOFF_MAX)
+
+    async def _flush(self) -> bool:
+        """
+        バッファのログを一括挿入
+
+        Returns:
+            bool: すべて挿入できた場合True（失敗したログはバッファ先頭に戻す）
+        """
+        while self._rows:
+            batch = [self._rows.popleft() for _ in range(min(self.batch_size, len(self._rows)))]
+            try:
+                supabase = self._get_supabase_client()
+                await run_query(supabase.table('usage_logs').insert(batch))
+            except Exception as e:
+                USAGE_LOG_INSERT_FAILURES.inc()
+                logger.warning(f'Failed to insert {len(batch)} usage log rows, will retry: {e}')
+                self._requeue(batch)
+                return False
+            finally:
+                USAGE_LOG_BUFFERED.set(len(self._rows))
+        return True
+
+    def _requeue(self, batch: list[dict]) -> None:
+        """挿入に失敗したログをバッファ先頭に戻す（上限を超える分は破棄）"""
+        room = max(self.max_size - len(self._rows), 0)
+        if len(batch) > room:
+            USAGE_LOG_DROPPED.inc(len(batch) - room)
+            batch = batch[:room]
+        self._rows.extendleft(reversed(batch))
+
+    async def close(self) -> None:
+        """バックグラウンド処理を停止し（実行中の挿入は完了を待つ）、残りのログを書き込む"""
+        self._stopping.set()
+        self._batch_ready.set()
+        if self._flusher is not None:
+            await self._flusher
+            self._flusher = None
+
+        if self._rows and not await self._flush():
+            logger.error(f'Dropping {len(self._rows)} usage log rows on shutdown')
+            USAGE_LOG_DROPPED.inc(len(self._rows))
+            self._rows.clear()
+            USAGE_LOG_BUFFERED.set(0)
+
+
+# ============================================
+# シングルトン
+# ============================================
+
+_usage_log_buffer: Optional[UsageLogBuffer] = None
+
+
+def get_usage_log_buffer() -> UsageLogBuffer:
+    """利用ログバッファのシングルトンインスタンスを取得"""
+    global _usage_log_buffer
+    if _usage_log_buffer is None:
+        _usage_log_buffer = UsageLogBuffer()
+    return _usage_log_buffer
+
+
+async def close_usage_log_buffer() -> None:
+    """利用ログバッファを閉じる（残りのログを書き込む）"""
+    global _usage_log_buffer
+    if _usage_log_buffer is not None:
+        await _usage_log_buffer.close()
+        _usage_log_buffer = None
@@ -0,0 +1,554 @@
+"""
+動画列指向データ - バズり動画究極リサーチシステム
+
+videos.list のレスポンスをNumPy配列（列）に変換し、
+経過日数・日平均再生数・影響力・高評価率とフィルター判定を一括で計算する
+検索結果のメモリキャッシュもこの形式で保持する
+
+【特徴】
+- 計算値・フィルター判定は1回のベクトル演算で全件分を算出
+- Videoオブジェクトはフィルターを通過した行だけ、レスポンス時に生成
+- チャンネル情報はチャンネルIDごとに1件だけ保持（動画側はインデックスで参照）
+- 動画URL・標準のサムネイルURLは保持せず動画IDから生成、公開日時は datetime64 で保持
+- 計算ルール（丸めは Python の round() と同じ値）
+  - 経過日数: 公開日時からの経過日数（UTC基準、切り捨て、未来日時・解釈できない日時は0）
+  - 日平均再生数: 再生回数 / 経過日数（小数2桁、経過日数が0の場合は再生回数）
+  - 影響力: 再生回数 / 登録者数（小数2桁、登録者数が0の場合は0.0）
+  - 高評価率: 高評価数 / 再生回数（小数4桁、再生回数が0の場合は0.0）
+"""
+
+import logging
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+
+from app.schemas import SearchFilters, SearchResult, Video
+
+# ロガー設定
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# 定数定義
+# ============================================
+
+# 動画URLのプレフィックス（動画IDから生成する）
+VIDEO_URL_PREFIX = 'https://www.youtube.com/watch?v='
+
+# 標準のサムネイルURL（videos.list の thumbnails.high）
+# これと異なるURL（ライブ配信用など）の行のみ個別に保持する
+THUMBNAIL_URL_TEMPLATE = 'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg'
+
+# サムネイルの優先順（高解像度優先）
+THUMBNAIL_SIZES = ('high', 'medium', 'default')
+
+
+def _parse_count(value) -> int:
+    """
+    APIレスポンスの数値（文字列）を整数に変換
+
+    Args:
+        value: viewCount などの値
+
+    Returns:
+        int: 整数値
+
+    Raises:
+        ValueError: 整数に変換できない場合
+    """
+    return int(value if value is not None else 0)
+
+
+def _parse_published_at(values: list[str]) -> np.ndarray:
+    """
+    公開日時（ISO 8601形式）をUTCのdatetime64配列に変換
+
+    YouTubeの形式（末尾Z）は一括変換し、それ以外の形式を含む場合のみ1件ずつ変換する
+
+    Args:
+        values: 公開日時リスト
+
+    Returns:
+        np.ndarray: datetime64[s]配列（変換できない値はNaT）
+    """
+    if all(isinstance(v, str) and v.endswith('Z') for v in values):
+        try:
+            return np.array([v[:-1] for v in values], dtype='datetime64[s]')
+        except ValueError:
+            pass
+
+    parsed = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[s]')
+    for index, value in enumerate(values):
+        try:
+            published = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if published.tzinfo is not None:
+                published = published.astimezone(timezone.utc).replace(tzinfo=None)
+            parsed[index] = np.datetime64(published, 's')
+        except (ValueError, TypeError, AttributeError):
+            logger.warning(f'Invalid published_at format: {value}')
+    return parsed
+
+
+def _round_ratio(numerator: np.ndarray, denominator: np.ndarray, digits: int) -> np.ndarray:
+    """
+    整数の比を小数点以下 digits 桁に丸める（Pythonの round(a / b, digits) と同じ値）
+
+    np.round は倍率を掛けた浮動小数点数を丸めるため round() と結果がずれることがある。
+    整数演算で丸め、ちょうど中間になる行だけ round() で計算する
+
+    Args:
+        numerator: 分子（0以上の整数配列）
+        denominator: 分母（1以上の整数配列）
+        digits: 小数点以下の桁数
+
+    Returns:
+        np.ndarray: 丸めた比（float64配列）
+    """
+    scale = 10 ** digits
+    quotient, remainder = np.divmod(numerator * scale, denominator)
+    twice = remainder * 2
+    result = (quotient + (twice > denominator)) / scale
+
+    for row in np.flatnonzero(twice == denominator):
+        result[row] = round(int(numerator[row]) / int(denominator[row]), digits)
+    return result
+
+
+class VideoColumns:
+    """動画リストの列指向表現（1行 = 1動画）"""
+
+    def __init__(self):
+        """空の列で初期化"""
+        # 動画ごとの列
+        self.video_ids: list[str] = []
+        self.titles: list[str] = []
+        self.published = np.zeros(0, dtype='datetime64[s]')
+        self.channel_index = np.zeros(0, dtype=np.int32)
+        self.view_count = np.zeros(0, dtype=np.int64)
+        self.like_count = np.zeros(0, dtype=np.int64)
+
+        # 計算値の列
+        self.days_ago = np.zeros(0, dtype=np.int64)
+        self.daily_avg_views = np.zeros(0, dtype=np.float64)
+        self.impact_ratio = np.zeros(0, dtype=np.float64)
+        self.like_ratio = np.zeros(0, dtype=np.float64)
+
+        # チャンネルごとの列（channel_index で参照）
+        self.channel_ids: list[str] = []
+        self.channel_names: list[str] = []
+        self.channel_created_at: list[str] = []
+        self.channel_subscriber_count = np.zeros(0, dtype=np.int64)
+
+        # 動画IDや公開日時から復元できない値（行番号 → 元の文字列）
+        self.published_at_overrides: dict[int, str] = {}
+        self.thumbnail_overrides: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        """動画数"""
+        return len(self.video_ids)
+
+    @property
+    def subscriber_count(self) -> np.ndarray:
+        """動画ごとの登録者数"""
+        return self.channel_subscriber_count[self.channel_index]
+
+    def published_at(self, row: int) -> str:
+        """
+        行の公開日時（ISO 8601形式）を取得
+
+        Args:
+            row: 行番号
+
+        Returns:
+            str: 公開日時
+        """
+        override = self.published_at_overrides.get(row)
+        if override is not None:
+            return override
+        return f'{np.datetime_as_string(self.published[row], unit="s")}Z'
+
+    def thumbnail_url(self, row: int) -> str:
+        """
+        行のサムネイルURLを取得
+
+        Args:
+            row: 行番号
+
+        Returns:
+            str: サムネイルURL
+        """
+        override = self.thumbnail_overrides.get(row)
+        if override is not None:
+            return override
+        return THUMBNAIL_URL_TEMPLATE.format(video_id=self.video_ids[row])
+
+    # ============================================
+    # 構築
+    # ============================================
+
+    @classmethod
+    def from_api(
+        cls,
+        video_details: list[dict],
+        channel_map: dict[str, dict],
+        now: Optional[datetime] = None
+    ) -> 'VideoColumns':
+        """
+        videos.list のレスポンスから列を構築し、計算値を一括で算出
+
+        数値を解釈できない動画は除外する
+
+        Args:
+            video_details: 動画詳細データリスト
+            channel_map: チャンネル情報マップ
+            now: 経過日数の基準時刻（Noneの場合は現在時刻）
+
+        Returns:
+            VideoColumns: 列指向の動画リスト
+        """
+        columns = cls()
+        channel_positions: dict[str, int] = {}
+        channel_index: list[int] = []
+        view_count: list[int] = []
+        like_count: list[int] = []
+        subscriber_count: list[int] = []
+        published_at: list[str] = []
+        thumbnail_urls: list[str] = []
+
+        for video in video_details:
+            try:
+                snippet = video.get('snippet', {})
+                statistics = video.get('statistics', {})
+                channel_id = snippet.get('channelId', '')
+                views = _parse_count(statistics.get('viewCount', 0))
+                likes = _parse_count(statistics.get('likeCount', 0))
+
+                position = channel_positions.get(channel_id)
+                if position is None:
+                    channel_info = channel_map.get(channel_id, {})
+                    subscriber_count.append(_parse_count(channel_info.get('subscriberCount', 0)))
+                    position = columns._add_channel(
+                        channel_positions,
+                        channel_id,
+                        channel_info.get('title', snippet.get('channelTitle', '')),
+                        channel_info.get('publishedAt', '')
+                    )
+            except (ValueError, TypeError, AttributeError) as e:
+                logger.warning(f'Failed to build video object: {e}')
+                continue
+
+            thumbnails = snippet.get('thumbnails', {})
+            columns.video_ids.append(video.get('id', ''))
+            columns.titles.append(snippet.get('title', ''))
+            published_at.append(snippet.get('publishedAt', ''))
+            thumbnail_urls.append(next(
+                (thumbnails[size]['url'] for size in THUMBNAIL_SIZES
+                 if thumbnails.get(size, {}).get('url')),
+                ''
+            ))
+            channel_index.append(position)
+            view_count.append(views)
+            like_count.append(likes)
+
+        columns.channel_index = np.array(channel_index, dtype=np.int32)
+        columns.view_count = np.array(view_count, dtype=np.int64)
+        columns.like_count = np.array(like_count, dtype=np.int64)
+        columns.channel_subscriber_count = np.array(subscriber_count, dtype=np.int64)
+        columns._set_text_columns(published_at, thumbnail_urls)
+        columns._compute_metrics(now or datetime.now(timezone.utc))
+        return columns
+
+    @classmethod
+    def from_videos(cls, videos: list[Video]) -> 'VideoColumns':
+        """
+        Videoオブジェクトのリストから列を構築（計算値はそのまま保持）
+
+        Args:
+            videos: 動画リスト
+
+        Returns:
+            VideoColumns: 列指向の動画リスト
+        """
+        columns = cls()
+        channel_positions: dict[str, int] = {}
+        channel_index: list[int] = []
+        subscriber_count: list[int] = []
+
+        for video in videos:
+            position = channel_positions.get(video.channel_id)
+            if position is None:
+                subscriber_count.append(video.subscriber_count)
+                position = columns._add_channel(
+                    channel_positions,
+                    video.channel_id,
+                    video.channel_name,
+                    video.channel_created_at
+                )
+            channel_index.append(position)
+            columns.video_ids.append(video.video_id)
+            columns.titles.append(video.title)
+
+        columns.channel_index = np.array(channel_index, dtype=np.int32)
+        columns.channel_subscriber_count = np.array(subscriber_count, dtype=np.int64)
+        columns.view_count = np.array([v.view_count for v in videos], dtype=np.int64)
+        columns.like_count = np.array([v.like_count for v in videos], dtype=np.int64)
+        columns.days_ago = np.array([v.days_ago for v in videos], dtype=np.int64)
+        columns.daily_avg_views = np.array([v.daily_avg_views for v in videos], dtype=np.float64)
+        columns.impact_ratio = np.array([v.impact_ratio for v in videos], dtype=np.float64)
+        columns.like_ratio = np.array([v.like_ratio for v in videos], dtype=np.float64)
+        columns._set_text_columns(
+            [v.published_at for v in videos],
+            [v.thumbnail_url for v in videos]
+        )
+        return columns
+
+    def _add_channel(
+        self,
+        positions: dict[str, int],
+        channel_id: str,
+        channel_name: str,
+        channel_created_at: str
+    ) -> int:
+        """
+        チャンネル情報を追加（文字列はインターンし、他の検索結果と共有する）
+
+        Args:
+            positions: チャンネルID → 位置のマップ（構築中のもの）
+            channel_id: チャンネルID
+            channel_name: チャンネル名
+            channel_created_at: チャンネル作成日時
+
+        Returns:
+            int: チャンネルの位置（channel_index の値）
+        """
+        position = len(self.channel_ids)
+        positions[channel_id] = position
+        self.channel_ids.append(sys.intern(channel_id))
+        self.channel_names.append(sys.intern(channel_name))
+        self.channel_created_at.append(sys.intern(channel_created_at))
+        return position
+
+    def _set_text_columns(self, published_at: list[str], thumbnail_urls: list[str]) -> None:
+        """
+        公開日時・サムネイルURLを保持（復元できない値のみ文字列で保持）
+
+        Args:
+            published_at: 行ごとの公開日時
+            thumbnail_urls: 行ごとのサムネイルURL
+        """
+        self.published = _parse_published_at(published_at)
+        restored = np.datetime_as_string(self.published, unit='s')
+        self.published_at_overrides = {
+            row: text
+            for row, (text, value) in enumerate(zip(published_at, restored.tolist()))
+            if text != f'{value}Z'
+        }
+        self.thumbnail_overrides = {
+            row: url
+            for row, (video_id, url) in enumerate(zip(self.video_ids, thumbnail_urls))
+            if url != THUMBNAIL_URL_TEMPLATE.format(video_id=video_id)
+        }
+
+    def _compute_metrics(self, now: datetime) -> None:
+        """
+        経過日数・日平均再生数・影響力・高評価率を一括計算
+
+        Args:
+            now: 経過日数の基準時刻（UTC）
+        """
+        published = self.published
+        now64 = np.datetime64(now.astimezone(timezone.utc).replace(tzinfo=None), 's')
+        elapsed = (now64 - published).astype(np.int64)
+        # timedelta.days と同じく切り捨て、未来日時・解釈できない日時は0日
+        days = np.where(np.isnat(published), 0, np.floor_divide(elapsed, 86400))
+        self.days_ago = np.maximum(days, 0)
+
+        views = self.view_count
+        subscribers = self.subscriber_count
+        # 0除算防止のため分母は1以上にしてから計算し、該当行は np.where で置き換える
+        positive_views = np.maximum(views, 0)
+
+        # 今日公開された動画は再生回数をそのまま日平均とする
+        self.daily_avg_views = np.where(
+            self.days_ago > 0,
+            _round_ratio(positive_views, np.maximum(self.days_ago, 1), 2),
+            views.astype(np.float64)
+        )
+        # 登録者数・再生回数が0の場合は0.0
+        self.impact_ratio = np.where(
+            subscribers > 0,
+            _round_ratio(positive_views, np.maximum(subscribers, 1), 2),
+            0.0
+        )
+        self.like_ratio = np.where(
+            views > 0,
+            _round_ratio(np.maximum(self.like_count, 0), np.maximum(views, 1), 4),
+            0.0
+        )
+
+    # ============================================
+    # フィルター・Video生成
+    # ============================================
+
+    def filter_mask(self, filters: Optional[SearchFilters]) -> np.ndarray:
+        """
+        フィルター条件を満たす行のマスクを計算
+
+        Videoとして不正な値（負の数値・高評価率が1を超える）の行は常に除外する
+
+        Args:
+            filters: 検索フィルター条件
+
+        Returns:
+            np.ndarray: 行ごとの判定結果（bool配列）
+        """
+        subscribers = self.subscriber_count
+        mask = (
+            (self.view_count >= 0)
+            & (self.like_count >= 0)
+            & (subscribers >= 0)
+            & (self.like_ratio <= 1)
+        )
+        if filters is None:
+            return mask
+
+        # 影響力フィルター
+        if filters.impact_min is not None:
+            mask &= self.impact_ratio >= filters.impact_min
+        if filters.impact_max is not None:
+            mask &= self.impact_ratio <= filters.impact_max
+
+        # 登録者数フィルター
+        if filters.subscriber_min is not None:
+            mask &= subscribers >= filters.subscriber_min
+        if filters.subscriber_max is not None:
+            mask &= subscribers <= filters.subscriber_max
+
+        return mask
+
+    def video_at(self, row: int) -> Video:
+        """
+        行からVideoオブジェクトを生成
+
+        Args:
+            row: 行番号
+
+        Returns:
+            Video: 動画オブジェクト
+        """
+        channel = int(self.channel_index[row])
+        video_id = self.video_ids[row]
+        return Video(
+            video_id=video_id,
+            url=f'{VIDEO_URL_PREFIX}{video_id}',
+            title=self.titles[row],
+            published_at=self.published_at(row),
+            thumbnail_url=self.thumbnail_url(row),
+            view_count=int(self.view_count[row]),
+            like_count=int(self.like_count[row]),
+            channel_id=self.channel_ids[channel],
+            channel_name=self.channel_names[channel],
+            subscriber_count=int(self.channel_subscriber_count[channel]),
+            channel_created_at=self.channel_created_at[channel],
+            days_ago=int(self.days_ago[row]),
+            daily_avg_views=float(self.daily_avg_views[row]),
+            impact_ratio=float(self.impact_ratio[row]),
+            like_ratio=float(self.like_ratio[row]),
+        )
+
+    def to_videos(self, mask: Optional[np.ndarray] = None) -> list[Video]:
+        """
+        マスクで選択した行だけVideoオブジェクトを生成（行の順序を保持）
+
+        Args:
+            mask: 行ごとの判定結果（Noneの場合は全行）
+
+        Returns:
+            list[Video]: 動画リスト
+        """
+        rows = range(len(self)) if mask is None else np.flatnonzero(mask)
+        videos: list[Video] = []
+        for row in rows:
+            try:
+                videos.append(self.video_at(int(row)))
+            except Exception as e:
+                logger.warning(f'Failed to build video object: {e}')
+        return videos
+
+
+class CompactSearchResult:
+    """メモリキャッシュ用の検索結果（動画は列指向で保持し、レスポンス時にVideoを生成）"""
+
+    __slots__ = ('keyword', 'searched_at', 'columns')
+
+    def __init__(self, keyword: str, searched_at: str, columns: VideoColumns):
+        """
+        検索結果を保持
+
+        Args:
+            keyword: 検索キーワード
+            searched_at: 検索日時（ISO 8601形式）
+            columns: 列指向の動画リスト（影響力順）
+        """
+        self.keyword = keyword
+        self.searched_at = searched_at
+        self.columns = columns
+
+    @classmethod
+    def from_result(cls, result: SearchResult) -> 'CompactSearchResult':
+        """
+        検索結果を列指向に変換
+
+        Args:
+            result: 検索結果
+
+        Returns:
+            CompactSearchResult: キャッシュ用の検索結果
+        """
+        return cls(result.keyword, result.searched_at, VideoColumns.from_videos(result.videos))
+
+    def to_result(
+        self,
+        keyword: str,
+        filters: Optional[SearchFilters],
+        is_stale: bool = False
+    ) -> SearchResult:
+        """
+        フィルター条件を満たす動画だけVideoにして検索結果を生成
+
+        Args:
+            keyword: 呼び出し元の検索キーワード
+            filters: 検索フィルター条件
+            is_stale: キャッシュ有効期間を過ぎた結果か
+
+        Returns:
+            SearchResult: フィルター適用後の検索結果
+        """
+        return SearchResult(
+            keyword=keyword,
+            searched_at=self.searched_at,
+            videos=self.columns.to_videos(self.columns.filter_mask(filters)),
+            is_stale=is_stale,
+        )
+
+
+def build_filtered_videos(
+    video_details: list[dict],
+    channel_map: dict[str, dict],
+    filters: Optional[SearchFilters]
+) -> list[Video]:
+    """
+    動画詳細データから計算値・フィルターを一括適用し、通過した動画だけVideoにする
+
+    Args:
+        video_details: 動画詳細データリスト
+        channel_map: チャンネル情報マップ
+        filters: 検索フィルター条件
+
+    Returns:
+        list[Video]: フィルター適用後の動画リスト
+    """
+    columns = VideoColumns.from_api(video_details, channel_map)
+    return columns.to_videos(columns.filter_mask(filters))
@@ -2,18 +2,24 @@
 YouTube API連携サービス - バズり動画究極リサーチシステム
 
 YouTube Data API v3を使用した動画検索・詳細取得・チャンネル情報取得
-影響力（バズ度）・高評価率・日平均再生数の計算機能を提供
+影響力（バズ度）・高評価率・日平均再生数の計算は video_columns で一括して行う
 
 【抜本的対策】
-- 複数APIキーのローテーション（クォータ超過時に自動切替）
+- 複数APIキーのクォータ台帳管理（残りクォータが最も多いキーを選択）
 - Supabase永続キャッシュ（サーバー再起動でも消えない）
+- チャンネル情報キャッシュ（チャンネルID単位、検索キャッシュより長いTTL）
+- 動画情報キャッシュ（動画ID単位、スニペットは長期・統計情報は短期TTL）
 """
 
+import asyncio
 import hashlib
 import json
 import logging
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional, Union
 
 import httpx
 from cachetools import TTLCache
@@ -26,7 +32,11 @@ from tenacity import (
 )
 
 from app.config import settings
+from app.core.database import run_query
+from app.core.singleflight import SingleFlight
 from app.schemas import SearchFilters, SearchResult, Video
+from app.services.quota_ledger import QuotaLedger
+from app.services.video_columns import CompactSearchResult, build_filtered_videos
 
 # ロガー設定
 logger = logging.getLogger(__name__)
@@ -47,10 +57,75 @@ COMMENT_THREADS_ENDPOINT = f'{YOUTUBE_API_BASE_URL}/commentThreads'
 # デフォルト検索設定
 DEFAULT_MAX_RESULTS = 50  # YouTube APIの1リクエストあたりの最大取得数
 
+# YouTube APIクォータコスト（ユニット）
+SEARCH_QUOTA_COST = 100  # search.list
+LIST_QUOTA_COST = 1  # videos.list / channels.list / commentThreads.list
+
+# 1ページあたりのクォータコスト（search.list + videos.list + channels.list）
+PAGE_QUOTA_COST = SEARCH_QUOTA_COST + 2 * LIST_QUOTA_COST
+
+# YouTube APIへの同時リクエスト数上限（videos.list / channels.list のバッチ並行取得用）
+MAX_CONCURRENT_REQUESTS = 4
+
 # TTLキャッシュ設定（3600秒 = 1時間）
 # 同一キーワード・フィルター条件での検索結果をキャッシュ
 # YouTube APIクォータ節約のため、キャッシュ時間を長めに設定
-_search_cache: TTLCache = TTLCache(maxsize=200, ttl=3600)
+# 動画は列指向（CompactSearchResult）で保持し、Videoはレスポンス時に生成する
+_search_cache: TTLCache = TTLCache(maxsize=settings.search_cache_max_entries, ttl=3600)
+
+# 検索キャッシュのヒット回数をSupabaseへまとめて書き込む間隔（秒）
+CACHE_HIT_FLUSH_INTERVAL = 30
+
+# 実行中の検索（キャッシュキー単位で同一検索の並行実行を1回に集約）
+_search_flights: SingleFlight[Union[Video, SearchResult]] = SingleFlight()
+
+# 期限切れキャッシュのバックグラウンド再取得タスク（GCで破棄されないよう参照を保持）
+_refresh_tasks: set[asyncio.Task] = set()
+
+# 動画情報キャッシュ（動画ID単位、LRU + TTL）
+# スニペット（タイトル・公開日・チャンネルID・サムネイル）は不変に近いため長期保持し、
+# 統計情報（再生数・高評価数）は変化が速いため短いTTLで保持する
+_video_snippet_cache: TTLCache = TTLCache(
+    maxsize=settings.video_cache_max_entries,
+    ttl=settings.video_snippet_ttl_hours * 3600
+)
+_video_stats_cache: TTLCache = TTLCache(
+    maxsize=settings.video_cache_max_entries,
+    ttl=settings.video_stats_ttl_minutes * 60
+)
+
+# videos.list の part ごとの取得フィールド（partial response でレスポンスサイズを削減）
+VIDEO_PART_FIELDS = {
+    'snippet,statistics': (
+        'items(id,snippet(title,publishedAt,channelId,channelTitle,'
+        'thumbnails(default/url,medium/url,high/url)),statistics(viewCount,likeCount))'
+    ),
+    'statistics': 'items(id,statistics(viewCount,likeCount))',
+}
+
+# 字幕キャッシュ（動画ID + 優先言語単位、LRU + TTL）
+# 字幕は公開後ほぼ変わらないため長期保持し、字幕なしの結果は後から追加されうるため短めに保持する
+_transcript_cache: TTLCache = TTLCache(
+    maxsize=settings.transcript_cache_max_entries,
+    ttl=settings.transcript_cache_ttl_hours * 3600
+)
+_transcript_missing_cache: TTLCache = TTLCache(
+    maxsize=settings.transcript_cache_max_entries,
+    ttl=settings.transcript_missing_ttl_hours * 3600
+)
+
+# 実行中の字幕取得（同一動画の並行取得を1回に集約）
+_transcript_flights: SingleFlight[Optional[str]] = SingleFlight()
+
+# 字幕の最大文字数（Claude APIのトークン制限対策）
+TRANSCRIPT_MAX_CHARS = 5000
+
+# チャンネル情報キャッシュ（チャンネルID単位、LRU + TTL）
+# 登録者数の変化は緩やかで、同じチャンネルが多数のキーワードで出現するため長めに保持
+_channel_cache: TTLCache = TTLCache(
+    maxsize=settings.channel_cache_max_entries,
+    ttl=settings.channel_cache_ttl_hours * 3600
+)
 
 
 # ============================================
@@ -113,57 +188,275 @@ retry_on_temporary_error = retry(
 )
 
 
+async def _gather_or_cancel(coros: list) -> list:
+    """
+    コルーチンを並行実行し、いずれかが失敗した場合は残りをキャンセルして例外を送出
+
+    Args:
+        coros: 実行するコルーチンのリスト
+
+    Returns:
+        list: 各コルーチンの結果（入力順）
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+# ============================================
+# 字幕取得（同期ライブラリを専用スレッドプールで実行）
+# ============================================
+
+_transcript_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_transcript_executor() -> ThreadPoolExecutor:
+    """字幕取得用スレッドプールを取得（遅延初期化、同時実行数を制限）"""
+    global _transcript_executor
+    if _transcript_executor is None:
+        _transcript_executor = ThreadPoolExecutor(
+            max_workers=settings.transcript_pool_size,
+            thread_name_prefix='transcript'
+        )
+    return _transcript_executor
+
+
+def _shutdown_transcript_executor() -> None:
+    """字幕取得用スレッドプールを停止（実行中の取得は完了を待たない）"""
+    global _transcript_executor
+    if _transcript_executor is not None:
+        _transcript_executor.shutdown(wait=False, cancel_futures=True)
+        _transcript_executor = None
+
+
+def _join_transcript_text(items) -> str:
+    """
+    字幕の各行を最大文字数に達するまで結合（Claude APIのトークン制限対策）
+
+    Args:
+        items: 字幕の各行（youtube-transcript-api のバージョンにより dict または text 属性を持つオブジェクト）
+
+    Returns:
+        str: 結合したテキスト（最大文字数を超える場合は切り詰めて '...' を付加）
+    """
+    parts: list[str] = []
+    length = 0
+    for item in items:
+        part = item['text'] if isinstance(item, dict) else item.text
+        parts.append(part)
+        length += len(part) + 1
+        if length > TRANSCRIPT_MAX_CHARS:
+            break
+
+    text = ' '.join(parts)
+    if len(text) > TRANSCRIPT_MAX_CHARS:
+        text = text[:TRANSCRIPT_MAX_CHARS] + '...'
+    return text
+
+
+def _fetch_transcript_blocking(video_id: str, languages: list[str]) -> tuple[Optional[str], bool]:
+    """
+    字幕を取得してテキストに結合（同期処理、スレッドプールで実行）
+
+    Args:
+        video_id: 動画ID
+        languages: 優先言語リスト
+
+    Returns:
+        tuple[Optional[str], bool]: (トランスクリプトテキスト, 結果をキャッシュしてよいか)
+        字幕なし（無効化・未提供・動画なし）は (None, True)、一時的な失敗は (None, False)
+    """
+    try:
+        from youtube_transcript_api import YouTubeTranscriptApi
+        from youtube_transcript_api._errors import (
+            TranscriptsDisabled,
+            NoTranscriptFound,
+            VideoUnavailable,
+        )
+    except ImportError:
+        logger.warning('youtube-transcript-api is not installed')
+        return None, False
+
+    try:
+        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+
+        # 優先言語で字幕を探す
+        transcript = None
+        for lang in languages:
+            try:
+                transcript = transcript_list.find_transcript([lang])
+                break
+            except NoTranscriptFound:
+                continue
+
+        # 見つからない場合は自動生成字幕を試す
+        if transcript is None:
+            try:
+                transcript = transcript_list.find_generated_transcript(languages)
+            except NoTranscriptFound:
+                pass
+
+        if transcript is None:
+            logger.info(f'No transcript found for video: {video_id}')
+            return None, True
+
+        text = _join_transcript_text(transcript.fetch())
+        logger.info(f'Fetched transcript ({len(text)} chars) for video: {video_id}')
+        return text, True
+
+    except (TranscriptsDisabled, VideoUnavailable) as e:
+        logger.info(f'Transcript not available for video {video_id}: {e}')
+        return None, True
+    except Exception as e:
+        logger.warning(f'Failed to fetch transcript for video {video_id}: {e}')
+        return None, False
+
+
+# ============================================
+# 検索パイプライン
+# ============================================
+
+class _EnrichmentPipeline:
+    """
+    検索ページング → 動画詳細 → チャンネル情報 の並行パイプライン
+
+    各ページの動画詳細取得はタスクとして開始し、次ページの検索と並行して実行する。
+    チャンネル情報はチャンネルIDごとに一度だけ取得し、同じチャンネルを含む後続バッチは
+    取得中のタスクを待ち合わせる。エンリッチが完了したバッチから順に取り出せる。
+    """
+
+    def __init__(
+        self,
+        service: 'YouTubeService',
+        keyword: str,
+        published_after: Optional[datetime],
+        pages: int
+    ):
+        self._service = service
+        self._keyword = keyword
+        self._published_after = published_after
+        self._pages = pages
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._batch_tasks: list[asyncio.Task] = []
+        self._channel_tasks: dict[str, asyncio.Task] = {}
+
+    async def batches(self) -> AsyncIterator[tuple[list[dict], dict[str, dict]]]:
+        """
+        エンリッチ済みのバッチを完了順に返す
+
+        Yields:
+            tuple[list[dict], dict[str, dict]]: (動画詳細情報リスト, バッチ内チャンネルの情報マップ)
+
+        Raises:
+            YouTubeAPIError: API呼び出しエラー
+        """
+        producer = asyncio.ensure_future(self._produce())
+        try:
+            while True:
+                kind, payload = await self._queue.get()
+                if kind == 'error':
+                    raise payload
+                if kind == 'done':
+                    return
+                yield payload
+        finally:
+            # 途中終了・エラー時は実行中のタスクをすべてキャンセル
+            tasks = [producer, *self._batch_tasks, *self._channel_tasks.values()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _produce(self) -> None:
+        """ページングを行い、全バッチの完了後に終了を通知"""
+        try:
+            await self._paginate()
+            await asyncio.gather(*self._batch_tasks)
+        except Exception as e:
+            await self._queue.put(('error', e))
+            return
+        await self._queue.put(('done', None))
+
+    async def _paginate(self) -> None:
+        """nextPageToken を辿って検索し、ページごとに詳細取得タスクを開始"""
+        seen_video_ids: set[str] = set()
+        page_token: Optional[str] = None
+
+        for page in range(self._pages):
+            video_ids, page_token = await self._service.search_video_page(
+                keyword=self._keyword,
+                published_after=self._published_after,
+                page_token=page_token
+            )
+
+            # ページ間の重複動画を除外
+            new_video_ids = [v for v in video_ids if v not in seen_video_ids]
+            seen_video_ids.update(new_video_ids)
+
+            for i in range(0, len(new_video_ids), DEFAULT_MAX_RESULTS):
+                batch_ids = new_video_ids[i:i + DEFAULT_MAX_RESULTS]
+                self._batch_tasks.append(asyncio.ensure_future(self._enrich_batch(batch_ids)))
+
+            if not page_token:
+                break
+
+        logger.info(
+            f'Searched {page + 1} page(s), {len(seen_video_ids)} videos for keyword: {self._keyword}'
+        )
+
+    async def _enrich_batch(self, batch_ids: list[str]) -> None:
+        """1バッチの動画詳細を取得し、チャンネル情報が揃ったらキューに投入"""
+        items = await self._service.get_video_details(batch_ids)
+
+        batch_channel_ids = {
+            item.get('snippet', {}).get('channelId')
+            for item in items
+            if item.get('snippet', {}).get('channelId')
+        }
+
+        # 未取得のチャンネルのみ取得タスクを開始（取得中のものは待ち合わせる）
+        new_channel_ids = [c for c in batch_channel_ids if c not in self._channel_tasks]
+        if new_channel_ids:
+            task = asyncio.ensure_future(self._service.get_channel_details(new_channel_ids))
+            for channel_id in new_channel_ids:
+                self._channel_tasks[channel_id] = task
+
+        channel_map: dict[str, dict] = {}
+        for task in {self._channel_tasks[c] for c in batch_channel_ids}:
+            channel_map.update(await task)
+
+        await self._queue.put(('batch', (items, channel_map)))
+
+
 # ============================================
 # YouTube API サービスクラス
 # ============================================
 
 class YouTubeService:
-    """YouTube API連携サービス（複数キーローテーション対応）"""
+    """YouTube API連携サービス（複数キー・クォータ台帳対応）"""
 
     def __init__(self):
         """サービス初期化"""
-        # 複数APIキー対応
+        # 複数APIキー対応（キーごとの消費ユニットを台帳で管理）
         self.api_keys = settings.api_key_list
-        self.current_key_index = 0
-        self.exhausted_keys: set[int] = set()  # クォータ超過したキーのインデックス
+        self.quota_ledger = QuotaLedger(self.api_keys)
         self._client: Optional[httpx.AsyncClient] = None
         self._supabase = None
+        # バッチ並行取得時の同時リクエスト数制限
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # 未書き込みの検索キャッシュヒット回数（キャッシュキー -> 回数）
+        self._pending_cache_hits: dict[str, int] = {}
+        self._hit_flush_task: Optional[asyncio.Task] = None
 
         if not self.api_keys:
             logger.error('No YouTube API keys configured!')
         else:
             logger.info(f'YouTube service initialized with {len(self.api_keys)} API key(s)')
 
-    @property
-    def api_key(self) -> str:
-        """現在のAPIキーを取得"""
-        if not self.api_keys:
-            return ''
-        return self.api_keys[self.current_key_index]
-
-    def _rotate_to_next_key(self) -> bool:
-        """
-        次の有効なAPIキーにローテーション
-
-        Returns:
-            bool: 有効なキーに切り替えられた場合True、全キー使用不可の場合False
-        """
-        self.exhausted_keys.add(self.current_key_index)
-        original_index = self.current_key_index
-
-        # 次の有効なキーを探す
-        for _ in range(len(self.api_keys)):
-            self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
-            if self.current_key_index not in self.exhausted_keys:
-                logger.warning(
-                    f'Rotated to API key {self.current_key_index + 1}/{len(self.api_keys)} '
-                    f'(previous key {original_index + 1} exhausted)'
-                )
-                return True
-
-        logger.error('All API keys exhausted!')
-        return False
-
     def _get_supabase_client(self):
         """Supabaseクライアントを取得（キャッシュ用）"""
         if self._supabase is None:
@@ -182,10 +475,16 @@ class YouTubeService:
         return self._client
 
     async def close(self) -> None:
-        """HTTPクライアントを閉じる"""
+        """HTTPクライアント・字幕取得スレッドプールを閉じ、クォータ台帳・キャッシュヒット回数を同期する"""
+        await self.quota_ledger.close()
+        if self._hit_flush_task is not None:
+            self._hit_flush_task.cancel()
+            self._hit_flush_task = None
+        await self._flush_cache_hits()
         if self._client is not None and not self._client.is_closed:
             await self._client.aclose()
             self._client = None
+        _shutdown_transcript_executor()
 
     # ============================================
     # Supabase永続キャッシュ
@@ -209,19 +508,14 @@ class YouTubeService:
             return None
 
         try:
-            result = supabase.table('search_cache').select('*').eq(
-                'cache_key', cache_key
-            ).gt('expires_at', datetime.now(timezone.utc).isoformat()).single().execute()
+            # 有効期限（再取得猶予期間を含む）内の result 取得と last_accessed 更新を1往復で行う
+            result = await run_query(supabase.rpc('fetch_search_cache', {'p_cache_key': cache_key}))
 
             if result.data:
-                # ヒットカウント更新
-                supabase.table('search_cache').update({
-                    'hit_count': result.data['hit_count'] + 1,
-                    'last_accessed': datetime.now(timezone.utc).isoformat()
-                }).eq('cache_key', cache_key).execute()
+                self._record_cache_hit(cache_key)
 
                 # JSONからSearchResultを復元
-                cached_data = result.data['result']
+                cached_data = result.data
                 videos = [Video(**v) for v in cached_data.get('videos', [])]
                 logger.info(f'Supabase cache hit: {cache_key[:8]}...')
                 return SearchResult(
@@ -236,6 +530,41 @@ class YouTubeService:
 
         return None
 
+    def _record_cache_hit(self, cache_key: str) -> None:
+        """
+        検索キャッシュのヒット回数を記録（一定間隔でまとめてSupabaseへ書き込む）
+
+        Args:
+            cache_key: キャッシュキー
+        """
+        self._pending_cache_hits[cache_key] = self._pending_cache_hits.get(cache_key, 0) + 1
+        if self._hit_flush_task is None or self._hit_flush_task.done():
+            self._hit_flush_task = asyncio.get_running_loop().create_task(
+                self._flush_cache_hits_later()
+            )
+
+    async def _flush_cache_hits_later(self) -> None:
+        """一定時間待ってからヒット回数を書き込む"""
+        await asyncio.sleep(CACHE_HIT_FLUSH_INTERVAL)
+        await self._flush_cache_hits()
+
+    async def _flush_cache_hits(self) -> None:
+        """未書き込みのヒット回数をSupabaseへ一括加算"""
+        if not self._pending_cache_hits:
+            return
+
+        supabase = self._get_supabase_client()
+        if not supabase:
+            return
+
+        hits = self._pending_cache_hits
+        self._pending_cache_hits = {}
+        try:
+            await run_query(supabase.rpc('add_search_cache_hits', {'p_hits': hits}))
+        except Exception as e:
+            # 統計用のため失敗しても検索には影響させない
+            logger.warning(f'Failed to flush search cache hit counts: {e}')
+
     async def _save_to_cache(
         self,
         cache_key: str,
@@ -260,7 +589,8 @@ class YouTubeService:
             return
 
         try:
-            ttl_hours = settings.cache_ttl_hours
+            # 有効期間経過後も再取得猶予期間中は古い結果を返すため、その分まで保持する
+            ttl_hours = settings.cache_ttl_hours + settings.cache_max_stale_hours
             expires_at = datetime.now(timezone.utc) + timedelta(hours=ttl_hours)
 
             # SearchResultをJSON形式に変換
@@ -271,14 +601,14 @@ class YouTubeService:
             }
 
             # Upsert（存在すれば更新、なければ挿入）
-            supabase.table('search_cache').upsert({
+            await run_query(supabase.table('search_cache').upsert({
                 'cache_key': cache_key,
                 'keyword': keyword,
                 'filters': filters.model_dump() if filters else None,
                 'result': result_json,
                 'expires_at': expires_at.isoformat(),
                 'hit_count': 0
-            }, on_conflict='cache_key').execute()
+            }, on_conflict='cache_key'))
 
             logger.info(f'Saved to Supabase cache: {cache_key[:8]}... (TTL: {ttl_hours}h)')
 
@@ -286,6 +616,220 @@ class YouTubeService:
             # キャッシュ保存エラーは無視
             logger.warning(f'Failed to save to Supabase cache: {e}')
 
+    async def _get_cached_videos(self, video_ids: list[str]) -> tuple[dict[str, dict], dict[str, dict]]:
+        """
+        Supabaseからキャッシュされた動画情報を取得
+
+        Args:
+            video_ids: 動画IDリスト
+
+        Returns:
+            tuple[dict[str, dict], dict[str, dict]]: (動画ID -> スニペット, 動画ID -> 統計情報)
+            それぞれ有効期限内のもののみ
+        """
+        if not settings.enable_supabase_cache or not video_ids:
+            return {}, {}
+
+        supabase = self._get_supabase_client()
+        if not supabase:
+            return {}, {}
+
+        try:
+            now = datetime.now(timezone.utc)
+            result = await run_query(supabase.table('video_cache').select(
+                'video_id, snippet, statistics, snippet_expires_at, stats_expires_at'
+            ).in_('video_id', video_ids).gt('snippet_expires_at', now.isoformat()))
+
+            snippets: dict[str, dict] = {}
+            statistics: dict[str, dict] = {}
+            for row in result.data or []:
+                snippets[row['video_id']] = row['snippet']
+                stats_expires_at = datetime.fromisoformat(row['stats_expires_at'].replace('Z', '+00:00'))
+                if row['statistics'] and stats_expires_at > now:
+                    statistics[row['video_id']] = row['statistics']
+
+            if snippets:
+                logger.info(
+                    f'Supabase video cache hit: {len(snippets)}/{len(video_ids)} snippets, '
+                    f'{len(statistics)} statistics'
+                )
+            return snippets, statistics
+
+        except Exception as e:
+            # キャッシュエラーは無視してAPI呼び出しにフォールバック
+            logger.debug(f'Supabase video cache miss or error: {e}')
+            return {}, {}
+
+    async def _save_videos_to_cache(
+        self,
+        snippets: dict[str, dict],
+        statistics: dict[str, dict]
+    ) -> None:
+        """
+        動画情報をSupabaseキャッシュに保存
+
+        スニペットを取得した動画は全体を、統計情報のみ更新した動画は統計情報のみを保存する
+
+        Args:
+            snippets: 新たに取得した動画ID -> スニペット
+            statistics: 新たに取得した動画ID -> 統計情報
+        """
+        if not settings.enable_supabase_cache or not statistics:
+            return
+
+        supabase = self._get_supabase_client()
+        if not supabase:
+            return
+
+        try:
+            now = datetime.now(timezone.utc)
+            snippet_expires_at = (now + timedelta(hours=settings.video_snippet_ttl_hours)).isoformat()
+            stats_expires_at = (now + timedelta(minutes=settings.video_stats_ttl_minutes)).isoformat()
+
+            full_rows = [
+                {
+                    'video_id': video_id,
+                    'snippet': snippet,
+                    'statistics': statistics.get(video_id),
+                    'snippet_expires_at': snippet_expires_at,
+                    'stats_expires_at': stats_expires_at,
+                }
+                for video_id, snippet in snippets.items()
+            ]
+            stats_rows = [
+                {
+                    'video_id': video_id,
+                    'statistics': stats,
+                    'stats_expires_at': stats_expires_at,
+                }
+                for video_id, stats in statistics.items()
+                if video_id not in snippets
+            ]
+
+            if full_rows:
+                await run_query(supabase.table('video_cache').upsert(full_rows, on_conflict='video_id'))
+            if stats_rows:
+                await run_query(supabase.table('video_cache').upsert(stats_rows, on_conflict='video_id'))
+
+        except Exception as e:
+            # キャッシュ保存エラーは無視
+            logger.warning(f'Failed to save videos to Supabase cache: {e}')
+
+    async def _get_cached_channels(self, channel_ids: list[str]) -> dict[str, dict]:
+        """
+        Supabaseからキャッシュされたチャンネル情報を取得
+
+        Args:
+            channel_ids: チャンネルIDリスト
+
+        Returns:
+            dict[str, dict]: チャンネルID -> チャンネル情報の辞書（有効期限内のもののみ）
+        """
+        if not settings.enable_supabase_cache or not channel_ids:
+            return {}
+
+        supabase = self._get_supabase_client()
+        if not supabase:
+            return {}
+
+        try:
+            result = await run_query(supabase.table('channel_cache').select(
+                'channel_id, title, subscriber_count, published_at'
+            ).in_('channel_id', channel_ids).gt(
+                'expires_at', datetime.now(timezone.utc).isoformat()
+            ))
+
+            channel_map = {
+                row['channel_id']: {
+                    'id': row['channel_id'],
+                    'title': row['title'] or '',
+                    'subscriberCount': int(row['subscriber_count'] or 0),
+                    'publishedAt': row['published_at'] or '',
+                }
+                for row in result.data or []
+            }
+            if channel_map:
+                logger.info(f'Supabase channel cache hit: {len(channel_map)}/{len(channel_ids)} channels')
+            return channel_map
+
+        except Exception as e:
+            # キャッシュエラーは無視してAPI呼び出しにフォールバック
+            logger.debug(f'Supabase channel cache miss or error: {e}')
+            return {}
+
+    async def _save_channels_to_cache(self, channel_map: dict[str, dict]) -> None:
+        """
+        チャンネル情報をSupabaseキャッシュに保存
+
+        Args:
+            channel_map: チャンネルID -> チャンネル情報の辞書
+        """
+        if not settings.enable_supabase_cache or not channel_map:
+            return
+
+        supabase = self._get_supabase_client()
+        if not supabase:
+            return
+
+        try:
+            now = datetime.now(timezone.utc)
+            expires_at = now + timedelta(hours=settings.channel_cache_ttl_hours)
+
+            await run_query(supabase.table('channel_cache').upsert([
+                {
+                    'channel_id': channel_id,
+                    'title': info['title'],
+                    'subscriber_count': info['subscriberCount'],
+                    'published_at': info['publishedAt'],
+                    'fetched_at': now.isoformat(),
+                    'expires_at': expires_at.isoformat(),
+                }
+                for channel_id, info in channel_map.items()
+            ], on_conflict='channel_id'))
+
+        except Exception as e:
+            # キャッシュ保存エラーは無視
+            logger.warning(f'Failed to save channels to Supabase cache: {e}')
+
+    async def _request_api(
+        self,
+        endpoint: str,
+        params: dict,
+        context: str,
+        cost: int = LIST_QUOTA_COST
+    ) -> dict:
+        """
+        残りクォータが最も多いAPIキーでリクエストし、消費ユニットを台帳に計上
+
+        Args:
+            endpoint: APIエンドポイント
+            params: クエリパラメータ（key以外）
+            context: エラーメッセージ用のコンテキスト
+            cost: リクエストのクォータコスト（ユニット）
+
+        Returns:
+            dict: レスポンスJSON
+
+        Raises:
+            YouTubeQuotaExceededError: 使用可能なキーがない、またはクォータ超過
+            YouTubeAPIError: API呼び出しエラー
+        """
+        key_index = self.quota_ledger.select_key(cost)
+        if key_index is None:
+            logger.error('All API keys exhausted!')
+            raise YouTubeQuotaExceededError()
+
+        # YouTubeはエラー時もクォータを消費するため送信前に計上する
+        self.quota_ledger.charge(key_index, cost)
+
+        client = await self._get_client()
+        response = await client.get(endpoint, params={**params, 'key': self.api_keys[key_index]})
+        try:
+            return await self._handle_api_response(response, context)
+        except YouTubeQuotaExceededError:
+            self.quota_ledger.mark_exhausted(key_index)
+            raise
+
     async def _handle_api_response(
         self,
         response: httpx.Response,
@@ -360,44 +904,44 @@ class YouTubeService:
     # ============================================
 
     @retry_on_temporary_error
-    async def search_videos(
+    async def search_video_page(
         self,
         keyword: str,
         max_results: int = DEFAULT_MAX_RESULTS,
-        published_after: Optional[datetime] = None
-    ) -> list[str]:
+        published_after: Optional[datetime] = None,
+        page_token: Optional[str] = None
+    ) -> tuple[list[str], Optional[str]]:
         """
-        キーワードで動画を検索し、動画IDリストを取得
+        キーワードで動画を検索し、1ページ分の動画IDリストと次ページトークンを取得
 
         Args:
             keyword: 検索キーワード
             max_results: 最大取得件数（デフォルト: 50）
             published_after: この日時以降に公開された動画のみ取得
+            page_token: 前ページのレスポンスに含まれる nextPageToken
 
         Returns:
-            list[str]: 動画IDリスト
+            tuple[list[str], Optional[str]]: (動画IDリスト, 次ページトークン)
 
         Raises:
             YouTubeAPIError: API呼び出しエラー
         """
         logger.info(f'Searching videos for keyword: {keyword}')
 
-        client = await self._get_client()
-
         params = {
             'part': 'id',
             'q': keyword,
             'type': 'video',
             'order': 'relevance',
             'maxResults': min(max_results, DEFAULT_MAX_RESULTS),
-            'key': self.api_key,
         }
 
         if published_after:
             params['publishedAfter'] = published_after.isoformat()
+        if page_token:
+            params['pageToken'] = page_token
 
-        response = await client.get(SEARCH_ENDPOINT, params=params)
-        data = await self._handle_api_response(response, '動画検索')
+        data = await self._request_api(SEARCH_ENDPOINT, params, '動画検索', SEARCH_QUOTA_COST)
 
         video_ids = [
             item['id']['videoId']
@@ -406,6 +950,33 @@ class YouTubeService:
         ]
 
         logger.info(f'Found {len(video_ids)} videos for keyword: {keyword}')
+        return video_ids, data.get('nextPageToken')
+
+    async def search_videos(
+        self,
+        keyword: str,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        published_after: Optional[datetime] = None
+    ) -> list[str]:
+        """
+        キーワードで動画を検索し、動画IDリストを取得（先頭1ページのみ）
+
+        Args:
+            keyword: 検索キーワード
+            max_results: 最大取得件数（デフォルト: 50）
+            published_after: この日時以降に公開された動画のみ取得
+
+        Returns:
+            list[str]: 動画IDリスト
+
+        Raises:
+            YouTubeAPIError: API呼び出しエラー
+        """
+        video_ids, _ = await self.search_video_page(
+            keyword=keyword,
+            max_results=max_results,
+            published_after=published_after
+        )
         return video_ids
 
     # ============================================
@@ -413,15 +984,50 @@ class YouTubeService:
     # ============================================
 
     @retry_on_temporary_error
+    async def _fetch_video_batch(
+        self,
+        batch_ids: list[str],
+        part: str = 'snippet,statistics'
+    ) -> list[dict]:
+        """
+        1バッチ分（最大50件）の動画詳細を取得
+
+        Args:
+            batch_ids: 動画IDリスト（50件以下）
+            part: 取得するリソース部分（'snippet,statistics' または 'statistics'）
+
+        Returns:
+            list[dict]: 動画詳細情報リスト
+        """
+        params = {
+            'part': part,
+            'id': ','.join(batch_ids),
+            'fields': VIDEO_PART_FIELDS[part],
+        }
+
+        async with self._request_semaphore:
+            data = await self._request_api(VIDEOS_ENDPOINT, params, '動画詳細取得')
+
+        return data.get('items', [])
+
     async def get_video_details(self, video_ids: list[str]) -> list[dict]:
         """
         動画IDリストから動画詳細情報を取得
 
+        【キャッシュ戦略】
+        スニペットは長期、統計情報は短いTTLで動画ID単位にキャッシュする
+        1. メモリキャッシュを確認
+        2. 残りをSupabase永続キャッシュで確認
+        3. スニペット未取得の動画は snippet,statistics を、
+           統計情報のみ期限切れの動画は statistics のみを videos.list で取得
+
+        API取得は50件ずつのバッチを同時リクエスト数上限の範囲で並行実行する
+
         Args:
             video_ids: 動画IDリスト
 
         Returns:
-            list[dict]: 動画詳細情報リスト
+            list[dict]: 動画詳細情報リスト（id, snippet, statistics）
 
         Raises:
             YouTubeAPIError: API呼び出しエラー
@@ -429,38 +1035,148 @@ class YouTubeService:
         if not video_ids:
             return []
 
-        logger.info(f'Fetching details for {len(video_ids)} videos')
-
-        client = await self._get_client()
+        # 重複を除去（順序は維持）
+        unique_video_ids = list(dict.fromkeys(video_ids))
+
+        # 1. メモリキャッシュ
+        snippets = {v: _video_snippet_cache[v] for v in unique_video_ids if v in _video_snippet_cache}
+        statistics = {v: _video_stats_cache[v] for v in unique_video_ids if v in _video_stats_cache}
+
+        # 2. Supabase永続キャッシュ
+        missing_ids = [v for v in unique_video_ids if v not in snippets or v not in statistics]
+        if missing_ids:
+            persisted_snippets, persisted_stats = await self._get_cached_videos(missing_ids)
+            _video_snippet_cache.update(persisted_snippets)
+            _video_stats_cache.update(persisted_stats)
+            snippets.update(persisted_snippets)
+            statistics.update(persisted_stats)
+
+        # 3. 不足分のみAPIで取得
+        full_ids = [v for v in unique_video_ids if v not in snippets]
+        stats_ids = [v for v in unique_video_ids if v in snippets and v not in statistics]
+        if full_ids or stats_ids:
+            logger.info(
+                f'Fetching details for {len(full_ids)} videos and statistics for {len(stats_ids)} videos '
+                f'({len(unique_video_ids) - len(full_ids) - len(stats_ids)} served from cache)'
+            )
+            fetched_snippets, fetched_stats = await self._fetch_video_parts(full_ids, stats_ids)
+
+            _video_snippet_cache.update(fetched_snippets)
+            _video_stats_cache.update(fetched_stats)
+            await self._save_videos_to_cache(fetched_snippets, fetched_stats)
+            snippets.update(fetched_snippets)
+            statistics.update(fetched_stats)
+
+        # 削除・非公開などでAPIから返らなかった動画は除外
+        return [
+            {'id': v, 'snippet': snippets[v], 'statistics': statistics[v]}
+            for v in unique_video_ids
+            if v in snippets and v in statistics
+        ]
 
-        # 50件ずつ分割してリクエスト（API制限）
-        all_videos = []
-        for i in range(0, len(video_ids), DEFAULT_MAX_RESULTS):
-            batch_ids = video_ids[i:i + DEFAULT_MAX_RESULTS]
+    async def get_videos(self, video_ids: list[str]) -> list[Video]:
+        """
+        動画IDリストから動画情報（チャンネル情報・計算値を含む）を取得
 
-            params = {
-                'part': 'snippet,statistics',
-                'id': ','.join(batch_ids),
-                'key': self.api_key,
-            }
+        Args:
+            video_ids: 動画IDリスト
+
+        Returns:
+            list[Video]: 動画リスト（削除・非公開などで取得できない動画は除外）
 
-            response = await client.get(VIDEOS_ENDPOINT, params=params)
-            data = await self._handle_api_response(response, '動画詳細取得')
+        Raises:
+            YouTubeAPIError: API呼び出しエラー
+        """
+        video_details = await self.get_video_details(video_ids)
+        channel_ids = list({v['snippet'].get('channelId', '') for v in video_details} - {''})
+        channel_map = await self.get_channel_details(channel_ids)
+        return self._build_filtered_videos(video_details, channel_map, None)
 
-            all_videos.extend(data.get('items', []))
+    async def _fetch_video_parts(
+        self,
+        full_ids: list[str],
+        stats_ids: list[str]
+    ) -> tuple[dict[str, dict], dict[str, dict]]:
+        """
+        videos.list でスニペット・統計情報を並行取得
 
-        logger.info(f'Fetched details for {len(all_videos)} videos')
-        return all_videos
+        Args:
+            full_ids: snippet,statistics を取得する動画IDリスト
+            stats_ids: statistics のみを取得する動画IDリスト
+
+        Returns:
+            tuple[dict[str, dict], dict[str, dict]]: (動画ID -> スニペット, 動画ID -> 統計情報)
+        """
+        # 50件ずつ分割して並行リクエスト（API制限）
+        requests = [
+            (ids[i:i + DEFAULT_MAX_RESULTS], part)
+            for ids, part in ((full_ids, 'snippet,statistics'), (stats_ids, 'statistics'))
+            for i in range(0, len(ids), DEFAULT_MAX_RESULTS)
+        ]
+        results = await _gather_or_cancel([
+            self._fetch_video_batch(batch_ids, part) for batch_ids, part in requests
+        ])
+
+        snippets: dict[str, dict] = {}
+        statistics: dict[str, dict] = {}
+        for item in (item for items in results for item in items):
+            video_id = item.get('id')
+            if not video_id:
+                continue
+            if 'snippet' in item:
+                snippets[video_id] = item['snippet']
+            statistics[video_id] = item.get('statistics', {})
+
+        return snippets, statistics
 
     # ============================================
     # チャンネル情報取得（channels.list API）
     # ============================================
 
     @retry_on_temporary_error
+    async def _fetch_channel_batch(self, batch_ids: list[str]) -> dict[str, dict]:
+        """
+        1バッチ分（最大50件）のチャンネル詳細を取得
+
+        Args:
+            batch_ids: チャンネルIDリスト（50件以下）
+
+        Returns:
+            dict[str, dict]: チャンネルID -> チャンネル情報の辞書
+        """
+        params = {
+            'part': 'snippet,statistics',
+            'id': ','.join(batch_ids),
+        }
+
+        async with self._request_semaphore:
+            data = await self._request_api(CHANNELS_ENDPOINT, params, 'チャンネル情報取得')
+
+        channel_map: dict[str, dict] = {}
+        for item in data.get('items', []):
+            channel_id = item.get('id')
+            if channel_id:
+                channel_map[channel_id] = {
+                    'id': channel_id,
+                    'title': item.get('snippet', {}).get('title', ''),
+                    'subscriberCount': int(
+                        item.get('statistics', {}).get('subscriberCount', 0)
+                    ),
+                    'publishedAt': item.get('snippet', {}).get('publishedAt', ''),
+                }
+        return channel_map
+
     async def get_channel_details(self, channel_ids: list[str]) -> dict[str, dict]:
         """
         チャンネルIDリストからチャンネル詳細情報を取得
 
+        【キャッシュ戦略】
+        1. メモリキャッシュ（LRU）を確認
+        2. 残りをSupabase永続キャッシュで確認
+        3. それでも見つからないチャンネルのみ channels.list で取得し、両方のキャッシュに保存
+
+        API取得は50件ずつのバッチを同時リクエスト数上限の範囲で並行実行する
+
         Args:
             channel_ids: チャンネルIDリスト
 
@@ -475,116 +1191,68 @@ class YouTubeService:
 
         # 重複を除去
         unique_channel_ids = list(set(channel_ids))
-        logger.info(f'Fetching details for {len(unique_channel_ids)} channels')
-
-        client = await self._get_client()
-
-        channel_map: dict[str, dict] = {}
-
-        # 50件ずつ分割してリクエスト（API制限）
-        for i in range(0, len(unique_channel_ids), DEFAULT_MAX_RESULTS):
-            batch_ids = unique_channel_ids[i:i + DEFAULT_MAX_RESULTS]
-
-            params = {
-                'part': 'snippet,statistics',
-                'id': ','.join(batch_ids),
-                'key': self.api_key,
-            }
 
-            response = await client.get(CHANNELS_ENDPOINT, params=params)
-            data = await self._handle_api_response(response, 'チャンネル情報取得')
+        # 1. メモリキャッシュ
+        channel_map: dict[str, dict] = {
+            channel_id: _channel_cache[channel_id]
+            for channel_id in unique_channel_ids
+            if channel_id in _channel_cache
+        }
+        missing_ids = [c for c in unique_channel_ids if c not in channel_map]
 
-            for item in data.get('items', []):
-                channel_id = item.get('id')
-                if channel_id:
-                    channel_map[channel_id] = {
-                        'id': channel_id,
-                        'title': item.get('snippet', {}).get('title', ''),
-                        'subscriberCount': int(
-                            item.get('statistics', {}).get('subscriberCount', 0)
-                        ),
-                        'publishedAt': item.get('snippet', {}).get('publishedAt', ''),
-                    }
-
-        logger.info(f'Fetched details for {len(channel_map)} channels')
-        return channel_map
+        # 2. Supabase永続キャッシュ
+        if missing_ids:
+            persisted = await self._get_cached_channels(missing_ids)
+            _channel_cache.update(persisted)
+            channel_map.update(persisted)
+            missing_ids = [c for c in missing_ids if c not in persisted]
 
-    # ============================================
-    # 計算ロジック
-    # ============================================
-
-    @staticmethod
-    def calculate_days_ago(published_at: str) -> int:
-        """
-        公開日からの経過日数を計算（UTC基準）
+        if not missing_ids:
+            return channel_map
 
-        Args:
-            published_at: 公開日時（ISO 8601形式）
+        logger.info(
+            f'Fetching details for {len(missing_ids)} channels '
+            f'({len(channel_map)} served from cache)'
+        )
 
-        Returns:
-            int: 経過日数（0以上）
-        """
-        try:
-            published_date = datetime.fromisoformat(
-                published_at.replace('Z', '+00:00')
-            )
-            now = datetime.now(timezone.utc)
-            delta = now - published_date
-            return max(0, delta.days)
-        except (ValueError, TypeError):
-            logger.warning(f'Invalid published_at format: {published_at}')
-            return 0
+        # 3. 50件ずつ分割して並行リクエスト（API制限）
+        batches = [
+            missing_ids[i:i + DEFAULT_MAX_RESULTS]
+            for i in range(0, len(missing_ids), DEFAULT_MAX_RESULTS)
+        ]
+        results = await _gather_or_cancel([self._fetch_channel_batch(batch) for batch in batches])
 
-    @staticmethod
-    def calculate_daily_avg_views(view_count: int, days_ago: int) -> float:
-        """
-        日平均再生数を計算
+        fetched: dict[str, dict] = {}
+        for batch_map in results:
+            fetched.update(batch_map)
 
-        Args:
-            view_count: 再生回数
-            days_ago: 経過日数
+        _channel_cache.update(fetched)
+        await self._save_channels_to_cache(fetched)
+        channel_map.update(fetched)
 
-        Returns:
-            float: 日平均再生数（経過日数が0の場合は再生回数をそのまま返す）
-        """
-        if days_ago <= 0:
-            # 今日公開された動画は再生回数をそのまま返す
-            return float(view_count)
-        return round(view_count / days_ago, 2)
+        logger.info(f'Fetched details for {len(fetched)} channels')
+        return channel_map
 
     @staticmethod
-    def calculate_impact_ratio(view_count: int, subscriber_count: int) -> float:
-        """
-        影響力（バズ度）を計算: viewCount / subscriberCount
-
-        Args:
-            view_count: 再生回数
-            subscriber_count: 登録者数
-
-        Returns:
-            float: 影響力（登録者数が0の場合は0.0を返す）
+    def pages_within_budget(max_pages: int, quota_budget: Optional[int] = None) -> int:
         """
-        if subscriber_count <= 0:
-            # 0除算防止
-            return 0.0
-        return round(view_count / subscriber_count, 2)
+        クォータ予算内で取得できる検索ページ数を計算
 
-    @staticmethod
-    def calculate_like_ratio(like_count: int, view_count: int) -> float:
-        """
-        高評価率を計算: likeCount / viewCount
+        1ページあたり search.list（100）+ videos.list（1）+ channels.list（1）を消費する。
+        予算が1ページ分に満たない場合でも、通常検索と同じ1ページは取得する。
 
         Args:
-            like_count: 高評価数
-            view_count: 再生回数
+            max_pages: 要求ページ数
+            quota_budget: クォータ予算（ユニット、Noneの場合はサーバー設定値）
 
         Returns:
-            float: 高評価率（再生回数が0の場合は0.0を返す）
+            int: 取得ページ数（1以上）
         """
-        if view_count <= 0:
-            # 0除算防止
-            return 0.0
-        return round(like_count / view_count, 4)
+        budget = settings.deep_search_quota_budget
+        if quota_budget is not None:
+            budget = min(budget, quota_budget)
+        pages = min(max_pages, settings.deep_search_max_pages, budget // PAGE_QUOTA_COST)
+        return max(1, pages)
 
     # ============================================
     # コメント取得（commentThreads.list API）
@@ -608,19 +1276,15 @@ class YouTubeService:
         """
         logger.info(f'Fetching comments for video: {video_id}')
 
-        client = await self._get_client()
-
         try:
             params = {
                 'part': 'snippet',
                 'videoId': video_id,
                 'order': 'relevance',
                 'maxResults': min(max_results, 100),
-                'key': self.api_key,
             }
 
-            response = await client.get(COMMENT_THREADS_ENDPOINT, params=params)
-            data = await self._handle_api_response(response, 'コメント取得')
+            data = await self._request_api(COMMENT_THREADS_ENDPOINT, params, 'コメント取得')
 
             comments = []
             for item in data.get('items', []):
@@ -653,89 +1317,289 @@ class YouTubeService:
         """
         動画の字幕/トランスクリプトを取得
 
+        字幕取得ライブラリは同期処理のため専用スレッドプールで実行する
+        結果は字幕なしの場合も含めてキャッシュし（メモリ → Supabase）、
+        同じ動画の並行取得は1回に集約する
+
         Args:
             video_id: 動画ID
             languages: 優先言語リスト
 
+        Returns:
+            str: トランスクリプトテキスト（取得できない場合はNone）
+        """
+        cache_key = f'{video_id}:{",".join(languages)}'
+        if cache_key in _transcript_cache:
+            return _transcript_cache[cache_key]
+        if cache_key in _transcript_missing_cache:
+            return None
+
+        found, text = await self._get_cached_transcript(cache_key)
+        if not found:
+            text = await _transcript_flights.do(
+                cache_key,
+                lambda: self._fetch_and_cache_transcript(cache_key, video_id, languages)
+            )
+        return text
+
+    async def _fetch_and_cache_transcript(
+        self,
+        cache_key: str,
+        video_id: str,
+        languages: list[str]
+    ) -> Optional[str]:
+        """
+        字幕を専用スレッドプールで取得し、キャッシュに保存
+
+        Args:
+            cache_key: キャッシュキー（動画ID + 優先言語）
+            video_id: 動画ID
+            languages: 優先言語リスト
+
         Returns:
             str: トランスクリプトテキスト（取得できない場合はNone）
         """
         logger.info(f'Fetching transcript for video: {video_id}')
+        text, cacheable = await asyncio.get_running_loop().run_in_executor(
+            _get_transcript_executor(),
+            _fetch_transcript_blocking,
+            video_id,
+            languages
+        )
+        if cacheable:
+            await self._save_transcript_to_cache(cache_key, video_id, text)
+        return text
+
+    async def _get_cached_transcript(self, cache_key: str) -> tuple[bool, Optional[str]]:
+        """
+        Supabaseからキャッシュされた字幕を取得
+
+        Args:
+            cache_key: キャッシュキー（動画ID + 優先言語）
+
+        Returns:
+            tuple[bool, Optional[str]]: (キャッシュに存在したか, トランスクリプトテキスト)
+            字幕なしの結果がキャッシュされている場合は (True, None)
+        """
+        if not settings.enable_supabase_cache:
+            return False, None
+
+        supabase = self._get_supabase_client()
+        if not supabase:
+            return False, None
 
         try:
-            from youtube_transcript_api import YouTubeTranscriptApi
-            from youtube_transcript_api._errors import (
-                TranscriptsDisabled,
-                NoTranscriptFound,
-                VideoUnavailable,
-            )
+            result = await run_query(supabase.table('transcript_cache').select(
+                'transcript'
+            ).eq('cache_key', cache_key).gt(
+                'expires_at', datetime.now(timezone.utc).isoformat()
+            ).limit(1))
+
+            if not result.data:
+                return False, None
+
+            text = result.data[0]['transcript']
+            if text is None:
+                _transcript_missing_cache[cache_key] = True
+            else:
+                _transcript_cache[cache_key] = text
+            logger.info(f'Supabase transcript cache hit: {cache_key}')
+            return True, text
 
-            try:
-                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-
-                # 優先言語で字幕を探す
-                transcript = None
-                for lang in languages:
-                    try:
-                        transcript = transcript_list.find_transcript([lang])
-                        break
-                    except NoTranscriptFound:
-                        continue
-
-                # 見つからない場合は自動生成字幕を試す
-                if transcript is None:
-                    try:
-                        transcript = transcript_list.find_generated_transcript(languages)
-                    except NoTranscriptFound:
-                        pass
+        except Exception as e:
+            # キャッシュエラーは無視して字幕を取得
+            logger.debug(f'Supabase transcript cache miss or error: {e}')
+            return False, None
 
-                if transcript is None:
-                    logger.info(f'No transcript found for video: {video_id}')
-                    return None
+    async def _save_transcript_to_cache(
+        self,
+        cache_key: str,
+        video_id: str,
+        text: Optional[str]
+    ) -> None:
+        """
+        字幕をキャッシュに保存（メモリ + Supabase）
 
-                # テキストを結合
-                transcript_data = transcript.fetch()
-                text = ' '.join([item['text'] for item in transcript_data])
+        Args:
+            cache_key: キャッシュキー（動画ID + 優先言語）
+            video_id: 動画ID
+            text: トランスクリプトテキスト（字幕なしの場合None）
+        """
+        if text is None:
+            _transcript_missing_cache[cache_key] = True
+            ttl = timedelta(hours=settings.transcript_missing_ttl_hours)
+        else:
+            _transcript_cache[cache_key] = text
+            ttl = timedelta(hours=settings.transcript_cache_ttl_hours)
 
-                # 長すぎる場合は切り詰め（Claude APIのトークン制限対策）
-                if len(text) > 5000:
-                    text = text[:5000] + '...'
+        if not settings.enable_supabase_cache:
+            return
 
-                logger.info(f'Fetched transcript ({len(text)} chars) for video: {video_id}')
-                return text
+        supabase = self._get_supabase_client()
+        if not supabase:
+            return
 
-            except (TranscriptsDisabled, VideoUnavailable) as e:
-                logger.info(f'Transcript not available for video {video_id}: {e}')
-                return None
+        try:
+            await run_query(supabase.table('transcript_cache').upsert({
+                'cache_key': cache_key,
+                'video_id': video_id,
+                'transcript': text,
+                'expires_at': (datetime.now(timezone.utc) + ttl).isoformat(),
+            }, on_conflict='cache_key'))
 
-        except ImportError:
-            logger.warning('youtube-transcript-api is not installed')
-            return None
         except Exception as e:
-            logger.warning(f'Failed to fetch transcript for video {video_id}: {e}')
-            return None
+            # キャッシュ保存エラーは無視
+            logger.warning(f'Failed to save transcript to Supabase cache: {e}')
 
     # ============================================
     # 統合検索メソッド
     # ============================================
 
+    @staticmethod
+    def _normalize_keyword(keyword: str) -> str:
+        """
+        キャッシュキー用にキーワードを正規化
+
+        NFKC正規化（全角英数・全角スペース → 半角）、小文字化、
+        カタカナ → ひらがな変換、連続する空白の1文字化を行う
+
+        Args:
+            keyword: 検索キーワード
+
+        Returns:
+            str: 正規化済みキーワード
+        """
+        normalized = unicodedata.normalize('NFKC', keyword).casefold()
+        normalized = ''.join(
+            chr(ord(c) - 0x60) if 'ァ' <= c <= 'ヶ' else c
+            for c in normalized
+        )
+        return ' '.join(normalized.split())
+
+    @classmethod
+    def _build_cache_key(cls, keyword: str, period_days: Optional[int], pages: int) -> str:
+        """
+        検索キャッシュキーを生成（正規化キーワード + 期間 + ページ数のMD5ハッシュ）
+
+        影響力・登録者数の範囲フィルターは取得結果に読み出し時に適用するため、
+        キーには含めない（範囲違いの検索で同じ取得結果を共有する）
+        """
+        cache_key_data = {
+            'keyword': cls._normalize_keyword(keyword),
+            'periodDays': period_days,
+        }
+        if pages > 1:
+            cache_key_data['pages'] = pages
+        return hashlib.md5(
+            json.dumps(cache_key_data, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    async def _get_cached_search(self, cache_key: str, keyword: str) -> Optional[CompactSearchResult]:
+        """
+        Supabase永続キャッシュ → メモリキャッシュの順に検索結果を取得
+
+        Args:
+            cache_key: キャッシュキー
+            keyword: 検索キーワード（ログ用）
+
+        Returns:
+            CompactSearchResult: キャッシュ結果（存在しない場合はNone）
+        """
+        # 1. Supabase永続キャッシュを確認（最優先）
+        cached = await self._get_cached_result(cache_key)
+        if cached:
+            # メモリキャッシュにも保存（高速化）
+            compact = CompactSearchResult.from_result(cached)
+            _search_cache[cache_key] = compact
+            return compact
+
+        # 2. メモリキャッシュを確認
+        compact = _search_cache.get(cache_key)
+        if compact is not None:
+            logger.info(f'Memory cache hit for keyword: {keyword}')
+        return compact
+
+    @staticmethod
+    def _is_stale(searched_at: str) -> bool:
+        """
+        検索結果がキャッシュ有効期間（cache_ttl_hours）を過ぎているか
+
+        Args:
+            searched_at: 検索日時（ISO 8601形式）
+
+        Returns:
+            bool: 有効期間を過ぎている場合True
+        """
+        try:
+            searched = datetime.fromisoformat(searched_at.replace('Z', '+00:00'))
+        except ValueError:
+            return True
+        return datetime.now(timezone.utc) - searched > timedelta(hours=settings.cache_ttl_hours)
+
+    def _schedule_refresh(
+        self,
+        keyword: str,
+        filters: Optional[SearchFilters],
+        pages: int,
+        cache_key: str
+    ) -> None:
+        """
+        期限切れキャッシュをバックグラウンドで再取得（同一キーの再取得は1回に集約）
+
+        Args:
+            keyword: 検索キーワード
+            filters: 検索フィルター条件
+            pages: 検索ページ数
+            cache_key: キャッシュキー
+        """
+        if _search_flights.in_flight(cache_key):
+            return
+
+        logger.info(f'Serving stale cache and refreshing in background for keyword: {keyword}')
+        flight = _search_flights.stream(
+            cache_key,
+            lambda: self._search_with_failover(keyword, filters, pages, cache_key)
+        )
+
+        async def refresh() -> None:
+            try:
+                async with aclosing(flight) as items:
+                    async for _ in items:
+                        pass
+            except Exception as e:
+                logger.warning(f'Background cache refresh failed for keyword: {keyword}: {e}')
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+
     async def search_buzz_videos(
         self,
         keyword: str,
-        filters: Optional[SearchFilters] = None
+        filters: Optional[SearchFilters] = None,
+        max_pages: int = 1,
+        quota_budget: Optional[int] = None
     ) -> SearchResult:
         """
         バズ動画を検索し、影響力などの計算値を付加して返す
 
         【キャッシュ戦略】
-        1. Supabase永続キャッシュを確認（24時間有効）
+        1. Supabase永続キャッシュを確認（24時間有効、その後48時間は古い結果を返しつつ再取得）
         2. メモリキャッシュを確認（1時間有効）
-        3. YouTube APIを呼び出し（キーローテーション対応）
+        3. YouTube APIを呼び出し（同一検索の並行実行は1回に集約）
         4. 両方のキャッシュに保存
 
+        キャッシュキーは正規化キーワード + 期間 + ページ数のみで構成し、
+        影響力・登録者数の範囲フィルターは読み出し時に適用する
+
+        【ディープ検索】
+        max_pages が2以上の場合、クォータ予算内で nextPageToken を辿って複数ページを検索する
+
         Args:
             keyword: 検索キーワード
             filters: 検索フィルター条件
+            max_pages: 検索ページ数（1ページ最大50件）
+            quota_budget: YouTube APIクォータ予算（ユニット）
 
         Returns:
             SearchResult: 検索結果（動画リスト付き）
@@ -743,78 +1607,172 @@ class YouTubeService:
         Raises:
             YouTubeAPIError: API呼び出しエラー
         """
-        # キャッシュキー生成（キーワード + フィルター条件のハッシュ）
-        cache_key_data = {
+        result: Optional[SearchResult] = None
+        async for item in self.stream_buzz_videos(keyword, filters, max_pages, quota_budget):
+            if isinstance(item, SearchResult):
+                result = item
+
+        if result is None:
+            raise YouTubeAPIError('検索結果を取得できませんでした')
+        return result
+
+    async def stream_buzz_videos(
+        self,
+        keyword: str,
+        filters: Optional[SearchFilters] = None,
+        max_pages: int = 1,
+        quota_budget: Optional[int] = None
+    ) -> AsyncIterator[Union[Video, SearchResult]]:
+        """
+        バズ動画を検索し、チャンネル情報が揃った動画から順に返す
+
+        フィルター条件を満たす Video をエンリッチ完了順に yield し、
+        最後に影響力順にソート済みの SearchResult を yield する。
+        キャッシュヒット時はキャッシュ済みの動画を順に返す。
+
+        Args:
+            keyword: 検索キーワード
+            filters: 検索フィルター条件
+            max_pages: 検索ページ数（1ページ最大50件）
+            quota_budget: YouTube APIクォータ予算（ユニット）
+
+        Yields:
+            Video | SearchResult: 動画（逐次）と最終的な検索結果
+
+        Raises:
+            YouTubeAPIError: API呼び出しエラー
+        """
+        pages = self.pages_within_budget(max_pages, quota_budget)
+        # YouTube APIに渡すのは期間のみ。範囲フィルターは取得結果に適用する
+        period_days = filters.period_days if filters else None
+        fetch_filters = SearchFilters(period_days=period_days) if period_days else None
+        cache_key = self._build_cache_key(keyword, period_days, pages)
+
+        cached = await self._get_cached_search(cache_key, keyword)
+        if cached:
+            # 有効期間を過ぎていれば古い結果を即時返し、裏で再取得する
+            is_stale = self._is_stale(cached.searched_at)
+            if is_stale:
+                self._schedule_refresh(keyword, fetch_filters, pages, cache_key)
+            # フィルター条件を満たす動画だけVideoを生成する
+            result = cached.to_result(keyword, filters, is_stale=is_stale)
+            for video in result.videos:
+                yield video
+            yield result
+            return
+
+        # 同じ検索が実行中なら、その結果を共有する（search.list の重複実行を防ぐ）
+        flight = _search_flights.stream(
+            cache_key,
+            lambda: self._search_with_failover(keyword, fetch_filters, pages, cache_key)
+        )
+        async with aclosing(flight) as items:
+            async for item in items:
+                if isinstance(item, SearchResult):
+                    yield self._filter_result(item, keyword, filters)
+                elif self._apply_filters(item, filters):
+                    yield item
+
+    def _filter_result(
+        self,
+        result: SearchResult,
+        keyword: str,
+        filters: Optional[SearchFilters]
+    ) -> SearchResult:
+        """
+        共有の検索結果（範囲フィルター未適用）から呼び出し元向けのコピーを作成
+
+        Args:
+            result: 検索結果（実行中の検索で共有されるもの）
+            keyword: 呼び出し元の検索キーワード
+            filters: 検索フィルター条件
+
+        Returns:
+            SearchResult: フィルター適用後の検索結果
+        """
+        return result.model_copy(update={
             'keyword': keyword,
-            'filters': filters.model_dump() if filters else None
-        }
-        cache_key = hashlib.md5(
-            json.dumps(cache_key_data, sort_keys=True).encode('utf-8')
-        ).hexdigest()
+            'videos': [v for v in result.videos if self._apply_filters(v, filters)],
+        })
 
-        # 1. Supabase永続キャッシュを確認（最優先）
-        supabase_result = await self._get_cached_result(cache_key)
-        if supabase_result:
-            # メモリキャッシュにも保存（高速化）
-            _search_cache[cache_key] = supabase_result
-            return supabase_result
+    async def _search_with_failover(
+        self,
+        keyword: str,
+        filters: Optional[SearchFilters],
+        pages: int,
+        cache_key: str
+    ) -> AsyncIterator[Union[Video, SearchResult]]:
+        """
+        YouTube APIで検索し、クォータ超過時は残りのあるキーで再検索する
 
-        # 2. メモリキャッシュを確認
-        if cache_key in _search_cache:
-            logger.info(f'Memory cache hit for keyword: {keyword}')
-            return _search_cache[cache_key]
+        Args:
+            keyword: 検索キーワード
+            filters: 検索フィルター条件
+            pages: 検索ページ数
+            cache_key: キャッシュキー
 
+        Yields:
+            Video | SearchResult: 動画（逐次）と最終的な検索結果
+        """
         logger.info(f'Cache miss - Starting buzz video search for keyword: {keyword}')
 
+        # キー切替後の再検索で同じ動画を二重に返さない
+        emitted_video_ids: set[str] = set()
+        while True:
+            try:
+                async with aclosing(self._search_uncached(keyword, filters, pages, cache_key)) as items:
+                    async for item in items:
+                        if isinstance(item, Video):
+                            if item.video_id in emitted_video_ids:
+                                continue
+                            emitted_video_ids.add(item.video_id)
+                        yield item
+                return
+
+            except YouTubeQuotaExceededError:
+                # クォータ超過したキーは台帳で使い切り扱いになるため、残りのあるキーでリトライ
+                if not self.quota_ledger.has_available_key(SEARCH_QUOTA_COST):
+                    # すべてのキーが使用不可
+                    raise
+                logger.info(f'Retrying search with next API key for keyword: {keyword}')
+
+    async def _search_uncached(
+        self,
+        keyword: str,
+        filters: Optional[SearchFilters],
+        pages: int,
+        cache_key: str
+    ) -> AsyncIterator[Union[Video, SearchResult]]:
+        """
+        YouTube APIで検索し、動画を逐次返した後に検索結果をキャッシュして返す
+
+        Args:
+            keyword: 検索キーワード
+            filters: 検索フィルター条件
+            pages: 検索ページ数
+            cache_key: キャッシュキー
+
+        Yields:
+            Video | SearchResult: 動画（逐次）と最終的な検索結果
+        """
         # 期間フィルターの計算
         published_after = None
         if filters and filters.period_days:
-            from datetime import timedelta
             published_after = datetime.now(timezone.utc) - timedelta(
                 days=filters.period_days
             )
 
         try:
-            # Step 1: 動画検索
-            video_ids = await self.search_videos(
-                keyword=keyword,
-                published_after=published_after
-            )
-
-            if not video_ids:
-                logger.info(f'No videos found for keyword: {keyword}')
-                return SearchResult(
-                    keyword=keyword,
-                    searched_at=datetime.now(timezone.utc).isoformat(),
-                    videos=[]
-                )
-
-            # Step 2: 動画詳細取得
-            video_details = await self.get_video_details(video_ids)
-
-            # Step 3: チャンネルID収集
-            channel_ids = [
-                video.get('snippet', {}).get('channelId')
-                for video in video_details
-                if video.get('snippet', {}).get('channelId')
-            ]
-
-            # Step 4: チャンネル情報取得
-            channel_map = await self.get_channel_details(channel_ids)
-
-            # Step 5: Video オブジェクトの構築
+            # 動画検索（ページング）→ 動画詳細 → チャンネル情報（並行パイプライン）
+            pipeline = _EnrichmentPipeline(self, keyword, published_after, pages)
             videos: list[Video] = []
-            for video in video_details:
-                try:
-                    video_obj = self._build_video_object(video, channel_map)
-                    if video_obj:
-                        # フィルター適用
-                        if self._apply_filters(video_obj, filters):
-                            videos.append(video_obj)
-                except Exception as e:
-                    video_id = video.get('id', 'unknown')
-                    logger.warning(f'Failed to build video object for {video_id}: {e}')
-                    continue
+            found_count = 0
+            async with aclosing(pipeline.batches()) as batches:
+                async for video_details, channel_map in batches:
+                    found_count += len(video_details)
+                    for video in self._build_filtered_videos(video_details, channel_map, filters):
+                        videos.append(video)
+                        yield video
 
             # 影響力でソート（降順）
             videos.sort(key=lambda v: v.impact_ratio, reverse=True)
@@ -829,20 +1787,17 @@ class YouTubeService:
                 videos=videos
             )
 
+            if not found_count:
+                logger.info(f'No videos found for keyword: {keyword}')
+                yield result
+                return
+
             # 結果をキャッシュに保存（メモリ + Supabase）
-            _search_cache[cache_key] = result
+            _search_cache[cache_key] = CompactSearchResult.from_result(result)
             await self._save_to_cache(cache_key, keyword, filters, result)
             logger.info(f'Search result cached for keyword: {keyword}')
 
-            return result
-
-        except YouTubeQuotaExceededError:
-            # クォータ超過時、次のキーに切り替えてリトライ
-            if self._rotate_to_next_key():
-                logger.info(f'Retrying search with next API key for keyword: {keyword}')
-                return await self.search_buzz_videos(keyword, filters)
-            # すべてのキーが使用不可
-            raise
+            yield result
 
         except YouTubeAPIError:
             raise
@@ -850,70 +1805,26 @@ class YouTubeService:
             logger.exception(f'Unexpected error during search: {e}')
             raise YouTubeAPIError(f'検索中に予期しないエラーが発生しました: {e}')
 
-    def _build_video_object(
+    def _build_filtered_videos(
         self,
-        video_data: dict,
-        channel_map: dict[str, dict]
-    ) -> Optional[Video]:
+        video_details: list[dict],
+        channel_map: dict[str, dict],
+        filters: Optional[SearchFilters]
+    ) -> list[Video]:
         """
-        APIレスポンスからVideoオブジェクトを構築
+        動画詳細データからVideoオブジェクトを構築し、フィルター条件を満たすものを返す
+
+        計算値とフィルター判定は列指向で一括計算し、通過した動画だけVideoを生成する
 
         Args:
-            video_data: 動画詳細データ
+            video_details: 動画詳細データリスト
             channel_map: チャンネル情報マップ
+            filters: 検索フィルター条件
 
         Returns:
-            Video: 動画オブジェクト（構築失敗時はNone）
+            list[Video]: フィルター適用後の動画リスト
         """
-        try:
-            video_id = video_data.get('id', '')
-            snippet = video_data.get('snippet', {})
-            statistics = video_data.get('statistics', {})
-
-            channel_id = snippet.get('channelId', '')
-            channel_info = channel_map.get(channel_id, {})
-
-            # 基本情報
-            published_at = snippet.get('publishedAt', '')
-            view_count = int(statistics.get('viewCount', 0))
-            like_count = int(statistics.get('likeCount', 0))
-            subscriber_count = int(channel_info.get('subscriberCount', 0))
-
-            # 計算値
-            days_ago = self.calculate_days_ago(published_at)
-            daily_avg_views = self.calculate_daily_avg_views(view_count, days_ago)
-            impact_ratio = self.calculate_impact_ratio(view_count, subscriber_count)
-            like_ratio = self.calculate_like_ratio(like_count, view_count)
-
-            # サムネイルURL取得（高解像度優先）
-            thumbnails = snippet.get('thumbnails', {})
-            thumbnail_url = (
-                thumbnails.get('high', {}).get('url') or
-                thumbnails.get('medium', {}).get('url') or
-                thumbnails.get('default', {}).get('url') or
-                ''
-            )
-
-            return Video(
-                video_id=video_id,
-                url=f'https://www.youtube.com/watch?v={video_id}',
-                title=snippet.get('title', ''),
-                published_at=published_at,
-                thumbnail_url=thumbnail_url,
-                view_count=view_count,
-                like_count=like_count,
-                channel_id=channel_id,
-                channel_name=channel_info.get('title', snippet.get('channelTitle', '')),
-                subscriber_count=subscriber_count,
-                channel_created_at=channel_info.get('publishedAt', ''),
-                days_ago=days_ago,
-                daily_avg_views=daily_avg_views,
-                impact_ratio=impact_ratio,
-                like_ratio=like_ratio,
-            )
-        except Exception as e:
-            logger.warning(f'Failed to build video object: {e}')
-            return None
+        return build_filtered_videos(video_details, channel_map, filters)
 
     def _apply_filters(
         self,
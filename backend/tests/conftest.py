@@ -0,0 +1,117 @@
+"""
+テスト共通設定 - バズり動画究極リサーチシステム
+
+Supabaseクライアントの代わりに使うフェイクを提供する
+"""
+
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+
+import pytest
+
+
+class FakeQuery:
+    """execute() を持つクエリビルダーのフェイク"""
+
+    def __init__(self, handler: Callable[[], Any]):
+        self._handler = handler
+
+    def execute(self) -> SimpleNamespace:
+        """登録された処理を実行し、supabase-py と同じく data 属性を持つ結果を返す"""
+        return SimpleNamespace(data=self._handler())
+
+
+class FakeCountQuery:
+    """件数取得クエリのフェイク（eq / gte の条件を記録する）"""
+
+    def __init__(self, handler: Callable[[dict], int]):
+        self._handler = handler
+        self._filters: dict[str, Any] = {}
+
+    def eq(self, column: str, value: Any) -> 'FakeCountQuery':
+        self._filters[column] = value
+        return self
+
+    def gte(self, column: str, value: Any) -> 'FakeCountQuery':
+        self._filters[column] = value
+        return self
+
+    def execute(self) -> SimpleNamespace:
+        """登録された処理に条件を渡し、supabase-py と同じく count 属性を持つ結果を返す"""
+        return SimpleNamespace(data=[], count=self._handler(self._filters))
+
+
+class FakeTable:
+    """テーブル操作のフェイク（insert と件数取得の select のみ）"""
+
+    def __init__(
+        self,
+        insert_handler: Optional[Callable[[list[dict]], Any]],
+        count_handler: Optional[Callable[[dict], int]]
+    ):
+        self._insert_handler = insert_handler
+        self._count_handler = count_handler
+
+    def insert(self, rows: list[dict]) -> FakeQuery:
+        """挿入クエリを返す（execute() で登録した処理を呼ぶ）"""
+        return FakeQuery(lambda: self._insert_handler(rows))
+
+    def select(self, *columns: str, count: Optional[str] = None, head: Optional[bool] = None) -> FakeCountQuery:
+        """件数取得クエリを返す（execute() で登録した処理を呼ぶ）"""
+        return FakeCountQuery(self._count_handler)
+
+
+class FakeSupabase:
+    """RPC呼び出しを記録し、登録した応答を返すSupabaseクライアントのフェイク"""
+
+    def __init__(self):
+        self.rpc_calls: list[tuple[str, dict]] = []
+        self._rpc_handlers: dict[str, Callable[[dict], Any]] = {}
+        self._insert_handlers: dict[str, Callable[[list[dict]], Any]] = {}
+        self._count_handlers: dict[str, Callable[[dict], int]] = {}
+
+    def on_rpc(self, name: str, handler: Callable[[dict], Any]) -> None:
+        """
+        RPCの応答を登録
+
+        Args:
+            name: 関数名
+            handler: 引数を受け取り data を返す関数（例外を送出すると失敗を再現）
+        """
+        self._rpc_handlers[name] = handler
+
+    def on_insert(self, table: str, handler: Callable[[list[dict]], Any]) -> None:
+        """
+        テーブルへの挿入の処理を登録
+
+        Args:
+            table: テーブル名
+            handler: 挿入する行を受け取る関数（例外を送出すると失敗を再現）
+        """
+        self._insert_handlers[table] = handler
+
+    def on_count(self, table: str, handler: Callable[[dict], int]) -> None:
+        """
+        テーブルの件数取得（select(count='exact')）の応答を登録
+
+        Args:
+            table: テーブル名
+            handler: 絞り込み条件（列名→値）を受け取り件数を返す関数（例外を送出すると失敗を再現）
+        """
+        self._count_handlers[table] = handler
+
+    def table(self, name: str) -> FakeTable:
+        """テーブル操作を返す"""
+        return FakeTable(self._insert_handlers.get(name), self._count_handlers.get(name))
+
+    def rpc(self, name: str, params: Optional[dict] = None) -> FakeQuery:
+        """RPC呼び出しを記録してクエリを返す"""
+        params = params or {}
+        self.rpc_calls.append((name, params))
+        return FakeQuery(lambda: self._rpc_handlers[name](params))
+
+
+@pytest.fixture
+def fake_supabase() -> FakeSupabase:
+    """Supabaseクライアントのフェイク"""
+    return FakeSupabase()
@@ -0,0 +1,40 @@
+"""
+管理者サービスのテスト
+"""
+
+from app.services.admin_service import AdminService
+
+
+def _user_row(index: int) -> dict:
+    return {
+        'id': f'00000000-0000-0000-0000-00000000000{index}',
+        'email': f'user{index}@example.com',
+        'full_name': None,
+        'is_admin': False,
+        'created_at': f'2026-01-0{index}T00:00:00+00:00',
+        'subscription_status': 'none',
+        'trial_end': None,
+        'current_period_end': None,
+    }
+
+
+async def test_get_users_returns_total_only_on_first_page(fake_supabase):
+    """総件数は先頭ページでのみ返し、2ページ目以降はカーソルで続きを取得する"""
+    service = AdminService(supabase=fake_supabase)
+    fake_supabase.on_rpc('get_admin_users', lambda params: {
+        'users': [_user_row(3), _user_row(2), _user_row(1)],
+        'total': 5 if params['p_cursor_created_at'] is None else None,
+    })
+
+    users, total, next_cursor = await service.get_users(per_page=2)
+    assert [u.email for u in users] == ['user3@example.com', 'user2@example.com']
+    assert total == 5
+    assert next_cursor is not None
+
+    _, total, _ = await service.get_users(per_page=2, cursor=next_cursor)
+    assert total is None
+
+    _, params = fake_supabase.rpc_calls[-1]
+    assert params['p_cursor_created_at'] == '2026-01-02T00:00:00+00:00'
+    assert params['p_cursor_id'] == _user_row(2)['id']
+    assert params['p_limit'] == 3
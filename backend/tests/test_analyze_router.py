@@ -0,0 +1,120 @@
+"""
+バズ要因分析APIのテスト
+
+分析結果は全ユーザーで共有してキャッシュされるため、
+プロンプトの元になる動画情報はクライアントの送信内容ではなくサーバー側で取得したものを使う
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.security import UserInfo
+from app.dependencies import require_active_subscription
+from app.main import app
+from app.routers import analyze as analyze_router
+from app.schemas import AnalysisResult, Video
+
+USER = UserInfo(id='user-1', email='user@example.com', is_admin=False)
+
+
+def _video(video_id: str, title: str, view_count: int) -> Video:
+    return Video(
+        video_id=video_id,
+        url=f'https://www.youtube.com/watch?v={video_id}',
+        title=title,
+        published_at='2026-01-01T00:00:00Z',
+        thumbnail_url=f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg',
+        view_count=view_count,
+        like_count=0,
+        channel_id='UC_channel',
+        channel_name='チャンネル',
+        subscriber_count=1000,
+        channel_created_at='2020-01-01T00:00:00Z',
+        days_ago=10,
+        daily_avg_views=view_count / 10,
+        impact_ratio=view_count / 1000,
+        like_ratio=0.0,
+    )
+
+
+SERVER_VIDEOS = {'vid00000001': _video('vid00000001', '本物のタイトル', 5000)}
+FORGED = _video('vid00000001', '偽のタイトル', 10 ** 9)
+
+
+class FakeYouTubeService:
+    """サーバー側の動画情報を返すYouTubeサービス"""
+
+    async def get_videos(self, video_ids: list[str]) -> list[Video]:
+        return [SERVER_VIDEOS[v] for v in video_ids if v in SERVER_VIDEOS]
+
+
+class FakeAuthService:
+    """利用ログを記録しない認証サービス"""
+
+    async def log_usage(self, **kwargs) -> bool:
+        return True
+
+
+@pytest.fixture
+def analyzed(monkeypatch) -> list[Video]:
+    """分析サービスに渡された動画情報"""
+    videos: list[Video] = []
+
+    async def analyze_video(video: Video) -> AnalysisResult:
+        videos.append(video)
+        return AnalysisResult(
+            video_id=video.video_id,
+            buzz_factors='分析結果',
+            suggested_keywords=[],
+            analysis_summary='要約',
+        )
+
+    async def analyze_videos(targets: list[Video]):
+        for video in targets:
+            yield await analyze_video(video)
+
+    monkeypatch.setattr(analyze_router.analyze_service, 'analyze_video', analyze_video)
+    monkeypatch.setattr(analyze_router.analyze_service, 'analyze_videos', analyze_videos)
+    return videos
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """認証・サブスクリプション確認を省略したクライアント"""
+    app.dependency_overrides[require_active_subscription] = lambda: USER
+    monkeypatch.setattr(analyze_router, 'get_youtube_service', lambda: FakeYouTubeService())
+    monkeypatch.setattr(analyze_router, 'get_auth_service', lambda: FakeAuthService())
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_analyze_uses_server_side_video_info(client, analyzed):
+    """クライアントが送信したタイトル・統計情報は分析に使わない"""
+    response = client.post('/api/analyze', json={'video': FORGED.model_dump(by_alias=True)})
+
+    assert response.status_code == 200
+    assert analyzed == [SERVER_VIDEOS['vid00000001']]
+
+
+def test_analyze_unknown_video_returns_404(client, analyzed):
+    """サーバー側で取得できない動画は分析しない"""
+    forged = FORGED.model_copy(update={'video_id': 'unknown0001'})
+    response = client.post('/api/analyze', json={'video': forged.model_dump(by_alias=True)})
+
+    assert response.status_code == 404
+    assert analyzed == []
+
+
+def test_batch_analyze_uses_server_side_video_info(client, analyzed):
+    """一括分析でも videos の動画情報は動画IDのみ使用する"""
+    response = client.post('/api/analyze/batch', json={
+        'videos': [FORGED.model_dump(by_alias=True)],
+        'videoIds': ['unknown0001'],
+    })
+
+    frames = [json.loads(line) for line in response.text.splitlines()]
+    assert analyzed == [SERVER_VIDEOS['vid00000001']]
+    assert {'type': 'error', 'videoId': 'unknown0001', 'detail': '動画が見つかりません'} in frames
+    assert frames[-1] == {'type': 'done', 'total': 1}
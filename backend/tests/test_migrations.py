@@ -0,0 +1,47 @@
+"""
+マイグレーションのテスト
+"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / 'supabase' / 'migrations'
+
+# SECURITY DEFINER のRPC関数（バックエンドがサービスロールで呼び出すもの）
+SERVICE_ROLE_FUNCTIONS = [
+    ('005_add_youtube_quota_usage.sql', 'sync_youtube_quota'),
+    ('005_add_youtube_quota_usage.sql', 'cleanup_old_youtube_quota'),
+    ('006_add_search_cache_functions.sql', 'fetch_search_cache'),
+    ('006_add_search_cache_functions.sql', 'add_search_cache_hits'),
+    ('007_add_request_context_function.sql', 'get_request_context'),
+    ('008_add_daily_usage_counters.sql', 'reserve_daily_usage'),
+    ('008_add_daily_usage_counters.sql', 'release_daily_usage'),
+    ('008_add_daily_usage_counters.sql', 'get_request_context'),
+    ('009_add_admin_aggregate_functions.sql', 'get_admin_dashboard_stats'),
+    ('009_add_admin_aggregate_functions.sql', 'get_admin_user_detail'),
+    ('010_add_admin_user_list_function.sql', 'get_admin_users'),
+    ('013_add_daily_usage_amount.sql', 'reserve_daily_usage'),
+    ('013_add_daily_usage_amount.sql', 'release_daily_usage'),
+]
+
+
+@pytest.mark.parametrize('migration, function', SERVICE_ROLE_FUNCTIONS)
+def test_security_definer_function_is_service_role_only(migration: str, function: str):
+    """anon・authenticated（PUBLIC経由を含む）から実行できず、サービスロールのみ実行できる"""
+    sql = (MIGRATIONS_DIR / migration).read_text(encoding='utf-8')
+    assert re.search(rf'CREATE OR REPLACE FUNCTION {function}\(.*?SECURITY DEFINER;', sql, re.S)
+
+    revoke = re.search(
+        rf'REVOKE EXECUTE ON FUNCTION {function}\([^)]*\) FROM ([^;]+);', sql
+    )
+    grant = re.search(
+        rf'GRANT EXECUTE ON FUNCTION {function}\([^)]*\) TO ([^;]+);', sql
+    )
+    assert revoke is not None
+    assert {r.strip() for r in revoke.group(1).split(',')} == {'PUBLIC', 'anon', 'authenticated'}
+    assert grant is not None
+    assert grant.group(1).strip() == 'service_role'
+    # 関数定義より前に書くと新規作成時に権限が設定されない
+    assert sql.rindex(f'CREATE OR REPLACE FUNCTION {function}(') < revoke.start()
@@ -0,0 +1,80 @@
+"""
+YouTube APIクォータ台帳のテスト
+
+sync_youtube_quota RPC の引数・応答の形（key_id, units_used の行リスト）を検証する
+"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from app.config import settings
+from app.services.quota_ledger import QuotaLedger, current_quota_date, key_fingerprint
+
+MIGRATION = (
+    Path(__file__).resolve().parents[2]
+    / 'supabase' / 'migrations' / '005_add_youtube_quota_usage.sql'
+)
+
+
+@pytest.fixture(autouse=True)
+def no_background_sync(monkeypatch):
+    """計上時のバックグラウンド同期を止め、テストから sync() を直接呼ぶ"""
+    monkeypatch.setattr(settings, 'enable_supabase_cache', False)
+
+
+async def test_sync_sends_increments_and_reads_shared_totals(fake_supabase):
+    """未同期分を加算し、RPCが返す全ワーカー合算の消費量を取り込む"""
+    ledger = QuotaLedger(['key-a', 'key-b'], daily_limit=10000)
+    ledger._supabase = fake_supabase
+    key_a, key_b = key_fingerprint('key-a'), key_fingerprint('key-b')
+    fake_supabase.on_rpc('sync_youtube_quota', lambda params: [
+        {'key_id': key_a, 'units_used': 500},
+        {'key_id': key_b, 'units_used': 30},
+    ])
+
+    ledger.charge(0, 102)
+    await ledger.sync()
+
+    name, params = fake_supabase.rpc_calls[0]
+    assert name == 'sync_youtube_quota'
+    assert params == {
+        'p_quota_date': current_quota_date().isoformat(),
+        'p_increments': {key_a: 102},
+    }
+    assert ledger._pending == [0, 0]
+    assert ledger.remaining(0) == 10000 - 500
+    assert ledger.remaining(1) == 10000 - 30
+
+
+async def test_sync_failure_keeps_pending_increments(fake_supabase):
+    """RPCが失敗した消費量は次回の同期で再送する"""
+    ledger = QuotaLedger(['key-a'], daily_limit=10000)
+    ledger._supabase = fake_supabase
+
+    def fail(params):
+        raise RuntimeError('column reference "key_id" is ambiguous')
+
+    fake_supabase.on_rpc('sync_youtube_quota', fail)
+    ledger.charge(0, 100)
+    await ledger.sync()
+
+    assert ledger._pending == [100]
+    assert ledger.remaining(0) == 10000 - 100
+
+
+def test_sync_function_returns_columns_read_by_ledger():
+    """RPCの戻り値の列名が台帳の読み出しと一致し、テーブル列との名前の衝突を解決している"""
+    sql = MIGRATION.read_text(encoding='utf-8')
+    function = re.search(
+        r'FUNCTION sync_youtube_quota\(.*?\)\s*RETURNS TABLE \((.*?)\) AS \$\$(.*?)\$\$',
+        sql,
+        re.S,
+    )
+    assert function is not None
+
+    columns = [c.split()[0] for c in function.group(1).split(',')]
+    assert columns == ['key_id', 'units_used']
+    # 戻り値の列名が youtube_quota_usage の列名と同じため、列として解決させる
+    assert '#variable_conflict use_column' in function.group(2)
@@ -0,0 +1,255 @@
+"""
+検索回数制限（検索枠の確保・返却）のテスト
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.security import UserInfo
+from app.dependencies import require_active_subscription
+from app.main import app
+from app.routers import search as search_router
+from app.schemas import SearchRequest, SearchResult, Video
+from app.services.auth_service import AuthService, SearchLimitUnavailableError
+from app.services.youtube_service import YouTubeAPIError
+
+USER = UserInfo(id='user-1', email='user@example.com', is_admin=False)
+
+
+class FailingYouTubeService:
+    """検索が常に失敗するYouTubeサービス"""
+
+    async def search_buzz_videos(self, **kwargs):
+        raise YouTubeAPIError('YouTube APIでエラーが発生しました')
+
+    async def stream_buzz_videos(self, **kwargs):
+        raise YouTubeAPIError('YouTube APIでエラーが発生しました')
+        yield
+
+
+@pytest.fixture
+def auth_service(fake_supabase, monkeypatch):
+    """フェイクのSupabaseを使う認証サービス（利用ログは記録しない）"""
+    service = AuthService(supabase=fake_supabase)
+
+    async def log_usage(*args, **kwargs):
+        return True
+
+    monkeypatch.setattr(service, 'log_usage', log_usage)
+    fake_supabase.on_rpc('release_daily_usage', lambda params: None)
+    fake_supabase.on_count('usage_logs', lambda filters: 3)
+    return service
+
+
+@pytest.fixture
+def client(auth_service, monkeypatch):
+    """認証・サブスクリプション確認を省略し、検索が失敗するクライアント"""
+    app.dependency_overrides[require_active_subscription] = lambda: USER
+    monkeypatch.setattr(search_router, 'get_auth_service', lambda: auth_service)
+    monkeypatch.setattr(search_router, 'get_youtube_service', lambda: FailingYouTubeService())
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _release_calls(fake_supabase) -> list:
+    return [name for name, _ in fake_supabase.rpc_calls if name == 'release_daily_usage']
+
+
+def _fail_reserve(params):
+    raise RuntimeError('reserve_daily_usage is unavailable')
+
+
+@pytest.mark.parametrize('path', ['/api/search', '/api/search/stream'])
+def test_failed_search_releases_reserved_slot(client, fake_supabase, path):
+    """検索枠を確保できた検索が失敗した場合は返却する"""
+    fake_supabase.on_rpc('reserve_daily_usage', lambda params: 4)
+
+    client.post(path, json={'keyword': 'python'})
+
+    assert _release_calls(fake_supabase) == ['release_daily_usage']
+
+
+@pytest.mark.parametrize('path', ['/api/search', '/api/search/stream'])
+def test_failed_search_without_reservation_does_not_release(client, fake_supabase, path):
+    """確保RPCが失敗して回数チェックのみで通した検索が失敗しても、他の検索分を返却しない"""
+    fake_supabase.on_rpc('reserve_daily_usage', _fail_reserve)
+
+    client.post(path, json={'keyword': 'python'})
+
+    assert _release_calls(fake_supabase) == []
+
+
+async def test_check_search_limit_reports_reservation(auth_service, fake_supabase):
+    """確保RPCの成否を戻り値で返す"""
+    fake_supabase.on_rpc('reserve_daily_usage', lambda params: 4)
+    assert await auth_service.check_search_limit('user-1', daily_limit=20) == (True, 17, '', True)
+
+    fake_supabase.on_rpc('reserve_daily_usage', _fail_reserve)
+    assert await auth_service.check_search_limit('user-1', daily_limit=20) == (True, 17, '', False)
+
+
+async def test_check_search_limit_falls_back_to_usage_logs(auth_service, fake_supabase):
+    """確保RPCが失敗した場合は本日の利用ログの件数で上限を判定する"""
+    fake_supabase.on_rpc('reserve_daily_usage', _fail_reserve)
+    counted = []
+
+    def count_usage_logs(filters):
+        counted.append(filters)
+        return 20
+
+    fake_supabase.on_count('usage_logs', count_usage_logs)
+
+    can_search, remaining, _, reserved = await auth_service.check_search_limit('user-1', daily_limit=20)
+
+    assert (can_search, remaining, reserved) == (False, 0, False)
+    assert counted[0]['user_id'] == 'user-1'
+    assert counted[0]['action'] == 'search'
+
+
+async def test_check_search_limit_fails_closed_without_any_count(auth_service, fake_supabase):
+    """確保RPCと利用ログの両方が使えない場合は制限を外さず、確認不能として扱う"""
+    fake_supabase.on_rpc('reserve_daily_usage', _fail_reserve)
+
+    def fail_count(filters):
+        raise RuntimeError('usage_logs is unavailable')
+
+    fake_supabase.on_count('usage_logs', fail_count)
+
+    with pytest.raises(SearchLimitUnavailableError):
+        await auth_service.check_search_limit('user-1', daily_limit=20)
+
+
+@pytest.mark.parametrize('path', ['/api/search', '/api/search/stream'])
+def test_search_returns_503_when_limit_cannot_be_checked(client, fake_supabase, path):
+    """検索回数を確認できない場合は検索せずに503を返す"""
+    fake_supabase.on_rpc('reserve_daily_usage', _fail_reserve)
+
+    def fail_count(filters):
+        raise RuntimeError('usage_logs is unavailable')
+
+    fake_supabase.on_count('usage_logs', fail_count)
+
+    response = client.post(path, json={'keyword': 'python'})
+
+    assert response.status_code == 503
+    assert _release_calls(fake_supabase) == []
+
+
+@pytest.mark.parametrize('path', ['/api/search', '/api/search/stream'])
+def test_deep_search_charges_and_releases_each_page(client, fake_supabase, path):
+    """ディープ検索はページ数分の検索回数を確保し、失敗時は同じ回数を返却する"""
+    fake_supabase.on_rpc('reserve_daily_usage', lambda params: 3 + params['p_amount'])
+
+    client.post(path, json={'keyword': 'python', 'maxPages': 5})
+
+    reserve = [p for name, p in fake_supabase.rpc_calls if name == 'reserve_daily_usage']
+    release = [p for name, p in fake_supabase.rpc_calls if name == 'release_daily_usage']
+    assert reserve[0]['p_amount'] == 5
+    assert release[0]['p_amount'] == 5
+
+
+def test_deep_search_is_rejected_when_remaining_searches_are_short(client, fake_supabase):
+    """残り回数がページ数に満たない場合は検索せずに429を返す"""
+    fake_supabase.on_rpc('reserve_daily_usage', lambda params: None)
+
+    response = client.post('/api/search', json={'keyword': 'python', 'maxPages': 10})
+
+    assert response.status_code == 429
+    assert '10ページ' in response.json()['detail']
+    assert _release_calls(fake_supabase) == []
+
+
+def test_deep_search_is_unavailable_without_counter(client, fake_supabase):
+    """確保RPCが使えない間は、ページ数を数えられないためディープ検索を受け付けない"""
+    fake_supabase.on_rpc('reserve_daily_usage', _fail_reserve)
+
+    deep = client.post('/api/search', json={'keyword': 'python', 'maxPages': 3})
+    single = client.post('/api/search', json={'keyword': 'python'})
+
+    assert deep.status_code == 503
+    assert single.status_code != 503
+
+
+def _video(video_id: str) -> Video:
+    return Video(
+        video_id=video_id,
+        url=f'https://www.youtube.com/watch?v={video_id}',
+        title='動画',
+        published_at='2026-01-01T00:00:00Z',
+        thumbnail_url=f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg',
+        view_count=100,
+        like_count=1,
+        channel_id='UC_channel',
+        channel_name='チャンネル',
+        subscriber_count=10,
+        channel_created_at='2020-01-01T00:00:00Z',
+        days_ago=10,
+        daily_avg_views=10.0,
+        impact_ratio=10.0,
+        like_ratio=0.01,
+    )
+
+
+class SlowYouTubeService:
+    """動画を1件返した後、finish が set されるまで検索結果を返さないYouTubeサービス"""
+
+    def __init__(self):
+        self.searching = asyncio.Event()
+        self.finish = asyncio.Event()
+
+    async def stream_buzz_videos(self, **kwargs):
+        yield _video('vid00000001')
+        self.searching.set()
+        await self.finish.wait()
+        yield SearchResult(keyword='python', searched_at='2026-01-01T00:00:00Z', videos=[_video('vid00000001')])
+
+
+@pytest.fixture
+def slow_youtube(auth_service, monkeypatch):
+    """検索途中で止められるYouTubeサービス（認証サービスはフェイクのSupabaseを使う）"""
+    service = SlowYouTubeService()
+    monkeypatch.setattr(search_router, 'get_auth_service', lambda: auth_service)
+    monkeypatch.setattr(search_router, 'get_youtube_service', lambda: service)
+    return service
+
+
+def _stream_frames():
+    return search_router._stream_search_frames(SearchRequest(keyword='python'), USER, 16, 1)
+
+
+async def test_stream_releases_slot_when_client_disconnects(fake_supabase, slow_youtube):
+    """summary を送る前にクライアントが切断した（ストリームが閉じられた）場合は返却する"""
+    frames = _stream_frames()
+    assert '"video"' in await frames.__anext__()
+
+    await frames.aclose()
+
+    assert _release_calls(fake_supabase) == ['release_daily_usage']
+
+
+async def test_stream_releases_slot_when_cancelled_mid_search(fake_supabase, slow_youtube):
+    """検索の待機中にストリームごと取り消された場合も返却する"""
+    async def consume():
+        async for _ in _stream_frames():
+            pass
+
+    task = asyncio.create_task(consume())
+    await slow_youtube.searching.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    # 返却は取り消しから保護された別タスクで完了する
+    await asyncio.sleep(0)
+
+    assert _release_calls(fake_supabase) == ['release_daily_usage']
+
+
+async def test_stream_keeps_slot_after_summary(fake_supabase, slow_youtube):
+    """summary を送った検索は、その後に切断されても返却しない"""
+    slow_youtube.finish.set()
+    frames = [frame async for frame in _stream_frames()]
+
+    assert '"summary"' in frames[-1]
+    assert _release_calls(fake_supabase) == []
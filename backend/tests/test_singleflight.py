@@ -0,0 +1,59 @@
+"""
+シングルフライトのテスト
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+async def test_concurrent_callers_share_one_upstream_call():
+    """同一キーの並行呼び出しは上流を1回だけ実行し、全員が同じ結果を受け取る"""
+    flights: SingleFlight[int] = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    waiters = [asyncio.create_task(flights.do('key', fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [42, 42, 42]
+    assert calls == 1
+
+
+async def test_finished_flight_is_not_reused_before_it_is_forgotten():
+    """上流の完了直後（レジストリから削除される前）の呼び出しは新しい上流処理を開始する"""
+    flights: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        raise RuntimeError('transient')
+        yield
+
+    async def succeed():
+        nonlocal calls
+        calls += 1
+        yield 1
+
+    first = flights.stream('key', fail)
+    # 上流タスクは1ステップで失敗するが、完了コールバック（削除処理）はまだ実行されていない
+    await asyncio.sleep(0)
+    assert 'key' in flights._flights
+    assert not flights.in_flight('key')
+
+    assert [item async for item in flights.stream('key', succeed)] == [1]
+    assert calls == 2
+
+    with pytest.raises(RuntimeError):
+        async for _ in first:
+            pass
@@ -0,0 +1,79 @@
+"""
+利用ログバッファのテスト
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.usage_log_buffer import UsageLogBuffer
+
+ROWS = [{'user_id': 'user-1', 'action': 'search'}, {'user_id': 'user-2', 'action': 'search'}]
+
+
+@pytest.fixture
+def pending_insert(fake_supabase):
+    """
+    テストが解放するまで完了しない usage_logs への挿入
+
+    Returns:
+        tuple: (挿入開始, 挿入の解放, 挿入された行のリスト, 失敗させる回数のリスト)
+    """
+    started = threading.Event()
+    release = threading.Event()
+    inserted: list[dict] = []
+    failures = [0]
+
+    def insert(rows: list[dict]) -> list[dict]:
+        started.set()
+        release.wait(5)
+        if failures[0] > 0:
+            failures[0] -= 1
+            raise RuntimeError('insert failed')
+        inserted.extend(rows)
+        return rows
+
+    fake_supabase.on_insert('usage_logs', insert)
+    return started, release, inserted, failures
+
+
+async def _start_insert(fake_supabase, started: threading.Event) -> UsageLogBuffer:
+    """バッファにログを追加し、バックグラウンドの挿入が始まるまで待つ"""
+    buffer = UsageLogBuffer(flush_interval_ms=10, batch_size=len(ROWS), max_size=100)
+    buffer._supabase = fake_supabase
+    for row in ROWS:
+        buffer.add(row)
+    while not started.is_set():
+        await asyncio.sleep(0.01)
+    return buffer
+
+
+async def test_close_waits_for_pending_insert(fake_supabase, pending_insert):
+    """挿入中に close() しても挿入を打ち切らず、完了を待ってから終了する"""
+    started, release, inserted, _ = pending_insert
+    buffer = await _start_insert(fake_supabase, started)
+
+    closing = asyncio.create_task(buffer.close())
+    await asyncio.sleep(0.05)
+    assert not closing.done()
+
+    release.set()
+    await closing
+    assert inserted == ROWS
+    assert not buffer._rows
+
+
+async def test_close_retries_insert_that_fails_during_shutdown(fake_supabase, pending_insert):
+    """close() 中に失敗した挿入のログはバッファに戻し、終了時の書き込みで再送する"""
+    started, release, inserted, failures = pending_insert
+    failures[0] = 1
+    buffer = await _start_insert(fake_supabase, started)
+
+    closing = asyncio.create_task(buffer.close())
+    await asyncio.sleep(0.05)
+    release.set()
+    await asyncio.wait_for(closing, 5)
+
+    assert inserted == ROWS
+    assert not buffer._rows
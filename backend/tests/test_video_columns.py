@@ -0,0 +1,81 @@
+"""
+動画列指向データのテスト
+"""
+
+from datetime import datetime, timezone
+
+from app.schemas import SearchFilters
+from app.services.video_columns import VideoColumns, build_filtered_videos
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _video(video_id: str, published_at: str, views, likes, channel_id: str = 'UC1') -> dict:
+    return {
+        'id': video_id,
+        'snippet': {
+            'title': video_id,
+            'publishedAt': published_at,
+            'channelId': channel_id,
+            'channelTitle': channel_id,
+            'thumbnails': {},
+        },
+        'statistics': {'viewCount': str(views), 'likeCount': str(likes)},
+    }
+
+
+def _channels(**subscribers: int) -> dict[str, dict]:
+    return {
+        channel_id: {'title': channel_id, 'subscriberCount': str(count), 'publishedAt': ''}
+        for channel_id, count in subscribers.items()
+    }
+
+
+def test_metrics_follow_rounding_and_zero_division_rules():
+    """経過日数は切り捨て、比率は round() と同じ丸め、0除算時は規定値になる"""
+    columns = VideoColumns.from_api(
+        [
+            _video('a', '2026-02-26T13:00:00Z', 1000, 7),
+            _video('b', '2026-03-01T00:00:00Z', 500, 0),
+            _video('c', '2026-03-05T00:00:00Z', 0, 0),
+            _video('d', 'invalid', 300, 3, channel_id='UC2'),
+        ],
+        _channels(UC1=3, UC2=0),
+        now=NOW
+    )
+
+    assert columns.days_ago.tolist() == [2, 0, 0, 0]
+    assert columns.daily_avg_views.tolist() == [round(1000 / 2, 2), 500.0, 0.0, 300.0]
+    assert columns.impact_ratio.tolist() == [round(1000 / 3, 2), round(500 / 3, 2), 0.0, 0.0]
+    assert columns.like_ratio.tolist() == [round(7 / 1000, 4), 0.0, 0.0, 0.01]
+
+
+def test_ratio_rounding_matches_python_round():
+    """比率の丸めは浮動小数点の誤差を含めて Python の round() と一致する"""
+    views = list(range(1, 400))
+    columns = VideoColumns.from_api(
+        [_video(f'v{i}', '2026-02-01T00:00:00Z', i, i // 3) for i in views],
+        _channels(UC1=7),
+        now=NOW
+    )
+
+    assert columns.impact_ratio.tolist() == [round(v / 7, 2) for v in views]
+    assert columns.like_ratio.tolist() == [round((v // 3) / v, 4) for v in views]
+    assert columns.daily_avg_views.tolist() == [round(v / 28, 2) for v in views]
+
+
+def test_build_filtered_videos_applies_filters_and_keeps_order():
+    """フィルターを通過した動画だけを元の順序でVideoにする"""
+    videos = build_filtered_videos(
+        [
+            _video('low', '2026-02-01T00:00:00Z', 100, 1),
+            _video('high', '2026-02-01T00:00:00Z', 5000, 50),
+            _video('mid', '2026-02-01T00:00:00Z', 2000, 20),
+        ],
+        _channels(UC1=1000),
+        SearchFilters(impact_min=2.0)
+    )
+
+    assert [v.video_id for v in videos] == ['high', 'mid']
+    assert videos[0].impact_ratio == 5.0
+    assert videos[0].url.endswith('high')
@@ -21,7 +21,7 @@ import { VideoTable } from '../components/VideoTable';
 import { filterVideos, sortVideos } from '../utils/videoFilter';
 import { useSearchStore } from '../stores/searchStore';
 import { useAuthStore } from '../stores/authStore';
-import type { Video, SortConfig, SearchFilters } from '../types';
+import type { Video, SortConfig, SearchFilters, SearchStreamFrame } from '../types';
 
 /**
  * フィルターのデフォルト値
@@ -71,7 +71,8 @@ export const SearchPage = () => {
     setError(null);
 
     try {
-      const apiUrl = `${API_BASE_URL}/api/search`;
+      // ストリーミング検索: 動画をエンリッチ完了順に受け取り、逐次表示する
+      const apiUrl = `${API_BASE_URL}/api/search/stream`;
 
       const headers: Record<string, string> = {
         'Content-Type': 'application/json',
@@ -87,7 +88,7 @@ export const SearchPage = () => {
         body: JSON.stringify({ keyword: searchKeyword.trim(), filters }),
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         if (response.status === 401) {
           throw new Error('ログインが必要です');
         }
@@ -98,19 +99,62 @@ export const SearchPage = () => {
         throw new Error(errorData.detail || '検索に失敗しました');
       }
 
-      const data = await response.json();
-      setVideos(data.videos);
+      setVideos([]);
       setSearchedKeyword(searchKeyword.trim());
-      // 残り検索回数を更新
-      if (data.searchesRemaining !== undefined) {
-        setSearchesRemaining(data.searchesRemaining);
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      const received = new Map<string, Video>();
+      let buffer = '';
+      let summaryReceived = false;
+
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        const lines = buffer.split('\n');
+        buffer = lines.pop() ?? '';
+
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const frame = JSON.parse(line) as SearchStreamFrame;
+
+          if (frame.type === 'error') {
+            throw new Error(frame.detail || '検索に失敗しました');
+          }
+
+          if (frame.type === 'video') {
+            received.set(frame.video.videoId, frame.video);
+            setVideos(Array.from(received.values()));
+            continue;
+          }
+
+          // サマリー: 影響力順に並べ替えて確定
+          summaryReceived = true;
+          const orderedVideos = frame.summary.videoIds
+            .map((videoId) => received.get(videoId))
+            .filter((video): video is Video => video !== undefined);
+          setVideos(orderedVideos);
+          // 残り検索回数を更新
+          if (frame.summary.searchesRemaining !== undefined) {
+            setSearchesRemaining(frame.summary.searchesRemaining);
+          }
+          setSearchResult({
+            keyword: searchKeyword.trim(),
+            videos: orderedVideos,
+            searchedAt: frame.summary.searchedAt,
+            searchesRemaining: frame.summary.searchesRemaining,
+            isStale: frame.summary.isStale,
+          });
+        }
+      }
+
+      // サマリー前にストリームが終わった場合（通信の切断など）は結果が未確定のためエラーとする
+      // （サーバーはサマリー前に終わった検索の回数を返却するため、再検索しても二重に消費されない）
+      if (!summaryReceived) {
+        throw new Error('検索結果の受信が途中で終了しました。もう一度検索してください');
       }
-      setSearchResult({
-        keyword: searchKeyword.trim(),
-        videos: data.videos,
-        searchedAt: new Date().toISOString(),
-        searchesRemaining: data.searchesRemaining,
-      });
     } catch (err) {
       setError(err instanceof Error ? err.message : '検索中にエラーが発生しました');
       setVideos([]);
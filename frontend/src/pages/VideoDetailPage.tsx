@@ -18,7 +18,24 @@ import AutoAwesomeIcon from '@mui/icons-material/AutoAwesome';
 import SearchIcon from '@mui/icons-material/Search';
 import { useSearchStore } from '../stores/searchStore';
 import { useAuthStore } from '../stores/authStore';
-import { getImpactLevel, type ImpactLevel, type Video, type AnalysisResult } from '../types';
+import {
+  getImpactLevel,
+  type ImpactLevel,
+  type Video,
+  type AnalysisResult,
+  type AnalysisStreamEvent,
+} from '../types';
+
+// SSEのイベント1件（"event: ..." と "data: ..." の行）を解析
+const parseSseEvent = (block: string): AnalysisStreamEvent => {
+  let event = '';
+  let data = '';
+  for (const line of block.split('\n')) {
+    if (line.startsWith('event: ')) event = line.slice('event: '.length);
+    if (line.startsWith('data: ')) data += line.slice('data: '.length);
+  }
+  return { event, data: JSON.parse(data) } as AnalysisStreamEvent;
+};
 
 // 再生倍率レベルに応じた色を取得
 const getImpactColor = (level: ImpactLevel): string => {
@@ -306,7 +323,7 @@ const AnalysisSection = ({ analysis, isLoading, error, onAnalyze, onKeywordClick
           }}
         >
           <Typography variant="body2" fontWeight={500}>
-            {analysis.analysisSummary}
+            {analysis.analysisSummary || 'AIが分析中...'}
           </Typography>
         </Box>
 
@@ -431,7 +448,7 @@ export const VideoDetailPage = () => {
     navigate(`/?q=${encodeURIComponent(keyword)}`);
   };
 
-  // 分析API呼び出し
+  // 分析API呼び出し（ストリーミング: 分析本文を生成された順に表示する）
   const handleAnalyze = async () => {
     if (!video) return;
 
@@ -448,13 +465,13 @@ export const VideoDetailPage = () => {
         headers['Authorization'] = `Bearer ${session.access_token}`;
       }
 
-      const response = await fetch(`${API_BASE_URL}/api/analyze`, {
+      const response = await fetch(`${API_BASE_URL}/api/analyze/stream`, {
         method: 'POST',
         headers,
         body: JSON.stringify({ video }),
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         if (response.status === 401) {
           throw new Error('ログインが必要です');
         }
@@ -465,10 +482,46 @@ export const VideoDetailPage = () => {
         throw new Error(errorData.detail || '分析に失敗しました');
       }
 
-      const data = await response.json();
-      setAnalysis(data);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let result: AnalysisResult = {
+        videoId: video.videoId,
+        buzzFactors: '',
+        suggestedKeywords: [],
+        analysisSummary: '',
+      };
+      let buffer = '';
+
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // SSEのイベントは空行区切り
+        const blocks = buffer.split('\n\n');
+        buffer = blocks.pop() ?? '';
+
+        for (const block of blocks) {
+          const { event, data } = parseSseEvent(block);
+
+          if (event === 'error') {
+            throw new Error(data.detail || '分析に失敗しました');
+          }
+          if (event === 'delta') {
+            result = { ...result, buzzFactors: result.buzzFactors + data.text };
+          } else if (event === 'keywords') {
+            result = { ...result, suggestedKeywords: data.suggestedKeywords };
+          } else {
+            result = { ...result, analysisSummary: data.analysisSummary };
+          }
+          setAnalysis(result);
+          // 最初のイベントを受信したらローディング表示を分析結果に切り替える
+          setIsAnalyzing(false);
+        }
+      }
     } catch (err) {
       setAnalysisError(err instanceof Error ? err.message : '分析中にエラーが発生しました');
+      setAnalysis(null);
     } finally {
       setIsAnalyzing(false);
     }
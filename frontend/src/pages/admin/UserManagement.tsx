@@ -49,6 +49,14 @@ interface User {
   current_period_end?: string;
 }
 
+interface UsersResponse {
+  users: User[];
+  // 総件数は先頭ページでのみ返される（2ページ目以降は null）
+  total: number | null;
+  per_page: number;
+  next_cursor: string | null;
+}
+
 import { API_BASE_URL } from '../../lib/api';
 
 export const UserManagement = () => {
@@ -58,6 +66,8 @@ export const UserManagement = () => {
   const [users, setUsers] = useState<User[]>([]);
   const [total, setTotal] = useState(0);
   const [page, setPage] = useState(0);
+  // ページごとのカーソル（cursors[n] が n ページ目の取得開始位置、先頭ページは null）
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
   const [rowsPerPage, setRowsPerPage] = useState(20);
   const [search, setSearch] = useState('');
   const [statusFilter, setStatusFilter] = useState('');
@@ -75,9 +85,10 @@ export const UserManagement = () => {
     setIsLoading(true);
     try {
       const params = new URLSearchParams({
-        page: String(page + 1),
         per_page: String(rowsPerPage),
       });
+      const cursor = cursors[page];
+      if (cursor) params.append('cursor', cursor);
       if (search) params.append('search', search);
       if (statusFilter) params.append('status', statusFilter);
 
@@ -91,9 +102,14 @@ export const UserManagement = () => {
         throw new Error('ユーザー一覧の取得に失敗しました');
       }
 
-      const data = await response.json();
+      const data: UsersResponse = await response.json();
       setUsers(data.users);
-      setTotal(data.total);
+      if (data.total !== null) setTotal(data.total);
+      setCursors((prev) => {
+        const next = prev.slice(0, page + 1);
+        next[page + 1] = data.next_cursor;
+        return next;
+      });
     } catch (e) {
       setError(e instanceof Error ? e.message : 'エラーが発生しました');
     } finally {
@@ -105,9 +121,18 @@ export const UserManagement = () => {
     fetchUsers();
   }, [session, page, rowsPerPage, statusFilter]);
 
-  const handleSearch = () => {
+  const resetPagination = () => {
     setPage(0);
-    fetchUsers();
+    setCursors([null]);
+  };
+
+  const handleSearch = () => {
+    // 先頭ページ以外ではページ変更により再取得される
+    if (page === 0) {
+      fetchUsers();
+    } else {
+      resetPagination();
+    }
   };
 
   const handleEditOpen = (user: User) => {
@@ -213,7 +238,7 @@ export const UserManagement = () => {
               label="ステータス"
               onChange={(e) => {
                 setStatusFilter(e.target.value);
-                setPage(0);
+                resetPagination();
               }}
             >
               <MenuItem value="">すべて</MenuItem>
@@ -285,7 +310,7 @@ export const UserManagement = () => {
           rowsPerPage={rowsPerPage}
           onRowsPerPageChange={(e) => {
             setRowsPerPage(parseInt(e.target.value, 10));
-            setPage(0);
+            resetPagination();
           }}
           rowsPerPageOptions={[10, 20, 50]}
           labelRowsPerPage="表示件数"
@@ -55,6 +55,8 @@ export interface SearchFilters {
 export interface SearchRequest {
   keyword: string;
   filters?: SearchFilters;
+  maxPages?: number; // 検索ページ数（2以上でディープ検索、最大10、1ページにつき検索回数1回分を消費）
+  quotaBudget?: number | null; // YouTube APIクォータ予算（1ページ102ユニット）
 }
 
 /**
@@ -65,8 +67,28 @@ export interface SearchResult {
   searchedAt: string; // ISO 8601形式
   videos: Video[];
   searchesRemaining?: number; // 本日の残り検索回数
+  isStale?: boolean; // キャッシュ有効期間を過ぎた結果（バックグラウンドで再取得中）
 }
 
+/**
+ * ストリーミング検索の最終サマリー
+ */
+export interface SearchStreamSummary {
+  keyword: string;
+  searchedAt: string; // ISO 8601形式
+  videoIds: string[]; // 影響力の降順
+  searchesRemaining?: number; // 本日の残り検索回数
+  isStale?: boolean; // キャッシュ有効期間を過ぎた結果（バックグラウンドで再取得中）
+}
+
+/**
+ * ストリーミング検索のフレーム（NDJSON 1行）
+ */
+export type SearchStreamFrame =
+  | { type: 'video'; video: Video }
+  | { type: 'summary'; summary: SearchStreamSummary }
+  | { type: 'error'; status: number; detail: string };
+
 // ============================================
 // バズ要因分析
 // ============================================
@@ -90,12 +112,37 @@ export interface AnalysisResult {
 }
 
 /**
- * 分析リクエスト
+ * ストリーミング分析のイベント（Server-Sent Events）
+ */
+export type AnalysisStreamEvent =
+  | { event: 'delta'; data: { text: string } }
+  | { event: 'keywords'; data: { suggestedKeywords: SuggestedKeyword[] } }
+  | { event: 'summary'; data: { videoId: string; analysisSummary: string } }
+  | { event: 'error'; data: { status: number; detail: string } };
+
+/**
+ * 分析リクエスト（動画IDのみ使用し、動画情報はサーバー側で取得）
  */
 export interface AnalyzeRequest {
   video: Video;
 }
 
+/**
+ * 一括分析リクエスト（動画情報または動画IDで最大20件、いずれも動画IDのみ使用）
+ */
+export interface BatchAnalyzeRequest {
+  videos?: Video[];
+  videoIds?: string[];
+}
+
+/**
+ * 一括分析のフレーム（NDJSON 1行、完了した動画から順に送信）
+ */
+export type BatchAnalyzeFrame =
+  | { type: 'result'; result: AnalysisResult }
+  | { type: 'error'; videoId: string | null; detail: string }
+  | { type: 'done'; total: number };
+
 // ============================================
 // 共通型
 // ============================================
@@ -0,0 +1,55 @@
+-- ============================================
+-- チャンネル情報キャッシュテーブル
+-- 登録者数の変化は緩やかで、同じチャンネルが多数のキーワードで出現するため
+-- チャンネルID単位で検索キャッシュとは別のTTLで保持する
+-- ============================================
+
+-- channel_cache テーブル作成
+CREATE TABLE IF NOT EXISTS channel_cache (
+    -- チャンネルID
+    channel_id TEXT PRIMARY KEY,
+
+    -- チャンネル情報
+    title TEXT NOT NULL DEFAULT '',
+    subscriber_count BIGINT NOT NULL DEFAULT 0,
+    published_at TEXT NOT NULL DEFAULT '',
+
+    -- TTL管理
+    fetched_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+-- インデックス
+CREATE INDEX IF NOT EXISTS idx_channel_cache_expires ON channel_cache(expires_at);
+
+-- RLSポリシー（サービスロールのみアクセス可能）
+ALTER TABLE channel_cache ENABLE ROW LEVEL SECURITY;
+
+-- サービスロールは全操作可能
+CREATE POLICY "Service role can manage channel cache"
+    ON channel_cache
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+-- 期限切れキャッシュ削除関数（チャンネルキャッシュも対象に追加）
+CREATE OR REPLACE FUNCTION cleanup_expired_cache()
+RETURNS INTEGER AS $$
+DECLARE
+    deleted_count INTEGER;
+    channel_deleted_count INTEGER;
+BEGIN
+    DELETE FROM search_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+
+    DELETE FROM channel_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS channel_deleted_count = ROW_COUNT;
+
+    RETURN deleted_count + channel_deleted_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- コメント
+COMMENT ON TABLE channel_cache IS 'YouTubeチャンネル情報のキャッシュ（channels.list 呼び出し削減用）';
+COMMENT ON COLUMN channel_cache.subscriber_count IS 'チャンネル登録者数（取得時点）';
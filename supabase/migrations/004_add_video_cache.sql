@@ -0,0 +1,68 @@
+-- ============================================
+-- 動画情報キャッシュテーブル
+-- 別キーワードの検索で同じ動画が返った場合に videos.list を再実行しないよう、
+-- 動画ID単位でスニペット（長期）と統計情報（短期）を別TTLで保持する
+-- ============================================
+
+-- video_cache テーブル作成
+CREATE TABLE IF NOT EXISTS video_cache (
+    -- 動画ID
+    video_id TEXT PRIMARY KEY,
+
+    -- スニペット（title, publishedAt, channelId, channelTitle, thumbnails）
+    snippet JSONB,
+
+    -- 統計情報（viewCount, likeCount）
+    statistics JSONB,
+
+    -- TTL管理（スニペットと統計情報で別々に管理）
+    snippet_expires_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    stats_expires_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- インデックス
+CREATE INDEX IF NOT EXISTS idx_video_cache_snippet_expires ON video_cache(snippet_expires_at);
+
+-- RLSポリシー（サービスロールのみアクセス可能）
+ALTER TABLE video_cache ENABLE ROW LEVEL SECURITY;
+
+-- サービスロールは全操作可能
+CREATE POLICY "Service role can manage video cache"
+    ON video_cache
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+-- 更新日時自動更新トリガー
+CREATE TRIGGER update_video_cache_updated_at
+    BEFORE UPDATE ON video_cache
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at();
+
+-- 期限切れキャッシュ削除関数（動画キャッシュも対象に追加）
+CREATE OR REPLACE FUNCTION cleanup_expired_cache()
+RETURNS INTEGER AS $$
+DECLARE
+    deleted_count INTEGER;
+    channel_deleted_count INTEGER;
+    video_deleted_count INTEGER;
+BEGIN
+    DELETE FROM search_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+
+    DELETE FROM channel_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS channel_deleted_count = ROW_COUNT;
+
+    -- スニペットが期限切れになった行のみ削除（統計情報のみ期限切れの行は再取得時に更新）
+    DELETE FROM video_cache WHERE snippet_expires_at < NOW();
+    GET DIAGNOSTICS video_deleted_count = ROW_COUNT;
+
+    RETURN deleted_count + channel_deleted_count + video_deleted_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- コメント
+COMMENT ON TABLE video_cache IS 'YouTube動画情報のキャッシュ（videos.list 呼び出し削減用）';
+COMMENT ON COLUMN video_cache.snippet IS '動画スニペット（不変に近いため長期TTL）';
+COMMENT ON COLUMN video_cache.statistics IS '動画統計情報（変化が速いため短期TTL）';
@@ -0,0 +1,77 @@
+-- ============================================
+-- YouTube APIクォータ台帳テーブル
+-- APIキーごとの消費ユニットをクォータ日（太平洋時間）単位で記録し、
+-- 再起動後や複数ワーカー間で同じ消費量を参照できるようにする
+-- ============================================
+
+-- youtube_quota_usage テーブル作成
+CREATE TABLE IF NOT EXISTS youtube_quota_usage (
+    -- APIキー識別子（キーのSHA-256ハッシュ先頭16文字、キーそのものは保存しない）
+    key_id TEXT NOT NULL,
+
+    -- クォータ日（太平洋時間の日付）
+    quota_date DATE NOT NULL,
+
+    -- 消費ユニット数
+    units_used INTEGER NOT NULL DEFAULT 0,
+
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (key_id, quota_date)
+);
+
+-- RLSポリシー（サービスロールのみアクセス可能）
+ALTER TABLE youtube_quota_usage ENABLE ROW LEVEL SECURITY;
+
+-- サービスロールは全操作可能
+CREATE POLICY "Service role can manage youtube quota usage"
+    ON youtube_quota_usage
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+-- 消費量の加算と当日分の集計取得を1往復で行う関数
+-- p_increments: {"<key_id>": <加算ユニット数>, ...}
+-- 戻り値の列名（key_id, units_used）はテーブルの列名と同じため、
+-- 関数内の識別子はテーブルの列として解決する（ON CONFLICT の列指定が曖昧にならないように）
+CREATE OR REPLACE FUNCTION sync_youtube_quota(p_quota_date DATE, p_increments JSONB)
+RETURNS TABLE (key_id TEXT, units_used INTEGER) AS $$
+#variable_conflict use_column
+BEGIN
+    INSERT INTO youtube_quota_usage AS q (key_id, quota_date, units_used)
+    SELECT inc.key, p_quota_date, inc.value::INTEGER
+    FROM jsonb_each_text(COALESCE(p_increments, '{}'::JSONB)) AS inc
+    ON CONFLICT (key_id, quota_date) DO UPDATE
+        SET units_used = q.units_used + EXCLUDED.units_used,
+            updated_at = NOW();
+
+    RETURN QUERY
+    SELECT q.key_id, q.units_used
+    FROM youtube_quota_usage q
+    WHERE q.quota_date = p_quota_date;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 古い台帳を削除する関数（7日より前のクォータ日）
+CREATE OR REPLACE FUNCTION cleanup_old_youtube_quota()
+RETURNS INTEGER AS $$
+DECLARE
+    deleted_count INTEGER;
+BEGIN
+    DELETE FROM youtube_quota_usage WHERE quota_date < CURRENT_DATE - 7;
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+    RETURN deleted_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 実行権限はサービスロールのみ（SECURITY DEFINER のため、anon・authenticated から
+-- 任意の消費量を加算されると全インスタンスでキーが枯渇扱いになる）
+REVOKE EXECUTE ON FUNCTION sync_youtube_quota(DATE, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION sync_youtube_quota(DATE, JSONB) TO service_role;
+REVOKE EXECUTE ON FUNCTION cleanup_old_youtube_quota() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION cleanup_old_youtube_quota() TO service_role;
+
+-- コメント
+COMMENT ON TABLE youtube_quota_usage IS 'YouTube APIキーごとの日次クォータ消費量（太平洋時間でリセット）';
+COMMENT ON FUNCTION sync_youtube_quota IS 'クォータ消費量を加算し、当日の全キーの消費量を返す';
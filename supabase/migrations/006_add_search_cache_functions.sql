@@ -0,0 +1,36 @@
+-- ============================================
+-- 検索結果キャッシュ取得関数
+-- キャッシュ取得と最終アクセス日時の更新を1往復で行い、
+-- ヒット回数はアプリ側でまとめて加算する
+-- ============================================
+
+-- 有効なキャッシュの result のみを返し、last_accessed を更新する
+CREATE OR REPLACE FUNCTION fetch_search_cache(p_cache_key TEXT)
+RETURNS JSONB AS $$
+    UPDATE search_cache
+    SET last_accessed = NOW()
+    WHERE cache_key = p_cache_key
+      AND expires_at > NOW()
+    RETURNING result;
+$$ LANGUAGE sql SECURITY DEFINER;
+
+-- ヒット回数をまとめて加算する
+-- p_hits: {"<cache_key>": <加算回数>, ...}
+CREATE OR REPLACE FUNCTION add_search_cache_hits(p_hits JSONB)
+RETURNS VOID AS $$
+    UPDATE search_cache AS c
+    SET hit_count = COALESCE(c.hit_count, 0) + h.value::INTEGER
+    FROM jsonb_each_text(COALESCE(p_hits, '{}'::JSONB)) AS h
+    WHERE c.cache_key = h.key;
+$$ LANGUAGE sql SECURITY DEFINER;
+
+-- 実行権限はサービスロールのみ（SECURITY DEFINER のため、anon・authenticated から
+-- キャッシュ済みの検索結果を読み出したり、ヒット回数を水増ししたりできないようにする）
+REVOKE EXECUTE ON FUNCTION fetch_search_cache(TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION fetch_search_cache(TEXT) TO service_role;
+REVOKE EXECUTE ON FUNCTION add_search_cache_hits(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION add_search_cache_hits(JSONB) TO service_role;
+
+-- コメント
+COMMENT ON FUNCTION fetch_search_cache IS '有効な検索キャッシュの結果を取得し、最終アクセス日時を更新';
+COMMENT ON FUNCTION add_search_cache_hits IS '検索キャッシュのヒット回数を一括加算';
@@ -0,0 +1,51 @@
+-- ============================================
+-- リクエストコンテキスト取得関数
+-- 認証済みリクエストで必要なプロファイル・最新サブスクリプション・
+-- 本日の検索回数を1往復で取得する
+-- ============================================
+
+-- 本日の検索回数カウント用の複合インデックス
+CREATE INDEX IF NOT EXISTS idx_usage_logs_user_action_created
+    ON usage_logs(user_id, action, created_at);
+
+-- サブスクリプションの最新行取得用インデックス
+CREATE INDEX IF NOT EXISTS idx_subscriptions_user_created
+    ON subscriptions(user_id, created_at DESC);
+
+-- p_day_start: 本日の開始時刻（検索回数の集計開始時刻）
+CREATE OR REPLACE FUNCTION get_request_context(p_user_id UUID, p_day_start TIMESTAMPTZ)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'profile', (
+            SELECT jsonb_build_object('id', p.id, 'email', p.email, 'is_admin', p.is_admin)
+            FROM profiles p
+            WHERE p.id = p_user_id
+        ),
+        'subscription', (
+            SELECT jsonb_build_object(
+                'status', s.status,
+                'trial_end', s.trial_end,
+                'current_period_end', s.current_period_end
+            )
+            FROM subscriptions s
+            WHERE s.user_id = p_user_id
+            ORDER BY s.created_at DESC
+            LIMIT 1
+        ),
+        'searches_today', (
+            SELECT COUNT(*)
+            FROM usage_logs u
+            WHERE u.user_id = p_user_id
+              AND u.action = 'search'
+              AND u.created_at >= p_day_start
+        )
+    );
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- 実行権限はサービスロールのみ（SECURITY DEFINER で任意の p_user_id を受け取るため、
+-- anon・authenticated から他ユーザーのプロファイル・サブスクリプションを読めないようにする）
+REVOKE EXECUTE ON FUNCTION get_request_context(UUID, TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_request_context(UUID, TIMESTAMPTZ) TO service_role;
+
+-- コメント
+COMMENT ON FUNCTION get_request_context IS 'プロファイル・最新サブスクリプション・本日の検索回数を一括取得';
@@ -0,0 +1,130 @@
+-- ============================================
+-- 日次利用回数カウンターテーブル
+-- usage_logs の COUNT(*) に代わり、ユーザー・日付・アクション単位の回数を保持する
+-- 上限チェックと加算を1文で行い、同時リクエストでも上限を超えないようにする
+-- ============================================
+
+-- daily_usage_counters テーブル作成
+CREATE TABLE IF NOT EXISTS daily_usage_counters (
+    user_id UUID NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+
+    -- 日付（UTC）
+    day DATE NOT NULL,
+
+    -- アクション（search, analyze, export）
+    action TEXT NOT NULL,
+
+    -- 利用回数
+    count INTEGER NOT NULL DEFAULT 0,
+
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (user_id, day, action)
+);
+
+-- RLSポリシー（サービスロールのみアクセス可能）
+ALTER TABLE daily_usage_counters ENABLE ROW LEVEL SECURITY;
+
+-- サービスロールは全操作可能
+CREATE POLICY "Service role can manage daily usage counters"
+    ON daily_usage_counters
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+-- 本日分を既存の利用ログから初期化
+INSERT INTO daily_usage_counters (user_id, day, action, count)
+SELECT user_id, (NOW() AT TIME ZONE 'UTC')::DATE, action, COUNT(*)
+FROM usage_logs
+WHERE created_at >= date_trunc('day', NOW() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+GROUP BY user_id, action
+ON CONFLICT (user_id, day, action) DO NOTHING;
+
+-- 上限未満の場合のみ1回分を確保し、確保後の回数を返す（上限に達している場合はNULL）
+CREATE OR REPLACE FUNCTION reserve_daily_usage(
+    p_user_id UUID,
+    p_day DATE,
+    p_action TEXT,
+    p_limit INTEGER
+)
+RETURNS INTEGER AS $$
+DECLARE
+    new_count INTEGER;
+BEGIN
+    IF p_limit <= 0 THEN
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO daily_usage_counters AS c (user_id, day, action, count)
+    VALUES (p_user_id, p_day, p_action, 1)
+    ON CONFLICT (user_id, day, action) DO UPDATE
+        SET count = c.count + 1,
+            updated_at = NOW()
+        WHERE c.count < p_limit
+    RETURNING c.count INTO new_count;
+
+    RETURN new_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 確保した1回分を返却する（処理が失敗した場合）
+CREATE OR REPLACE FUNCTION release_daily_usage(
+    p_user_id UUID,
+    p_day DATE,
+    p_action TEXT
+)
+RETURNS VOID AS $$
+    UPDATE daily_usage_counters
+    SET count = GREATEST(count - 1, 0),
+        updated_at = NOW()
+    WHERE user_id = p_user_id
+      AND day = p_day
+      AND action = p_action;
+$$ LANGUAGE sql SECURITY DEFINER;
+
+-- 実行権限はサービスロールのみ（SECURITY DEFINER で任意の p_user_id を受け取るため、
+-- anon・authenticated から自分の回数を返却したり他ユーザーの回数を消費したりできないようにする）
+REVOKE EXECUTE ON FUNCTION reserve_daily_usage(UUID, DATE, TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION reserve_daily_usage(UUID, DATE, TEXT, INTEGER) TO service_role;
+REVOKE EXECUTE ON FUNCTION release_daily_usage(UUID, DATE, TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION release_daily_usage(UUID, DATE, TEXT) TO service_role;
+
+-- リクエストコンテキストの本日の検索回数をカウンターから取得
+CREATE OR REPLACE FUNCTION get_request_context(p_user_id UUID, p_day_start TIMESTAMPTZ)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'profile', (
+            SELECT jsonb_build_object('id', p.id, 'email', p.email, 'is_admin', p.is_admin)
+            FROM profiles p
+            WHERE p.id = p_user_id
+        ),
+        'subscription', (
+            SELECT jsonb_build_object(
+                'status', s.status,
+                'trial_end', s.trial_end,
+                'current_period_end', s.current_period_end
+            )
+            FROM subscriptions s
+            WHERE s.user_id = p_user_id
+            ORDER BY s.created_at DESC
+            LIMIT 1
+        ),
+        'searches_today', COALESCE((
+            SELECT c.count
+            FROM daily_usage_counters c
+            WHERE c.user_id = p_user_id
+              AND c.day = (p_day_start AT TIME ZONE 'UTC')::DATE
+              AND c.action = 'search'
+        ), 0)
+    );
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- 関数を再定義したため、ここでも実行権限をサービスロールのみに設定する（007 と同じ）
+REVOKE EXECUTE ON FUNCTION get_request_context(UUID, TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_request_context(UUID, TIMESTAMPTZ) TO service_role;
+
+-- コメント
+COMMENT ON TABLE daily_usage_counters IS 'ユーザーごとの日次利用回数（検索回数制限用）';
+COMMENT ON FUNCTION reserve_daily_usage IS '上限未満なら利用回数を1加算して加算後の回数を返す（上限到達時はNULL）';
+COMMENT ON FUNCTION release_daily_usage IS '確保した利用回数を1減算する';
@@ -0,0 +1,89 @@
+-- ============================================
+-- 管理画面用の集計関数
+-- ダッシュボード統計・ユーザー詳細をそれぞれ1往復で取得する
+-- ============================================
+
+-- 売上集計用インデックス
+CREATE INDEX IF NOT EXISTS idx_payment_history_status_paid_at
+    ON payment_history(status, paid_at);
+
+-- プロファイル作成日時インデックス（本日の新規ユーザー集計用）
+CREATE INDEX IF NOT EXISTS idx_profiles_created_at ON profiles(created_at);
+
+-- ダッシュボード統計
+-- p_today_start: 本日の開始時刻, p_month_start: 今月の開始時刻
+CREATE OR REPLACE FUNCTION get_admin_dashboard_stats(
+    p_today_start TIMESTAMPTZ,
+    p_month_start TIMESTAMPTZ
+)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'total_users', (SELECT COUNT(*) FROM profiles),
+        'users_today', (SELECT COUNT(*) FROM profiles WHERE created_at >= p_today_start),
+        'active_subscribers', s.active_subscribers,
+        'trialing_users', s.trialing_users,
+        'monthly_revenue', (
+            SELECT COALESCE(SUM(amount), 0)
+            FROM payment_history
+            WHERE status = 'completed' AND paid_at >= p_month_start
+        ),
+        'total_searches', u.total_searches,
+        'total_analyses', u.total_analyses,
+        'searches_today', u.searches_today
+    )
+    FROM (
+        SELECT
+            COUNT(*) FILTER (WHERE status = 'active') AS active_subscribers,
+            COUNT(*) FILTER (WHERE status = 'trialing' AND trial_end > NOW()) AS trialing_users
+        FROM subscriptions
+    ) s,
+    (
+        -- usage_logs は1回の走査で集計
+        SELECT
+            COUNT(*) FILTER (WHERE action = 'search') AS total_searches,
+            COUNT(*) FILTER (WHERE action = 'analyze') AS total_analyses,
+            COUNT(*) FILTER (WHERE action = 'search' AND created_at >= p_today_start) AS searches_today
+        FROM usage_logs
+    ) u;
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- ユーザー詳細（プロファイル・最新サブスクリプション・利用統計）
+CREATE OR REPLACE FUNCTION get_admin_user_detail(p_user_id UUID)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'profile', to_jsonb(p),
+        'subscription', (
+            SELECT jsonb_build_object(
+                'status', s.status,
+                'trial_end', s.trial_end,
+                'current_period_end', s.current_period_end
+            )
+            FROM subscriptions s
+            WHERE s.user_id = p.id
+            ORDER BY s.created_at DESC
+            LIMIT 1
+        ),
+        'total_searches', (
+            SELECT COUNT(*) FROM usage_logs u WHERE u.user_id = p.id AND u.action = 'search'
+        ),
+        'total_analyses', (
+            SELECT COUNT(*) FROM usage_logs u WHERE u.user_id = p.id AND u.action = 'analyze'
+        ),
+        'last_activity', (
+            SELECT MAX(u.created_at) FROM usage_logs u WHERE u.user_id = p.id
+        )
+    )
+    FROM profiles p
+    WHERE p.id = p_user_id;
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- 実行権限はサービスロールのみ（SECURITY DEFINER のため、anon・authenticated から
+-- 売上・ユーザー数や任意ユーザーのプロファイル・利用状況を読めないようにする）
+REVOKE EXECUTE ON FUNCTION get_admin_dashboard_stats(TIMESTAMPTZ, TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_admin_dashboard_stats(TIMESTAMPTZ, TIMESTAMPTZ) TO service_role;
+REVOKE EXECUTE ON FUNCTION get_admin_user_detail(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_admin_user_detail(UUID) TO service_role;
+
+-- コメント
+COMMENT ON FUNCTION get_admin_dashboard_stats IS '管理画面ダッシュボード統計を一括取得';
+COMMENT ON FUNCTION get_admin_user_detail IS '管理画面ユーザー詳細を一括取得';
@@ -0,0 +1,102 @@
+-- ============================================
+-- 管理画面ユーザー一覧取得関数
+-- サブスクリプション状態での絞り込みをSQL側で行い、
+-- created_at のキーセットページネーションで一覧を取得する
+-- ============================================
+
+-- メールアドレス・名前の部分一致検索用トライグラムインデックス
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_profiles_email_trgm
+    ON profiles USING GIN (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_profiles_full_name_trgm
+    ON profiles USING GIN (full_name gin_trgm_ops);
+
+-- キーセットページネーション用インデックス（作成日時の降順、同時刻はIDで順序付け）
+CREATE INDEX IF NOT EXISTS idx_profiles_created_id
+    ON profiles(created_at DESC, id DESC);
+
+-- ユーザーごとの最新サブスクリプションを結合したビュー
+CREATE OR REPLACE VIEW admin_user_list AS
+SELECT
+    p.id,
+    p.email,
+    p.full_name,
+    p.is_admin,
+    p.created_at,
+    COALESCE(s.status, 'none') AS subscription_status,
+    s.trial_end,
+    s.current_period_end
+FROM profiles p
+LEFT JOIN LATERAL (
+    SELECT status, trial_end, current_period_end
+    FROM subscriptions
+    WHERE user_id = p.id
+    ORDER BY created_at DESC
+    LIMIT 1
+) s ON TRUE;
+
+-- ビューは service_role のみ参照可能
+REVOKE ALL ON admin_user_list FROM anon, authenticated;
+GRANT SELECT ON admin_user_list TO service_role;
+
+-- ユーザー一覧取得
+-- p_search: メールアドレス・名前の部分一致（NULLの場合は絞り込まない）
+-- p_status: サブスクリプション状態（'none' はサブスクリプションなし、NULLの場合は絞り込まない）
+-- p_cursor_created_at, p_cursor_id: 前ページ最終行の作成日時とID（NULLの場合は先頭ページ）
+-- p_limit: 取得件数
+-- 総件数（total）は絞り込み条件に一致する全行の走査が必要なため、先頭ページでのみ集計する
+-- （2ページ目以降は NULL を返し、呼び出し側は先頭ページの値を使う）
+CREATE OR REPLACE FUNCTION get_admin_users(
+    p_search TEXT,
+    p_status TEXT,
+    p_cursor_created_at TIMESTAMPTZ,
+    p_cursor_id UUID,
+    p_limit INTEGER
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_pattern TEXT;
+    v_users JSONB;
+    v_total BIGINT;
+BEGIN
+    -- LIKEのワイルドカード文字はエスケープして文字列として検索
+    IF p_search IS NOT NULL AND p_search <> '' THEN
+        v_pattern := '%' || replace(replace(replace(p_search, '\', '\\'), '%', '\%'), '_', '\_') || '%';
+    END IF;
+
+    SELECT COALESCE(jsonb_agg(to_jsonb(page) ORDER BY page.created_at DESC, page.id DESC), '[]'::jsonb)
+    INTO v_users
+    FROM (
+        SELECT *
+        FROM admin_user_list u
+        WHERE (v_pattern IS NULL OR u.email ILIKE v_pattern OR u.full_name ILIKE v_pattern)
+          AND (p_status IS NULL OR u.subscription_status = p_status)
+          AND (
+              p_cursor_created_at IS NULL
+              OR (u.created_at, u.id) < (p_cursor_created_at, p_cursor_id)
+          )
+        ORDER BY u.created_at DESC, u.id DESC
+        LIMIT p_limit
+    ) page;
+
+    IF p_cursor_created_at IS NULL THEN
+        SELECT COUNT(*)
+        INTO v_total
+        FROM admin_user_list u
+        WHERE (v_pattern IS NULL OR u.email ILIKE v_pattern OR u.full_name ILIKE v_pattern)
+          AND (p_status IS NULL OR u.subscription_status = p_status);
+    END IF;
+
+    RETURN jsonb_build_object('users', v_users, 'total', v_total);
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER;
+
+-- 関数もビューと同じく service_role のみ実行可能（SECURITY DEFINER のため、
+-- 実行権限を残すとビューの REVOKE を迂回して全ユーザーの一覧を取得できてしまう）
+REVOKE EXECUTE ON FUNCTION get_admin_users(TEXT, TEXT, TIMESTAMPTZ, UUID, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_admin_users(TEXT, TEXT, TIMESTAMPTZ, UUID, INTEGER) TO service_role;
+
+-- コメント
+COMMENT ON VIEW admin_user_list IS '管理画面用: プロファイルと最新サブスクリプションの結合ビュー';
+COMMENT ON FUNCTION get_admin_users IS '管理画面用: 絞り込み・キーセットページネーション付きユーザー一覧';
@@ -0,0 +1,67 @@
+-- ============================================
+-- 分析結果キャッシュテーブル
+-- 同じ動画の分析で字幕・コメント取得とClaude呼び出しを繰り返さないよう、
+-- 動画ID + 再生数・バズ度の区分ごとに分析結果を保持する
+-- ============================================
+
+-- analysis_cache テーブル作成
+CREATE TABLE IF NOT EXISTS analysis_cache (
+    -- キャッシュキー（動画ID + 再生数区分 + バズ度区分）
+    cache_key TEXT PRIMARY KEY,
+
+    -- 動画ID
+    video_id TEXT NOT NULL,
+
+    -- 分析結果
+    buzz_factors TEXT NOT NULL,
+    suggested_keywords JSONB NOT NULL DEFAULT '[]'::jsonb,
+
+    -- TTL管理
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+-- インデックス
+CREATE INDEX IF NOT EXISTS idx_analysis_cache_video_id ON analysis_cache(video_id);
+CREATE INDEX IF NOT EXISTS idx_analysis_cache_expires ON analysis_cache(expires_at);
+
+-- RLSポリシー（サービスロールのみアクセス可能）
+ALTER TABLE analysis_cache ENABLE ROW LEVEL SECURITY;
+
+-- サービスロールは全操作可能
+CREATE POLICY "Service role can manage analysis cache"
+    ON analysis_cache
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+-- 期限切れキャッシュ削除関数（分析結果キャッシュも対象に追加）
+CREATE OR REPLACE FUNCTION cleanup_expired_cache()
+RETURNS INTEGER AS $$
+DECLARE
+    deleted_count INTEGER;
+    channel_deleted_count INTEGER;
+    video_deleted_count INTEGER;
+    analysis_deleted_count INTEGER;
+BEGIN
+    DELETE FROM search_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+
+    DELETE FROM channel_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS channel_deleted_count = ROW_COUNT;
+
+    -- スニペットが期限切れになった行のみ削除（統計情報のみ期限切れの行は再取得時に更新）
+    DELETE FROM video_cache WHERE snippet_expires_at < NOW();
+    GET DIAGNOSTICS video_deleted_count = ROW_COUNT;
+
+    DELETE FROM analysis_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS analysis_deleted_count = ROW_COUNT;
+
+    RETURN deleted_count + channel_deleted_count + video_deleted_count + analysis_deleted_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- コメント
+COMMENT ON TABLE analysis_cache IS 'バズ要因分析結果のキャッシュ（Claude API呼び出し削減用）';
+COMMENT ON COLUMN analysis_cache.cache_key IS '動画ID + 再生数区分 + バズ度区分（数値が大きく変わった場合のみ再分析）';
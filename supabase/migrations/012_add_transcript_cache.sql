@@ -0,0 +1,70 @@
+-- ============================================
+-- 字幕キャッシュテーブル
+-- 字幕は公開後ほぼ変わらないため、動画ID + 優先言語単位で取得結果を保持する
+-- 字幕なし（無効化・未提供）の結果も transcript = NULL として短期間保持する
+-- ============================================
+
+-- transcript_cache テーブル作成
+CREATE TABLE IF NOT EXISTS transcript_cache (
+    -- キャッシュキー（動画ID + 優先言語）
+    cache_key TEXT PRIMARY KEY,
+
+    -- 動画ID
+    video_id TEXT NOT NULL,
+
+    -- 字幕テキスト（NULLは字幕なし）
+    transcript TEXT,
+
+    -- TTL管理
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+-- インデックス
+CREATE INDEX IF NOT EXISTS idx_transcript_cache_expires ON transcript_cache(expires_at);
+
+-- RLSポリシー（サービスロールのみアクセス可能）
+ALTER TABLE transcript_cache ENABLE ROW LEVEL SECURITY;
+
+-- サービスロールは全操作可能
+CREATE POLICY "Service role can manage transcript cache"
+    ON transcript_cache
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+-- 期限切れキャッシュ削除関数（字幕キャッシュも対象に追加）
+CREATE OR REPLACE FUNCTION cleanup_expired_cache()
+RETURNS INTEGER AS $$
+DECLARE
+    deleted_count INTEGER;
+    channel_deleted_count INTEGER;
+    video_deleted_count INTEGER;
+    analysis_deleted_count INTEGER;
+    transcript_deleted_count INTEGER;
+BEGIN
+    DELETE FROM search_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+
+    DELETE FROM channel_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS channel_deleted_count = ROW_COUNT;
+
+    -- スニペットが期限切れになった行のみ削除（統計情報のみ期限切れの行は再取得時に更新）
+    DELETE FROM video_cache WHERE snippet_expires_at < NOW();
+    GET DIAGNOSTICS video_deleted_count = ROW_COUNT;
+
+    DELETE FROM analysis_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS analysis_deleted_count = ROW_COUNT;
+
+    DELETE FROM transcript_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS transcript_deleted_count = ROW_COUNT;
+
+    RETURN deleted_count + channel_deleted_count + video_deleted_count
+        + analysis_deleted_count + transcript_deleted_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- コメント
+COMMENT ON TABLE transcript_cache IS 'YouTube字幕のキャッシュ（字幕取得の削減用）';
+COMMENT ON COLUMN transcript_cache.transcript IS '字幕テキスト（最大5000文字、NULLは字幕なし）';
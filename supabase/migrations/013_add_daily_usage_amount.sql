@@ -0,0 +1,63 @@
+-- ============================================
+-- 日次利用回数の複数回分の確保・返却
+-- ディープ検索は1ページにつき検索1回分を消費するため、
+-- 確保・返却する回数を指定できるようにする
+-- ============================================
+
+-- 引数が増えるため既存の関数を置き換える（PostgRESTで同名関数が曖昧にならないように）
+DROP FUNCTION IF EXISTS reserve_daily_usage(UUID, DATE, TEXT, INTEGER);
+DROP FUNCTION IF EXISTS release_daily_usage(UUID, DATE, TEXT);
+
+-- 加算後も上限以内の場合のみ p_amount 回分を確保し、確保後の回数を返す（足りない場合はNULL）
+CREATE OR REPLACE FUNCTION reserve_daily_usage(
+    p_user_id UUID,
+    p_day DATE,
+    p_action TEXT,
+    p_limit INTEGER,
+    p_amount INTEGER DEFAULT 1
+)
+RETURNS INTEGER AS $$
+DECLARE
+    new_count INTEGER;
+BEGIN
+    IF p_amount <= 0 OR p_amount > p_limit THEN
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO daily_usage_counters AS c (user_id, day, action, count)
+    VALUES (p_user_id, p_day, p_action, p_amount)
+    ON CONFLICT (user_id, day, action) DO UPDATE
+        SET count = c.count + p_amount,
+            updated_at = NOW()
+        WHERE c.count + p_amount <= p_limit
+    RETURNING c.count INTO new_count;
+
+    RETURN new_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 確保した p_amount 回分を返却する（処理が失敗した場合）
+CREATE OR REPLACE FUNCTION release_daily_usage(
+    p_user_id UUID,
+    p_day DATE,
+    p_action TEXT,
+    p_amount INTEGER DEFAULT 1
+)
+RETURNS VOID AS $$
+    UPDATE daily_usage_counters
+    SET count = GREATEST(count - p_amount, 0),
+        updated_at = NOW()
+    WHERE user_id = p_user_id
+      AND day = p_day
+      AND action = p_action;
+$$ LANGUAGE sql SECURITY DEFINER;
+
+-- 実行権限はサービスロールのみ（008 と同じ。関数を作り直したため再設定する）
+REVOKE EXECUTE ON FUNCTION reserve_daily_usage(UUID, DATE, TEXT, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION reserve_daily_usage(UUID, DATE, TEXT, INTEGER, INTEGER) TO service_role;
+REVOKE EXECUTE ON FUNCTION release_daily_usage(UUID, DATE, TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION release_daily_usage(UUID, DATE, TEXT, INTEGER) TO service_role;
+
+-- コメント
+COMMENT ON FUNCTION reserve_daily_usage IS '加算後も上限以内なら利用回数を指定回数分加算して加算後の回数を返す（足りない場合はNULL）';
+COMMENT ON FUNCTION release_daily_usage IS '確保した利用回数を指定回数分減算する';